@@ -238,6 +238,84 @@ class AzureStorageService:
             logger.error(f"Error retrieving career path: {e}")
             return None
     
+    def save_learning_path(self, path_key: str, path_data: Dict[Any, Any]) -> bool:
+        """Save a profile-keyed learning path (see learning_path_cache.py) to Azure Blob Storage"""
+        if not self.client:
+            return False
+            
+        try:
+            blob_name = self._get_blob_name("learning_paths", path_key)
+            blob_client = self.client.get_blob_client(
+                container=self.container_name, 
+                blob=blob_name
+            )
+            blob_client.upload_blob(json.dumps(path_data), overwrite=True)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving learning path {path_key}: {e}")
+            return False
+    
+    def get_learning_path(self, path_key: str) -> Optional[Dict[Any, Any]]:
+        """Retrieve a profile-keyed learning path from Azure Blob Storage"""
+        if not self.client:
+            return None
+            
+        try:
+            blob_name = self._get_blob_name("learning_paths", path_key)
+            blob_client = self.client.get_blob_client(
+                container=self.container_name, 
+                blob=blob_name
+            )
+            
+            if not blob_client.exists():
+                return None
+            
+            return json.loads(blob_client.download_blob().readall().decode('utf-8'))
+            
+        except Exception as e:
+            logger.error(f"Error retrieving learning path {path_key}: {e}")
+            return None
+    
+    def save_learning_fragment(self, fragment_key: str, fragment: Dict[Any, Any]) -> bool:
+        """Save a per-skill learning fragment to Azure Blob Storage"""
+        if not self.client:
+            return False
+            
+        try:
+            blob_name = self._get_blob_name("fragments", fragment_key)
+            blob_client = self.client.get_blob_client(
+                container=self.container_name, 
+                blob=blob_name
+            )
+            blob_client.upload_blob(json.dumps(fragment), overwrite=True)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving learning fragment {fragment_key}: {e}")
+            return False
+    
+    def get_learning_fragment(self, fragment_key: str) -> Optional[Dict[Any, Any]]:
+        """Retrieve a per-skill learning fragment from Azure Blob Storage"""
+        if not self.client:
+            return None
+            
+        try:
+            blob_name = self._get_blob_name("fragments", fragment_key)
+            blob_client = self.client.get_blob_client(
+                container=self.container_name, 
+                blob=blob_name
+            )
+            
+            if not blob_client.exists():
+                return None
+            
+            return json.loads(blob_client.download_blob().readall().decode('utf-8'))
+            
+        except Exception as e:
+            logger.error(f"Error retrieving learning fragment {fragment_key}: {e}")
+            return None
+    
     def delete_career_matches(self, user_id: str) -> bool:
         """Delete career matches from Azure Blob Storage"""
         if not self.client:
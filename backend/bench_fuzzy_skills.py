@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the typo-tolerant skill index
+Grows the vocabulary with synthetic skill names and compares SymSpell lookup cost against a linear
+edit-distance scan, to show lookup time stays flat as the vocabulary grows
+
+Usage:
+    python bench_fuzzy_skills.py --sizes 300,3000,30000 --queries 2000
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import List, Tuple
+from fuzzy_skills import FuzzySkillIndex, compact, edit_distance, fuzzy_skill_matcher
+
+def synthetic_terms(count: int, rng: random.Random) -> List[Tuple[str, int]]:
+    """Random skill-like words, 5-14 letters"""
+    return [("".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14))), 100000 + i) for i in range(count)]
+
+def garble(term: str, rng: random.Random) -> str:
+    """Apply one random typo (deletion, insertion, substitution or transposition)"""
+    i = rng.randrange(len(term))
+    kind = rng.choice(["delete", "insert", "substitute", "transpose"])
+    if kind == "delete":
+        return term[:i] + term[i + 1:]
+    if kind == "insert":
+        return term[:i] + rng.choice(string.ascii_lowercase) + term[i:]
+    if kind == "substitute":
+        return term[:i] + rng.choice(string.ascii_lowercase) + term[i + 1:]
+    i = min(i, len(term) - 2)
+    return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+
+def linear_lookup(index: FuzzySkillIndex, terms: List[str], token: str):
+    """Baseline: compare the token against every term"""
+    key = compact(token)
+    best = None
+    for term in terms:
+        allowed = index.allowed_distance(len(term))
+        distance = edit_distance(key, term, max(allowed, 0))
+        if distance <= allowed and (best is None or distance < best[1]):
+            best = (term, distance)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy skill lookup")
+    parser.add_argument("--sizes", default="300,3000,30000", help="Comma-separated vocabulary sizes")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--linear-queries", type=int, default=200, help="Queries for the linear-scan baseline")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base_terms = [(term, skill_id) for term, skill_id in zip(fuzzy_skill_matcher.index._terms, fuzzy_skill_matcher.index._term_skills)]
+
+    print(f"{'vocab':>8} {'build s':>8} {'deletes':>9} {'symspell us':>12} {'candidates':>11} {'linear us':>10} {'recall':>7}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        terms = base_terms + synthetic_terms(max(0, size - len(base_terms)), rng)
+
+        start = time.perf_counter()
+        index = FuzzySkillIndex(terms)
+        build_s = time.perf_counter() - start
+
+        fuzzy_terms = [compact(term) for term, _ in terms if index.allowed_distance(len(compact(term))) > 0]
+        targets = [rng.choice(fuzzy_terms) for _ in range(args.queries)]
+        queries = [garble(term, rng) for term in targets]
+
+        start = time.perf_counter()
+        hits = sum(1 for query in queries if index.lookup(query) is not None)
+        symspell_us = (time.perf_counter() - start) / len(queries) * 1e6
+        candidates = index.stats["candidates_checked"] / max(index.stats["lookups"], 1)
+
+        linear_sample = queries[:args.linear_queries]
+        start = time.perf_counter()
+        for query in linear_sample:
+            linear_lookup(index, fuzzy_terms, query)
+        linear_us = (time.perf_counter() - start) / len(linear_sample) * 1e6
+
+        print(f"{len(terms):>8} {build_s:>8.2f} {len(index._deletes):>9} {symspell_us:>12.1f} {candidates:>11.1f} {linear_us:>10.1f} {hits / len(queries):>7.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark quantized embedding storage
+Embeds synthetic profiles (skill sets sampled from the occupation dataset), then compares each encoding's
+resident memory against recall@k with and without full-precision re-scoring, using exact float32
+search as ground truth
+
+Usage:
+    python bench_quantized_embeddings.py --profiles 20000 --queries 500 --k 10
+"""
+
+import argparse
+import random
+import time
+from typing import List
+import numpy as np
+from embeddings import embedding_model
+from occupation_store import occupation_store
+from quantized_store import ENCODINGS, QuantizedEmbeddingStore
+from skill_ontology import skill_ontology
+
+def synthetic_profiles(count: int, rng: random.Random) -> List[List[str]]:
+    """Skill lists built around a random occupation plus a few unrelated skills"""
+    profiles = []
+    for _ in range(count):
+        row = rng.randrange(occupation_store.size)
+        skills = occupation_store.key_skills(row, limit=15)
+        chosen = rng.sample(skills, max(1, int(len(skills) * rng.uniform(0.4, 0.9))))
+        chosen += rng.sample(skill_ontology.names, rng.randint(0, 4))
+        profiles.append(chosen)
+    return profiles
+
+def perturb(skills: List[str], rng: random.Random) -> List[str]:
+    """Drop one skill and add another, like a slightly different resume"""
+    skills = list(skills)
+    if len(skills) > 1:
+        skills.pop(rng.randrange(len(skills)))
+    skills.append(rng.choice(skill_ontology.names))
+    return skills
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantized embedding storage")
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--pq-subspaces", type=int, default=48)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    profiles = synthetic_profiles(args.profiles, rng)
+    start = time.perf_counter()
+    vectors = embedding_model.encode([", ".join(skills) for skills in profiles])
+    queries = embedding_model.encode([", ".join(perturb(rng.choice(profiles), rng)) for _ in range(args.queries)])
+    print(f"Embedded {len(vectors)} profiles with {embedding_model.model_id} in {time.perf_counter() - start:.1f}s")
+
+    keys = [str(i) for i in range(len(vectors))]
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :args.k]
+
+    print(f"{'encoding':>9} {'bytes/vec':>10} {'resident MB':>12} {f'recall@{args.k}':>10} {'rescored':>9} {'scan us':>9} {'rescored us':>12}")
+    for encoding in ENCODINGS:
+        store = QuantizedEmbeddingStore(vectors.shape[1], encoding, pq_subspaces=args.pq_subspaces)
+        store.train(vectors[:min(len(vectors), 20000)])
+        store.add(keys, vectors)
+
+        row = [encoding, store.memory_bytes() / len(store), store.memory_bytes() / 2 ** 20]
+        for rescore in (False, True):
+            hits = 0
+            start = time.perf_counter()
+            for query, expected in zip(queries, truth):
+                found = {int(key) for key, _ in store.search(query, args.k, rescore=rescore)}
+                hits += len(found & set(expected.tolist()))
+            elapsed_us = (time.perf_counter() - start) / len(queries) * 1e6
+            row += [hits / truth.size, elapsed_us]
+        name, bytes_per_vector, resident_mb, recall, scan_us, rescored_recall, rescored_us = row
+        print(f"{name:>9} {bytes_per_vector:>10.1f} {resident_mb:>12.2f} {recall:>10.3f} {rescored_recall:>9.3f} {scan_us:>9.0f} {rescored_us:>12.0f}")
+        store.clear()
+
+if __name__ == "__main__":
+    main()
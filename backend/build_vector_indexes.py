@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Build the occupation and skill embedding indexes offline
+Embeds every occupation (title, alternate titles, description, key skills) and every ontology skill once
+and writes them to data/vector_indexes/, where the API memory-maps them at startup
+
+Usage:
+    python build_vector_indexes.py                 # exact (flat) indexes
+    python build_vector_indexes.py --kind hnsw     # approximate, for large catalogs
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+from embeddings import embedding_model
+from occupation_store import occupation_store, STORE_DIR
+from skill_ontology import skill_ontology, DATA_PATH as ONTOLOGY_PATH
+from vector_index import INDEX_DIR, INDEX_KINDS, VectorIndex
+import hashlib
+import json
+
+def occupation_texts() -> List[Tuple[str, str]]:
+    """(career_id, text) for every occupation"""
+    texts = []
+    for row, career_id in enumerate(occupation_store.ids()):
+        record = occupation_store.get(career_id)
+        text = f"{record['title']}. Also known as: {', '.join(record['alternate_titles'])}. {record['description']}. Key skills: {', '.join(occupation_store.key_skills(row, limit=10))}"
+        texts.append((career_id, text))
+    return texts
+
+def skill_texts() -> List[Tuple[str, str]]:
+    """(canonical skill name, text) for every ontology skill"""
+    with open(ONTOLOGY_PATH, "r", encoding="utf-8") as f:
+        entries = json.load(f)["skills"]
+    return [(entry["name"], ", ".join([entry["name"]] + entry.get("aliases", []))) for entry in entries]
+
+def build(name: str, items: List[Tuple[str, str]], kind: str, source_fingerprint: str) -> VectorIndex:
+    keys = [key for key, _ in items]
+    start_time = time.perf_counter()
+    vectors = embedding_model.encode([text for _, text in items])
+    index = VectorIndex(vectors.shape[1], kind=kind, metadata={"model_id": embedding_model.model_id, "source_sha1": source_fingerprint})
+    index.train(vectors)
+    index.add(keys, vectors)
+    index.save(INDEX_DIR / name)
+    print(f"✅ {name}: {len(keys)} vectors ({kind}, {index.backend}, {embedding_model.model_id}) in {time.perf_counter() - start_time:.2f}s")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the embedding indexes")
+    parser.add_argument("--kind", choices=INDEX_KINDS, default="flat")
+    parser.add_argument("--only", choices=["occupations", "skills"], default=None)
+    args = parser.parse_args()
+
+    if args.only in (None, "occupations"):
+        source = json.loads((STORE_DIR / "meta.json").read_text())["source_sha1"] if (STORE_DIR / "meta.json").exists() else ""
+        build("occupations", occupation_texts(), args.kind, source)
+    if args.only in (None, "skills"):
+        build("skills", skill_texts(), args.kind, hashlib.sha1(ONTOLOGY_PATH.read_bytes()).hexdigest())
+
+if __name__ == "__main__":
+    main()
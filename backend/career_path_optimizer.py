@@ -3,327 +3,563 @@ Career Path Optimization System
 Provides detailed roadmaps to bridge skill gaps for specific career transitions
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from llm_client import chat_completion, stream_chat_completion
+from llm_json import (decode_learning_path, decode_learning_fragments, decode_path_personalization, decode_learning_path_overview,
+                      decode_roadmap_phase, validate_learning_path_section,
+                      JSONSectionStream, LLMJSONError, LEARNING_PATH_SECTIONS, ROADMAP_PHASES)
+from prompt_templates import PromptTemplate, prompt_templates
+from skill_ontology import skill_ontology
+from occupation_store import occupation_store
+from learning_fragments import learning_fragment_store
+from course_catalog import course_catalog
+from learning_scheduler import learning_scheduler
+
+# "fragments" assembles paths from cached per-skill fragments; "full" generates the whole path in one completion;
+# "parallel" generates the overview and each roadmap phase as concurrent smaller completions
+LEARNING_PATH_MODE = os.getenv("LEARNING_PATH_MODE", "fragments")
+
+# Part completions in flight at once across all requests ("parallel" mode)
+LEARNING_PATH_PARALLELISM = int(os.getenv("LEARNING_PATH_PARALLELISM", "4"))
+_part_executor = ThreadPoolExecutor(max_workers=LEARNING_PATH_PARALLELISM, thread_name_prefix="learning-path-part")
+
+# "compact" has the model reference skills and catalog courses by ID (hydrated locally), "inline" has it
+# spell every course out in full
+LEARNING_PATH_OUTPUT = os.getenv("LEARNING_PATH_OUTPUT", "compact")
+# Catalog courses listed per skill in compact prompts
+CATALOG_EXCERPT_SIZE = int(os.getenv("CATALOG_EXCERPT_SIZE", "4"))
+
+# Bump whenever the learning path prompt or its post-processing changes (invalidates cached paths)
+LEARNING_PATH_PROMPT_VERSION = f"4-{LEARNING_PATH_MODE}-{LEARNING_PATH_OUTPUT}"
+# Streamed paths always come from the single full completion
+LEARNING_PATH_STREAM_VERSION = f"4-full-{LEARNING_PATH_OUTPUT}"
+
+# Sections of a streamed path sent as soon as their JSON closes (roadmap phases are sent one by one)
+STREAM_SECTIONS = [("personalized_assessment",), ("market_insights",)] + [("learning_roadmap", phase) for phase in ROADMAP_PHASES] + [
+    ("timeline_overview",), ("success_metrics",), ("next_actions",)
+]
+
+# Skills placed on a roadmap, prerequisites pulled in by the scheduler included
+ROADMAP_MAX_SKILLS = int(os.getenv("ROADMAP_MAX_SKILLS", "9"))
+PHASE_TIMELINES = {"immediate_steps": "0-3 months", "short_term_goals": "3-6 months", "long_term_goals": "6+ months"}
+DEFAULT_PRIORITIES = {"immediate_steps": "High", "short_term_goals": "Medium", "long_term_goals": "Low"}
+PHASE_PROJECTS = {
+    "immediate_steps": ["Build a project using {skill}", "Create a portfolio piece showcasing {skill}"],
+    "short_term_goals": ["Advanced project using {skill}", "Collaborative project with {skill}"],
+    "long_term_goals": ["Expert-level project with {skill}", "Lead a project using {skill}"]
+}
+
+# Course field of the step and fragment prompts: instructions and JSON example per output mode
+COURSE_FORMATS = {
+    "compact": (
+        "- course_ids: IDs of the 2-3 catalog courses listed with the skill that fit it best, free and paid (none if none are listed)",
+        '"skill_id": "s1", "course_ids": ["c001", "c002"]'
+    ),
+    "inline": (
+        "- courses: 2-3 real, current courses (name, provider, duration, cost, url), free and paid",
+        '"skill": "Skill Name", "courses": [{"name": "...", "provider": "...", "duration": "X weeks", "cost": "$X", "url": "https://..."}]'
+    )
+}
+
+def _course_format(text: str) -> str:
+    """Fill the <courses> and <course_refs> markers of a prompt with the configured course format"""
+    instructions, example = COURSE_FORMATS[LEARNING_PATH_OUTPUT]
+    return text.replace("<courses>", instructions).replace("<course_refs>", example)
+
+LEARNING_FRAGMENT_INSTRUCTIONS = _course_format("""You are a career development expert. For each skill listed, write the learning block a learner at the given experience level needs to pick it up. The blocks are reused across careers, so don't tailor them to a specific job.
+
+For each skill give:
+<courses>
+- projects: 2 hands-on projects
+- estimated_weeks: typical weeks to become productive at 10 hours/week
+
+Respond with JSON only:
+{"learning_fragments": [{<course_refs>, "projects": ["...", "..."], "estimated_weeks": 4}]}
+""")
+
+LEARNING_FRAGMENT_USER_TEMPLATE = """Experience level: {level}
+
+Skills:
+{skills}"""
+
+PATH_PERSONALIZATION_INSTRUCTIONS = """You are a career development expert. A learner's roadmap toward a target career has already been assembled from the skills below, in order. Add only the personal layer:
+- personalized_assessment: foundation_gaps (list), advanced_opportunities (list), estimated_timeline ("X-Y months to job-ready"), estimated_cost
+- priorities: "High", "Medium" or "Low" for each roadmap skill, given what the learner already knows
+- next_actions: 3-4 concrete first actions for this learner
+
+Respond with JSON only:
+{"path_personalization": {"personalized_assessment": {"foundation_gaps": ["..."], "advanced_opportunities": ["..."], "estimated_timeline": "...", "estimated_cost": "..."}, "priorities": {"Skill": "High"}, "next_actions": ["..."]}}
+"""
+
+PATH_PERSONALIZATION_USER_TEMPLATE = """Target career: {career_title}
+Experience level: {level}
+Current skills: {user_skills}
+Roadmap skills: {roadmap_skills}"""
+
+PATH_OVERVIEW_INSTRUCTIONS = """You are a career development expert. Write the overview of a learner's roadmap toward a target career. The roadmap phases are written separately; don't include them.
+- personalized_assessment: foundation_gaps (list), advanced_opportunities (list), estimated_timeline ("X-Y months to job-ready"), estimated_cost
+- market_insights: growth_rate, avg_salary, top_companies (5), key_skills (5)
+- success_metrics: 3-4 measurable milestones
+- next_actions: 3-4 concrete first actions for this learner
+
+Respond with JSON only:
+{"learning_path_overview": {"personalized_assessment": {"foundation_gaps": ["..."], "advanced_opportunities": ["..."], "estimated_timeline": "...", "estimated_cost": "..."}, "market_insights": {"growth_rate": "+X%", "avg_salary": "$XK", "top_companies": ["..."], "key_skills": ["..."]}, "success_metrics": ["..."], "next_actions": ["..."]}}
+"""
+
+PATH_OVERVIEW_USER_TEMPLATE = """Target career: {career_title}
+Experience level: {level}
+Current skills: {user_skills}
+Roadmap skills: {roadmap_skills}"""
+
+ROADMAP_PHASE_INSTRUCTIONS = _course_format("""You are a career development expert. Write one phase of a learner's roadmap toward a target career. The other phases are written separately, so cover exactly the skills listed, in order.
+
+For each skill give:
+- priority: "High", "Medium" or "Low"
+<courses>
+- projects: 2 hands-on projects that fit the target career
+- timeline: the weeks given for the skill
+
+Respond with JSON only:
+{"roadmap_phase": [{<course_refs>, "priority": "High", "projects": ["...", "..."], "timeline": "Weeks 1-4"}]}
+""")
+
+ROADMAP_PHASE_USER_TEMPLATE = """Target career: {career_title}
+Experience level: {level}
+Phase: {phase} ({phase_timeline})
+
+Skills:
+{skills}"""
+
+prompt_templates.register(PromptTemplate("learning_fragments", f"2-{LEARNING_PATH_OUTPUT}", LEARNING_FRAGMENT_INSTRUCTIONS, LEARNING_FRAGMENT_USER_TEMPLATE))
+prompt_templates.register(PromptTemplate("path_personalization", "1", PATH_PERSONALIZATION_INSTRUCTIONS, PATH_PERSONALIZATION_USER_TEMPLATE))
+prompt_templates.register(PromptTemplate("learning_path_overview", "1", PATH_OVERVIEW_INSTRUCTIONS, PATH_OVERVIEW_USER_TEMPLATE))
+prompt_templates.register(PromptTemplate("roadmap_phase", f"2-{LEARNING_PATH_OUTPUT}", ROADMAP_PHASE_INSTRUCTIONS, ROADMAP_PHASE_USER_TEMPLATE))
 
 class CareerPathOptimizer:
     def __init__(self):
-        # Detailed learning paths for each career
-        self.learning_paths = {
-            "software_developer": {
-                "foundation_skills": {
-                    "programming": {
-                        "courses": [
-                            {"name": "CS50: Introduction to Computer Science", "provider": "Harvard University (edX)", "duration": "12 weeks", "cost": "Free", "url": "https://www.edx.org/course/cs50s-introduction-computer-science-harvardx-cs50x"},
-                            {"name": "Python for Everybody", "provider": "University of Michigan (Coursera)", "duration": "7 months", "cost": "Free", "url": "https://www.coursera.org/specializations/python"},
-                            {"name": "The Web Developer Bootcamp", "provider": "Colt Steele (Udemy)", "duration": "46 hours", "cost": "$89.99", "url": "https://www.udemy.com/course/the-web-developer-bootcamp/"}
-                        ],
-                        "projects": [
-                            "Build a personal portfolio website",
-                            "Create a web application with user authentication",
-                            "Develop a mobile app using React Native"
-                        ]
-                    },
-                    "data_structures": {
-                        "courses": [
-                            {"name": "Data Structures and Algorithms", "provider": "University of California San Diego (Coursera)", "duration": "6 months", "cost": "$49/month", "url": "https://www.coursera.org/specializations/data-structures-algorithms"},
-                            {"name": "Algorithms Specialization", "provider": "Stanford University (Coursera)", "duration": "4 months", "cost": "$49/month", "url": "https://www.coursera.org/specializations/algorithms"}
-                        ],
-                        "projects": [
-                            "Implement common data structures from scratch",
-                            "Solve coding challenges on LeetCode",
-                            "Build an algorithm visualization tool"
-                        ]
-                    }
-                },
-                "advanced_skills": {
-                    "system_design": {
-                        "courses": [
-                            {"name": "System Design Interview", "provider": "Grokking the System Design Interview", "duration": "8 weeks", "cost": "$79", "url": "https://www.educative.io/courses/grokking-the-system-design-interview"},
-                            {"name": "Microservices Architecture", "provider": "Udemy", "duration": "12 hours", "cost": "$89.99", "url": "https://www.udemy.com/course/microservices-architecture/"}
-                        ],
-                        "certifications": [
-                            {"name": "AWS Certified Developer", "cost": "$150", "validity": "3 years"},
-                            {"name": "Google Cloud Professional Developer", "cost": "$200", "validity": "3 years"}
-                        ],
-                        "projects": [
-                            "Design a scalable chat application",
-                            "Build a microservices-based e-commerce platform",
-                            "Create a distributed system with load balancing"
-                        ]
-                    }
-                }
-            },
-            "data_scientist": {
-                "foundation_skills": {
-                    "python": {
-                        "courses": [
-                            {"name": "Python for Data Science", "provider": "Coursera", "duration": "4 weeks", "cost": "Free"},
-                            {"name": "Python Data Structures", "provider": "edX", "duration": "6 weeks", "cost": "$99"}
-                        ],
-                        "projects": [
-                            "Build a data analysis tool using pandas",
-                            "Create data visualizations with matplotlib/seaborn"
-                        ]
-                    },
-                    "statistics": {
-                        "courses": [
-                            {"name": "Statistics for Data Science", "provider": "Udacity", "duration": "8 weeks", "cost": "$399"},
-                            {"name": "Probability and Statistics", "provider": "Khan Academy", "duration": "Self-paced", "cost": "Free"}
-                        ],
-                        "projects": [
-                            "Statistical analysis of real-world dataset",
-                            "A/B testing project with hypothesis testing"
-                        ]
-                    },
-                    "machine learning": {
-                        "courses": [
-                            {"name": "Machine Learning Specialization", "provider": "Coursera (Stanford)", "duration": "12 weeks", "cost": "$49/month"},
-                            {"name": "Practical Machine Learning", "provider": "Fast.ai", "duration": "10 weeks", "cost": "Free"}
-                        ],
-                        "certifications": [
-                            {"name": "Google Cloud ML Engineer", "cost": "$200", "validity": "2 years"},
-                            {"name": "AWS ML Specialty", "cost": "$300", "validity": "3 years"}
-                        ],
-                        "projects": [
-                            "End-to-end ML pipeline for prediction",
-                            "Deploy ML model using Flask/FastAPI"
-                        ]
-                    }
-                },
-                "advanced_skills": {
-                    "deep learning": {
-                        "courses": [
-                            {"name": "Deep Learning Specialization", "provider": "Coursera (deeplearning.ai)", "duration": "16 weeks", "cost": "$49/month"},
-                            {"name": "PyTorch for Deep Learning", "provider": "Udemy", "duration": "12 weeks", "cost": "$89"}
-                        ],
-                        "projects": [
-                            "Computer vision project with CNNs",
-                            "NLP sentiment analysis with transformers"
-                        ]
-                    },
-                    "big data": {
-                        "courses": [
-                            {"name": "Big Data with Spark", "provider": "Databricks Academy", "duration": "6 weeks", "cost": "$299"},
-                            {"name": "Hadoop Ecosystem", "provider": "Cloudera", "duration": "8 weeks", "cost": "$399"}
-                        ],
-                        "certifications": [
-                            {"name": "Databricks Certified Data Scientist", "cost": "$200", "validity": "2 years"}
-                        ]
-                    }
-                },
-                "timeline": {
-                    "0-3 months": ["Python fundamentals", "Statistics basics", "First data project"],
-                    "3-6 months": ["Machine learning fundamentals", "SQL proficiency", "Portfolio development"],
-                    "6-12 months": ["Advanced ML techniques", "Cloud platforms", "Specialization area"],
-                    "12+ months": ["Deep learning", "Big data tools", "Industry experience"]
-                }
-            },
-            
-            "software_engineer": {
-                "foundation_skills": {
-                    "programming": {
-                        "courses": [
-                            {"name": "Full Stack Web Development", "provider": "The Odin Project", "duration": "12 weeks", "cost": "Free"},
-                            {"name": "JavaScript Algorithms", "provider": "freeCodeCamp", "duration": "8 weeks", "cost": "Free"}
-                        ],
-                        "projects": [
-                            "Personal portfolio website",
-                            "Todo app with CRUD operations"
-                        ]
-                    },
-                    "version control": {
-                        "courses": [
-                            {"name": "Git and GitHub Mastery", "provider": "Udemy", "duration": "3 weeks", "cost": "$59"},
-                            {"name": "Git Branching", "provider": "Learn Git Branching", "duration": "1 week", "cost": "Free"}
-                        ],
-                        "projects": [
-                            "Contribute to open source project",
-                            "Collaborative project with proper Git workflow"
-                        ]
-                    },
-                    "databases": {
-                        "courses": [
-                            {"name": "Database Design", "provider": "Coursera", "duration": "6 weeks", "cost": "$49/month"},
-                            {"name": "SQL Bootcamp", "provider": "Udemy", "duration": "4 weeks", "cost": "$79"}
-                        ],
-                        "projects": [
-                            "Design and implement a relational database",
-                            "Build REST API with database integration"
-                        ]
-                    }
-                },
-                "advanced_skills": {
-                    "system design": {
-                        "courses": [
-                            {"name": "System Design Interview", "provider": "Educative", "duration": "8 weeks", "cost": "$79/month"},
-                            {"name": "Designing Data-Intensive Applications", "provider": "Self-study", "duration": "12 weeks", "cost": "$45"}
-                        ],
-                        "projects": [
-                            "Design a scalable chat application",
-                            "Build a distributed system with microservices"
-                        ]
-                    },
-                    "cloud platforms": {
-                        "courses": [
-                            {"name": "AWS Solutions Architect", "provider": "A Cloud Guru", "duration": "10 weeks", "cost": "$29/month"},
-                            {"name": "Docker and Kubernetes", "provider": "Udemy", "duration": "8 weeks", "cost": "$99"}
-                        ],
-                        "certifications": [
-                            {"name": "AWS Solutions Architect Associate", "cost": "$150", "validity": "3 years"},
-                            {"name": "Certified Kubernetes Administrator", "cost": "$300", "validity": "3 years"}
-                        ]
-                    }
-                },
-                "timeline": {
-                    "0-3 months": ["Programming fundamentals", "Git/GitHub", "First web project"],
-                    "3-6 months": ["Framework mastery", "Database skills", "API development"],
-                    "6-12 months": ["System design basics", "Cloud deployment", "Advanced projects"],
-                    "12+ months": ["Distributed systems", "Performance optimization", "Leadership skills"]
-                }
-            },
-            
-            "product_manager": {
-                "foundation_skills": {
-                    "product strategy": {
-                        "courses": [
-                            {"name": "Product Management Fundamentals", "provider": "Product School", "duration": "8 weeks", "cost": "$1,999"},
-                            {"name": "Lean Startup Methodology", "provider": "Udacity", "duration": "4 weeks", "cost": "$399"}
-                        ],
-                        "projects": [
-                            "Product roadmap for a mobile app",
-                            "Market research and competitive analysis"
-                        ]
-                    },
-                    "user research": {
-                        "courses": [
-                            {"name": "User Experience Research", "provider": "Coursera (University of Michigan)", "duration": "6 weeks", "cost": "$49/month"},
-                            {"name": "Customer Development", "provider": "Udemy", "duration": "4 weeks", "cost": "$89"}
-                        ],
-                        "projects": [
-                            "Conduct user interviews and create personas",
-                            "Design and run A/B tests"
-                        ]
-                    },
-                    "data analysis": {
-                        "courses": [
-                            {"name": "SQL for Product Managers", "provider": "Mode Analytics", "duration": "4 weeks", "cost": "Free"},
-                            {"name": "Analytics for Product Managers", "provider": "Mixpanel Academy", "duration": "3 weeks", "cost": "Free"}
-                        ],
-                        "projects": [
-                            "Build product analytics dashboard",
-                            "Analyze user funnel and identify improvements"
-                        ]
-                    }
-                },
-                "advanced_skills": {
-                    "growth strategy": {
-                        "courses": [
-                            {"name": "Growth Product Management", "provider": "Reforge", "duration": "6 weeks", "cost": "$2,000"},
-                            {"name": "Product-Led Growth", "provider": "ProductLed", "duration": "4 weeks", "cost": "$497"}
-                        ],
-                        "projects": [
-                            "Design growth experiments",
-                            "Optimize product onboarding flow"
-                        ]
-                    }
-                },
-                "timeline": {
-                    "0-3 months": ["Product fundamentals", "User research basics", "First product analysis"],
-                    "3-6 months": ["Data analysis skills", "Roadmap planning", "Stakeholder management"],
-                    "6-12 months": ["Advanced analytics", "Growth strategies", "Leadership development"],
-                    "12+ months": ["Strategic thinking", "Team leadership", "Industry expertise"]
-                }
-            },
-            
-            "ux_designer": {
-                "foundation_skills": {
-                    "design thinking": {
-                        "courses": [
-                            {"name": "Design Thinking Specialization", "provider": "Coursera (IDEO)", "duration": "8 weeks", "cost": "$49/month"},
-                            {"name": "Human-Centered Design", "provider": "edX (MIT)", "duration": "6 weeks", "cost": "$99"}
-                        ],
-                        "projects": [
-                            "Redesign a mobile app using design thinking",
-                            "Create user journey maps for e-commerce site"
-                        ]
-                    },
-                    "prototyping": {
-                        "courses": [
-                            {"name": "Figma Mastery", "provider": "Designcode", "duration": "4 weeks", "cost": "$199"},
-                            {"name": "Sketch for UX Design", "provider": "Udemy", "duration": "3 weeks", "cost": "$79"}
-                        ],
-                        "projects": [
-                            "High-fidelity mobile app prototype",
-                            "Interactive web application mockup"
-                        ]
-                    },
-                    "user research": {
-                        "courses": [
-                            {"name": "UX Research Methods", "provider": "Nielsen Norman Group", "duration": "2 days", "cost": "$1,395"},
-                            {"name": "Usability Testing", "provider": "Coursera", "duration": "4 weeks", "cost": "$49/month"}
-                        ],
-                        "projects": [
-                            "Conduct usability testing sessions",
-                            "Create research-backed design recommendations"
-                        ]
-                    }
-                },
-                "timeline": {
-                    "0-3 months": ["Design fundamentals", "Tool proficiency", "First design project"],
-                    "3-6 months": ["User research skills", "Prototyping mastery", "Portfolio development"],
-                    "6-12 months": ["Advanced interaction design", "Design systems", "Collaboration skills"],
-                    "12+ months": ["Strategic design thinking", "Team leadership", "Industry specialization"]
-                }
-            },
-            
-            "devops_engineer": {
-                "foundation_skills": {
-                    "linux": {
-                        "courses": [
-                            {"name": "Linux Command Line Basics", "provider": "Linux Academy", "duration": "4 weeks", "cost": "$29/month"},
-                            {"name": "Shell Scripting", "provider": "Udemy", "duration": "6 weeks", "cost": "$89"}
-                        ],
-                        "projects": [
-                            "Automate server setup with bash scripts",
-                            "Monitor system performance with custom tools"
-                        ]
-                    },
-                    "containerization": {
-                        "courses": [
-                            {"name": "Docker Deep Dive", "provider": "A Cloud Guru", "duration": "6 weeks", "cost": "$29/month"},
-                            {"name": "Kubernetes Fundamentals", "provider": "Linux Foundation", "duration": "8 weeks", "cost": "$299"}
-                        ],
-                        "certifications": [
-                            {"name": "Docker Certified Associate", "cost": "$195", "validity": "2 years"},
-                            {"name": "Certified Kubernetes Administrator", "cost": "$300", "validity": "3 years"}
-                        ]
-                    }
-                },
-                "timeline": {
-                    "0-3 months": ["Linux fundamentals", "Basic scripting", "Version control"],
-                    "3-6 months": ["Docker mastery", "CI/CD pipelines", "Cloud basics"],
-                    "6-12 months": ["Kubernetes", "Infrastructure as Code", "Monitoring"],
-                    "12+ months": ["Advanced orchestration", "Security", "Architecture design"]
-                }
-            }
-        }
-    
+        # Courses come from the indexed local catalog (data/courses.json)
+        self.course_catalog = course_catalog
+
     def get_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
         """Generate a personalized learning path for a specific career using GPT"""
         
+        missing_skills = self._remaining_gaps(user_skills, missing_skills)
+        
         # Always use GPT to generate dynamic learning paths
         return self._generate_gpt_learning_path(career_id, user_skills, missing_skills, experience_level)
     
+    def get_local_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
+        """Generate a learning path without calling GPT (used on failure or when the latency budget runs out)"""
+        missing_skills = self._remaining_gaps(user_skills, missing_skills)
+        return self._generate_generic_learning_path(career_id, user_skills, missing_skills, experience_level)
+    
     def _generate_gpt_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
-        """Generate a personalized learning path using GPT-4"""
+        """Generate a personalized learning path using GPT-4, falling back to a generic path"""
+        
+        try:
+            return self.get_gpt_learning_path(career_id, user_skills, missing_skills, experience_level)
+            
+        except Exception as e:
+            print(f"Error generating GPT learning path: {e}")
+            # Fallback to generic path if GPT fails
+            return self._generate_generic_learning_path(career_id, user_skills, missing_skills, experience_level)
+    
+    def get_gpt_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
+        """Generate a personalized learning path using GPT-4, raising on any failure"""
+        
+        if LEARNING_PATH_MODE == "fragments":
+            return self.get_fragment_learning_path(career_id, user_skills, missing_skills, experience_level)
+        if LEARNING_PATH_MODE == "parallel":
+            return self.get_parallel_learning_path(career_id, user_skills, missing_skills, experience_level)
+        return self.get_full_learning_path(career_id, user_skills, missing_skills, experience_level)
+    
+    def get_full_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
+        """Generate the whole learning path in one GPT-4 completion, raising on any failure"""
+        
+        missing_skills = self._remaining_gaps(user_skills, missing_skills)
+        prompt = self._create_learning_path_prompt(career_id, user_skills, missing_skills, experience_level)
+        
+        response = chat_completion(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            template="learning_path",
+            max_tokens=4000,
+            temperature=0.7
+        )
+        
+        # Parse, repair and validate the response; sections that did not survive are filled in locally
+        learning_path = decode_learning_path(response.choices[0].message.content)
+        
+        return self._complete_learning_path(learning_path, career_id, user_skills, missing_skills, experience_level)
+    
+    def get_parallel_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
+        """
+        Generate the learning path as concurrent smaller completions: the overview and one per roadmap phase
+        
+        Phases come from the local schedule, so the parts don't depend on each other and the wall-clock time
+        is roughly that of the slowest part. A failed part (or a skill missing from a phase) falls back to
+        its local version; raises only if every part failed.
+        """
+        gaps = self._remaining_gaps(user_skills, missing_skills)
+        plan = learning_scheduler.schedule(gaps, user_skills, experience_level, max_skills=ROADMAP_MAX_SKILLS)
+        learning_path = self._generate_generic_learning_path(career_id, user_skills, gaps, experience_level, plan=plan)
+        roadmap_skills = [step["skill"] for step in plan["steps"]]
+        
+        parts = {"overview": _part_executor.submit(self._generate_overview, career_id, user_skills, roadmap_skills, experience_level)}
+        for phase in ROADMAP_PHASES:
+            scheduled = [step for step in plan["steps"] if step["phase"] == phase]
+            if scheduled:
+                parts[phase] = _part_executor.submit(self._generate_phase, career_id, phase, scheduled, experience_level)
+        
+        errors = []
+        for part, future in parts.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error generating learning path part {part}: {e}")
+                errors.append(e)
+                continue
+            if part == "overview":
+                learning_path.update(result)
+            else:
+                self._merge_phase(learning_path["learning_roadmap"], part, result)
+        
+        if len(errors) == len(parts):
+            raise errors[-1]
+        print(f"Generated learning path for {career_id} in {len(parts)} parallel parts ({len(errors)} fell back)")
+        return learning_path
+    
+    def _generate_overview(self, career_id: str, user_skills: List[str], roadmap_skills: List[str], experience_level: str) -> Dict:
+        """Assessment, market insights, success metrics and next actions in one short GPT call"""
+        template = prompt_templates.get("learning_path_overview")
+        response = chat_completion(
+            model="gpt-4o",
+            messages=template.render(
+                career_title=career_id.replace("_", " ").title(),
+                level=experience_level,
+                user_skills=", ".join(user_skills[:15]) or "None listed",
+                roadmap_skills=", ".join(roadmap_skills) or "None"
+            ),
+            template="learning_path_overview",
+            max_tokens=700,
+            temperature=0.5
+        )
+        return decode_learning_path_overview(response.choices[0].message.content)
+    
+    def _generate_phase(self, career_id: str, phase: str, scheduled: List[Dict], experience_level: str) -> List[Dict]:
+        """Steps of one roadmap phase in one GPT call"""
+        template = prompt_templates.get("roadmap_phase")
+        skills = [step["skill"] for step in scheduled]
+        response = chat_completion(
+            model="gpt-4o",
+            messages=template.render(
+                career_title=career_id.replace("_", " ").title(),
+                level=experience_level,
+                phase=phase.replace("_", " "),
+                phase_timeline=PHASE_TIMELINES[phase],
+                skills=self._prompt_skills(skills, [f"Weeks {step['start_week']}-{step['end_week']}" for step in scheduled])
+            ),
+            template="roadmap_phase",
+            max_tokens=350 * len(scheduled),
+            temperature=0.7
+        )
+        return self._hydrate_steps(decode_roadmap_phase(response.choices[0].message.content), skills)
+    
+    def _merge_phase(self, roadmap: Dict, phase: str, generated: List[Dict]):
+        """Replace a phase's local steps with generated ones, keeping local steps for skills the model skipped"""
+        by_skill = {skill_ontology.normalize(skill_ontology.canonical_name(step["skill"])): step for step in generated}
+        merged = []
+        for local_step in roadmap[phase]:
+            step = by_skill.get(skill_ontology.normalize(local_step["skill"]))
+            if step is None:
+                merged.append(local_step)
+                continue
+            step = {**step, "skill": local_step["skill"], "timeline": local_step["timeline"], "prerequisites": local_step["prerequisites"]}
+            merged.append(step)
+        self._fill_courses(merged)
+        roadmap[phase] = merged
+    
+    def stream_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Generate the whole learning path in one streamed GPT-4 completion, yielding sections as they complete
+        
+        Yields:
+            ("section", {"section": name, "data": value}) for each of STREAM_SECTIONS (phases by phase name),
+            then ("complete", {"learning_path": document, "path_source": "llm" | "local_fallback"}). A stream
+            that fails part-way is finished from the text received so far plus local data. Once the whole
+            document is validated, any section already sent that differs from it is sent again with
+            "revised": True, so the client ends up with exactly the document that is stored.
+        """
+        missing_skills = self._remaining_gaps(user_skills, missing_skills)
+        prompt = self._create_learning_path_prompt(career_id, user_skills, missing_skills, experience_level)
+        detector = JSONSectionStream(STREAM_SECTIONS)
+        sent = {}
+        parts = []
+        path_source = "llm"
+        
+        try:
+            for delta in stream_chat_completion(
+                model="gpt-4o",
+                messages=[{"role": "user", "content": prompt}],
+                template="learning_path",
+                max_tokens=4000,
+                temperature=0.7
+            ):
+                parts.append(delta)
+                for section_path, value in detector.feed(delta):
+                    section = section_path[-1]
+                    value = validate_learning_path_section(section, value, record_stats=False)
+                    if value is None or section in sent:
+                        continue
+                    if section in ROADMAP_PHASES:
+                        value = self._hydrate_steps(value, missing_skills)
+                        self._fill_courses(value)
+                    sent[section] = value
+                    yield "section", {"section": section, "data": value}
+        except Exception as e:
+            print(f"Error streaming GPT learning path: {e}")
+            path_source = "local_fallback"
+        
+        try:
+            learning_path = decode_learning_path("".join(parts))
+        except LLMJSONError as e:
+            print(f"Streamed learning path unusable ({e}), using local path")
+            learning_path, path_source = {}, "local_fallback"
+        learning_path = self._complete_learning_path(learning_path, career_id, user_skills, missing_skills, experience_level)
+        
+        # Sections the stream never delivered (failed, truncated or invalid) come from the completed document,
+        # and sections that came out differently in the validated document are corrected
+        for section_path in STREAM_SECTIONS:
+            section = section_path[-1]
+            value = learning_path["learning_roadmap"][section] if section in ROADMAP_PHASES else learning_path[section]
+            if section not in sent:
+                yield "section", {"section": section, "data": value}
+            elif sent[section] != value:
+                yield "section", {"section": section, "data": value, "revised": True}
+        yield "complete", {"learning_path": learning_path, "path_source": path_source}
+    
+    def get_fragment_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
+        """
+        Assemble a learning path from cached per-skill fragments
+        
+        GPT is asked only for fragments that aren't cached yet and for a short personalization layer
+        (assessment, priorities, next actions). Either part falls back locally; raises only if both
+        GPT calls failed, so callers can tell a local path from a generated one.
+        """
+        gaps = self._remaining_gaps(user_skills, missing_skills)
+        plan = learning_scheduler.schedule(gaps, user_skills, experience_level, max_skills=ROADMAP_MAX_SKILLS)
+        roadmap_skills = [step["skill"] for step in plan["steps"]]
+        fragments = learning_fragment_store.get_many(roadmap_skills, experience_level)
+        errors = []
+        
+        uncached = [skill for skill in roadmap_skills if skill not in fragments]
+        if uncached:
+            try:
+                generated = self._generate_fragments(uncached, experience_level)
+            except Exception as e:
+                print(f"Error generating learning fragments: {e}")
+                errors.append(e)
+                generated = {}
+            for skill in uncached:
+                if skill in generated:
+                    learning_fragment_store.put(skill, experience_level, generated[skill])
+                    fragments[skill] = generated[skill]
+                else:
+                    # Local fragments aren't cached, so a later request retries GPT
+                    fragments[skill] = self._local_fragment(skill)
+        
+        try:
+            personalization = self._generate_personalization(career_id, user_skills, roadmap_skills, experience_level)
+        except Exception as e:
+            print(f"Error generating learning path personalization: {e}")
+            errors.append(e)
+            personalization = {}
+        
+        if len(errors) == 2:
+            raise errors[-1]
+        
+        # Re-plan with the fragments' effort estimates (the selected skills don't change)
+        effort_weeks = {skill: fragment.get("estimated_weeks") for skill, fragment in fragments.items()}
+        plan = learning_scheduler.schedule(gaps, user_skills, experience_level, effort_weeks=effort_weeks, max_skills=ROADMAP_MAX_SKILLS)
+        
+        print(f"Assembled learning path for {career_id}: {len(roadmap_skills) - len(uncached)}/{len(roadmap_skills)} fragments cached")
+        return self._assemble_learning_path(career_id, user_skills, plan, fragments, personalization, experience_level)
+    
+    def _generate_fragments(self, skills: List[str], experience_level: str) -> Dict[str, Dict]:
+        """Learning fragments for uncached skills in one GPT call, keyed by the requested skill names"""
+        template = prompt_templates.get("learning_fragments")
+        response = chat_completion(
+            model="gpt-4o",
+            messages=template.render(level=experience_level, skills=self._prompt_skills(skills)),
+            template="learning_fragments",
+            max_tokens=350 * len(skills),
+            temperature=0.3
+        )
+        decoded = decode_learning_fragments(response.choices[0].message.content)
+        refs = self._skill_refs(skills)
+        by_name = {}
+        for name, fragment in decoded.items():
+            self._hydrate_courses(fragment)
+            # The model may echo an alias ("k8s"); map fragments back to the canonical skill requested
+            name = refs.get(name.strip().lower(), name)
+            by_name[skill_ontology.normalize(skill_ontology.canonical_name(name))] = fragment
+        return {
+            skill: by_name[skill_ontology.normalize(skill)]
+            for skill in skills
+            if skill_ontology.normalize(skill) in by_name
+        }
+    
+    def _generate_personalization(self, career_id: str, user_skills: List[str], roadmap_skills: List[str], experience_level: str) -> Dict:
+        """Short GPT call for the per-user layer of an assembled path"""
+        template = prompt_templates.get("path_personalization")
+        response = chat_completion(
+            model="gpt-4o",
+            messages=template.render(
+                career_title=career_id.replace("_", " ").title(),
+                level=experience_level,
+                user_skills=", ".join(user_skills[:15]) or "None listed",
+                roadmap_skills=", ".join(roadmap_skills) or "None"
+            ),
+            template="path_personalization",
+            max_tokens=500,
+            temperature=0.5
+        )
+        return decode_path_personalization(response.choices[0].message.content)
+    
+    def _local_fragment(self, skill: str) -> Dict:
+        """Fragment built from local course data when GPT is unavailable"""
+        return {
+            "courses": self._get_real_courses_for_skill(skill),
+            "projects": [f"Build a project using {skill}", f"Create a portfolio piece showcasing {skill}"]
+        }
+    
+    def _assemble_learning_path(self, career_id: str, user_skills: List[str], plan: Dict, fragments: Dict[str, Dict],
+                                personalization: Dict, experience_level: str) -> Dict:
+        """Learning path document from a schedule and fragments, with the personalization layer on top of the local sections"""
+        
+        learning_path = self._generate_generic_learning_path(career_id, user_skills, [], experience_level, plan=plan)
+        priorities = {skill_ontology.normalize(skill): priority for skill, priority in personalization.get("priorities", {}).items()}
+        learning_path["learning_roadmap"] = self._roadmap_from_plan(plan, fragments, priorities)
+        
+        if personalization.get("personalized_assessment"):
+            learning_path["personalized_assessment"] = personalization["personalized_assessment"]
+        if personalization.get("next_actions"):
+            learning_path["next_actions"] = personalization["next_actions"]
+        return learning_path
+    
+    def _roadmap_from_plan(self, plan: Dict, fragments: Optional[Dict[str, Dict]] = None, priorities: Optional[Dict[str, str]] = None) -> Dict:
+        """Roadmap phases from a learning schedule; fragments and GPT priorities override the local defaults"""
+        fragments = fragments or {}
+        priorities = priorities or {}
+        roadmap = {phase: [] for phase in ROADMAP_PHASES}
+        for scheduled in plan["steps"]:
+            skill, phase = scheduled["skill"], scheduled["phase"]
+            fragment = fragments.get(skill, {})
+            # Skills on the critical path hold up the rest of the plan
+            priority = "High" if scheduled["critical"] else DEFAULT_PRIORITIES[phase]
+            step = {
+                "skill": skill,
+                "priority": priorities.get(skill_ontology.normalize(skill), priority),
+                "courses": fragment.get("courses") or self._get_real_courses_for_skill(skill),
+                "projects": fragment.get("projects") or [project.format(skill=skill) for project in PHASE_PROJECTS[phase]],
+                "timeline": f"Weeks {scheduled['start_week']}-{scheduled['end_week']}",
+                "prerequisites": scheduled["prerequisites"]
+            }
+            if fragment.get("estimated_weeks"):
+                step["estimated_weeks"] = fragment["estimated_weeks"]
+            roadmap[phase].append(step)
+        return roadmap
+    
+    def _remaining_gaps(self, user_skills: List[str], missing_skills: List[str]) -> List[str]:
+        """Canonical missing skills, minus any the user already has"""
+        profile = skill_ontology.encode(user_skills)
+        return [skill for skill in skill_ontology.canonicalize(missing_skills) if not skill_ontology.contains(profile, skill)]
+    
+    def _complete_learning_path(self, learning_path: Dict, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
+        """Fill sections and courses missing from a partial GPT learning path with local data"""
         
-        import openai
+        generic_path = None
+        for section in LEARNING_PATH_SECTIONS:
+            if section not in learning_path:
+                generic_path = generic_path or self._generate_generic_learning_path(career_id, user_skills, missing_skills, experience_level)
+                learning_path[section] = generic_path[section]
         
-        # Set up OpenAI API
-        openai.api_key = os.getenv("OPENAI_API_KEY")
+        roadmap = learning_path["learning_roadmap"]
+        for phase in ROADMAP_PHASES:
+            if phase in roadmap:
+                roadmap[phase] = self._hydrate_steps(roadmap[phase], missing_skills)
+            if phase not in roadmap:
+                generic_path = generic_path or self._generate_generic_learning_path(career_id, user_skills, missing_skills, experience_level)
+                roadmap[phase] = generic_path["learning_roadmap"][phase]
+            self._fill_courses(roadmap[phase])
+        
+        return learning_path
+    
+    def _skill_refs(self, skills: List[str]) -> Dict[str, str]:
+        """Prompt-local skill IDs (s1, s2, ...) of a skill list"""
+        return {f"s{index}": skill for index, skill in enumerate(skills, 1)}
+    
+    def _prompt_skills(self, skills: List[str], timelines: Optional[List[str]] = None) -> str:
+        """
+        Skill list for a prompt, one "- " line per skill
+        
+        In compact output mode each line also carries the skill's ID and the catalog courses the model
+        picks from by ID, so the response spells out neither skills nor courses
+        """
+        lines = []
+        for index, skill in enumerate(skills):
+            line = skill if timelines is None else f"{skill} ({timelines[index]})"
+            if LEARNING_PATH_OUTPUT == "compact":
+                courses = self.course_catalog.search(skill, limit=CATALOG_EXCERPT_SIZE)
+                excerpt = "; ".join(self.course_catalog.describe(course) for course in courses) or "no catalog courses"
+                line = f"s{index + 1} {line}: {excerpt}"
+            lines.append(f"- {line}")
+        return "\n".join(lines)
+    
+    def _hydrate_courses(self, item: Dict):
+        """Replace the course IDs of a compact step or fragment with catalog courses"""
+        course_ids = item.pop("course_ids", None) or []
+        if not item.get("courses"):
+            item["courses"] = self.course_catalog.hydrate(course_ids)
+    
+    def _hydrate_steps(self, steps: List[Dict], skills: List[str]) -> List[Dict]:
+        """Resolve the skill and course IDs of compact roadmap steps; steps with an unknown skill ID are dropped"""
+        refs = self._skill_refs(skills)
+        hydrated = []
+        for step in steps:
+            skill_id = step.pop("skill_id", None)
+            if skill_id is not None and not step.get("skill"):
+                if skill_id.strip().lower() not in refs:
+                    continue
+                step["skill"] = refs[skill_id.strip().lower()]
+            self._hydrate_courses(step)
+            hydrated.append(step)
+        return hydrated
+    
+    def _fill_courses(self, steps: List[Dict]):
+        """Give roadmap steps without courses catalog courses"""
+        for step in steps:
+            if not step.get("courses"):
+                step["courses"] = self._get_real_courses_for_skill(step["skill"])
+    
+    def _create_learning_path_prompt(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> str:
+        """Create the GPT prompt for a personalized learning path"""
         
         career_title = career_id.replace("_", " ").title()
+        if LEARNING_PATH_OUTPUT == "compact":
+            catalog = f"""
+SKILLS AND CATALOG COURSES (refer to skills and courses by ID):
+{self._prompt_skills(missing_skills)}
+"""
+            course_guidance = "- Recommended courses, by ID, from the catalog courses listed with the skill"
+            resource_guidance = "- Only use skill and course IDs from the catalog above"
+        else:
+            catalog = ""
+            course_guidance = "- Recommended courses (with real course names, providers, costs, and URLs when possible)"
+            resource_guidance = "- Use real, current courses and resources\n- Provide specific URLs when possible"
         
         # Create a comprehensive prompt for GPT
         prompt = f"""You are a career development expert. Create a detailed, personalized learning roadmap for someone transitioning to become a {career_title}.
@@ -333,7 +569,7 @@ USER PROFILE:
 - Missing Skills: {', '.join(missing_skills) if missing_skills else 'None identified'}
 - Experience Level: {experience_level}
 - Target Career: {career_title}
-
+{catalog}
 Please generate a comprehensive learning path with the following structure:
 
 1. IMMEDIATE STEPS (0-3 months): Focus on foundational skills and quick wins
@@ -342,7 +578,7 @@ Please generate a comprehensive learning path with the following structure:
 
 For each phase, provide:
 - Specific skills to learn
-- Recommended courses (with real course names, providers, costs, and URLs when possible)
+{course_guidance}
 - Hands-on projects to build
 - Timeline estimates
 - Priority levels
@@ -364,38 +600,13 @@ Return your response as a JSON object with this exact structure:
     }},
     "learning_roadmap": {{
         "immediate_steps": [
-            {{
-                "skill": "Skill Name",
-                "priority": "High/Medium/Low",
-                "courses": [
-                    {{"name": "Course Name", "provider": "Provider", "duration": "X weeks", "cost": "$X", "url": "https://..."}},
-                    {{"name": "Course Name", "provider": "Provider", "duration": "X weeks", "cost": "$X", "url": "https://..."}}
-                ],
-                "projects": ["Project 1", "Project 2"],
-                "timeline": "0-3 months"
-            }}
+{self._prompt_step_example('0-3 months')}
         ],
         "short_term_goals": [
-            {{
-                "skill": "Skill Name",
-                "priority": "High/Medium/Low", 
-                "courses": [
-                    {{"name": "Course Name", "provider": "Provider", "duration": "X weeks", "cost": "$X", "url": "https://..."}}
-                ],
-                "projects": ["Project 1", "Project 2"],
-                "timeline": "3-6 months"
-            }}
+{self._prompt_step_example('3-6 months')}
         ],
         "long_term_goals": [
-            {{
-                "skill": "Skill Name",
-                "priority": "High/Medium/Low",
-                "courses": [
-                    {{"name": "Course Name", "provider": "Provider", "duration": "X weeks", "cost": "$X", "url": "https://..."}}
-                ],
-                "projects": ["Project 1", "Project 2"],
-                "timeline": "6+ months"
-            }}
+{self._prompt_step_example('6+ months')}
         ]
     }},
     "timeline_overview": {{
@@ -418,8 +629,7 @@ Return your response as a JSON object with this exact structure:
 }}
 
 Make sure to:
-- Use real, current courses and resources
-- Provide specific URLs when possible
+{resource_guidance}
 - Focus on practical, hands-on learning
 - Consider the user's current skill level
 - Make recommendations actionable and time-bound
@@ -427,109 +637,59 @@ Make sure to:
 - Emphasize project-based learning
 
 Respond with ONLY the JSON object, no additional text."""
+        
+        return prompt
 
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=4000,
-                temperature=0.7
-            )
-            
-            # Parse the JSON response
-            import json
-            gpt_response = response.choices[0].message.content.strip()
-            
-            # Clean up the response (remove any markdown formatting)
-            if gpt_response.startswith("```json"):
-                gpt_response = gpt_response[7:]
-            if gpt_response.endswith("```"):
-                gpt_response = gpt_response[:-3]
-            
-            learning_path = json.loads(gpt_response)
-            
-            return learning_path
-            
-        except Exception as e:
-            print(f"Error generating GPT learning path: {e}")
-            # Fallback to generic path if GPT fails
-            return self._generate_generic_learning_path(career_id, user_skills, missing_skills, experience_level)
-
-    def _generate_generic_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str) -> Dict:
-        """Generate a generic learning path for unknown careers"""
+    def _prompt_step_example(self, timeline: str) -> str:
+        """Roadmap step example of the full learning path prompt in the configured output format"""
+        if LEARNING_PATH_OUTPUT == "compact":
+            refs = '"skill_id": "s1", "priority": "High/Medium/Low", "course_ids": ["c001", "c002"]'
+        else:
+            refs = '"skill": "Skill Name", "priority": "High/Medium/Low", "courses": [{"name": "Course Name", "provider": "Provider", "duration": "X weeks", "cost": "$X", "url": "https://..."}]'
+        return f'            {{{refs}, "projects": ["Project 1", "Project 2"], "timeline": "{timeline}"}}'
+    
+    def _generate_generic_learning_path(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str,
+                                        plan: Optional[Dict] = None) -> Dict:
+        """Generate a learning path from the local schedule optimizer and course catalog"""
         
         career_title = career_id.replace("_", " ").title()
-        
-        # Create immediate steps based on missing skills
-        immediate_steps = []
-        for i, skill in enumerate(missing_skills[:3]):  # Top 3 missing skills
-                # Get real courses based on skill type
-                real_courses = self._get_real_courses_for_skill(skill)
-                
-                immediate_steps.append({
-                    "skill": skill,
-                    "priority": "High" if i == 0 else "Medium",
-                    "courses": real_courses,
-                    "projects": [
-                        f"Build a project using {skill}",
-                        f"Create a portfolio piece showcasing {skill}"
-                    ],
-                    "timeline": "0-3 months"
-                })
-        
-        # Create short-term goals
-        short_term_goals = []
-        for i, skill in enumerate(missing_skills[3:6]):  # Next 3 missing skills
-            real_courses = self._get_real_courses_for_skill(skill)
-            short_term_goals.append({
-                "skill": skill,
-                "priority": "Medium",
-                "courses": real_courses,
-                "projects": [
-                    f"Advanced project using {skill}",
-                    f"Collaborative project with {skill}"
-                ],
-                "timeline": "3-6 months"
-            })
-        
-        # Create long-term goals
-        long_term_goals = []
-        for i, skill in enumerate(missing_skills[6:9]):  # Remaining skills
-            real_courses = self._get_real_courses_for_skill(skill)
-            long_term_goals.append({
-                "skill": skill,
-                "priority": "Low",
-                "courses": real_courses,
-                "projects": [
-                    f"Expert-level project with {skill}",
-                    f"Lead a project using {skill}"
-                ],
-                "timeline": "6+ months"
-            })
+        plan = plan or learning_scheduler.schedule(missing_skills, user_skills, experience_level, max_skills=ROADMAP_MAX_SKILLS)
+        scheduled_skills = [step["skill"] for step in plan["steps"]]
         
         # Calculate costs
-        total_cost = len(missing_skills) * 200  # Rough estimate
-        free_resources = len(missing_skills) * 2  # Assume 2 free resources per skill
+        total_cost = len(scheduled_skills) * 200  # Rough estimate
+        free_resources = len(scheduled_skills) * 2  # Assume 2 free resources per skill
+        
+        if plan["total_weeks"]:
+            months = max(1, round(plan["total_weeks"] / 4.33))
+            estimated_timeline = f"{months} months to job-ready at {plan['hours_per_week']:g} hours/week"
+        else:
+            estimated_timeline = "6-12 months to job-ready"
         
         return {
             "career_title": career_title,
             "personalized_assessment": {
-                "foundation_gaps": len(missing_skills),
-                "advanced_opportunities": max(1, len(missing_skills) - 2),  # Always show at least 1
-                "estimated_timeline": "6-12 months to job-ready",
+                "foundation_gaps": len(scheduled_skills),
+                "advanced_opportunities": max(1, len(scheduled_skills) - 2),  # Always show at least 1
+                "estimated_timeline": estimated_timeline,
                 "estimated_cost": f"${total_cost} (plus {free_resources} free resources)"
             },
             "market_insights": self._get_market_insights(career_id),
-            "learning_roadmap": {
-                "immediate_steps": immediate_steps,
-                "short_term_goals": short_term_goals,
-                "long_term_goals": long_term_goals
-            },
+            "learning_roadmap": self._roadmap_from_plan(plan),
             "timeline_overview": {
+                PHASE_TIMELINES[phase]: skills for phase, skills in plan["phases"].items() if skills
+            } or {
                 "0-3 months": ["Foundation skills", "Basic projects", "Portfolio building"],
                 "3-6 months": ["Intermediate skills", "Advanced projects", "Networking"],
                 "6-12 months": ["Expert skills", "Professional projects", "Job applications"]
             },
+            "learning_schedule": {
+                "total_weeks": plan["total_weeks"],
+                "hours_per_week": plan["hours_per_week"],
+                "critical_path": plan["critical_path"],
+                "critical_path_weeks": plan["critical_path_weeks"],
+                "added_prerequisites": plan["added_prerequisites"]
+            },
             "success_metrics": [
                 "Complete 2-3 portfolio projects",
                 "Earn 1-2 relevant certifications",
@@ -537,116 +697,35 @@ Respond with ONLY the JSON object, no additional text."""
                 "Apply to 5-10 relevant positions"
             ],
             "next_actions": [
-                f"Start with {missing_skills[0] if missing_skills else 'foundation skills'}",
-                "Set up learning schedule (10-15 hours/week)",
+                f"Start with {scheduled_skills[0] if scheduled_skills else 'foundation skills'}",
+                f"Set up learning schedule ({plan['hours_per_week']:g} hours/week)",
                 "Join relevant online communities",
                 "Begin building portfolio projects"
             ]
         }
     
     def _get_market_insights(self, career_id: str) -> Dict:
-        """Get market insights for a specific career"""
-        
-        market_data = {
-            "software_developer": {
-                "growth_rate": "+22%",
-                "avg_salary": "$105K",
-                "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix", "Tesla", "Uber"],
-                "key_skills": ["Python", "JavaScript", "React", "Node.js", "SQL", "Git", "Docker", "AWS"]
-            },
-            "data_scientist": {
-                "growth_rate": "+35%",
-                "avg_salary": "$120K",
-                "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix", "Tesla", "Uber"],
-                "key_skills": ["Python", "R", "SQL", "Machine Learning", "Statistics", "Pandas", "TensorFlow", "Jupyter"]
-            },
-            "product_manager": {
-                "growth_rate": "+18%",
-                "avg_salary": "$125K",
-                "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix", "Tesla", "Uber"],
-                "key_skills": ["Product Strategy", "Data Analysis", "User Research", "Agile", "SQL", "Figma", "Jira", "Analytics"]
-            },
-            "ux_designer": {
-                "growth_rate": "+15%",
-                "avg_salary": "$95K",
-                "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix", "Tesla", "Uber"],
-                "key_skills": ["User Research", "Figma", "Prototyping", "Design Thinking", "Usability Testing", "Sketch", "Adobe XD", "InVision"]
-            },
-            "devops_engineer": {
-                "growth_rate": "+25%",
-                "avg_salary": "$115K",
-                "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix", "Tesla", "Uber"],
-                "key_skills": ["Docker", "Kubernetes", "AWS", "Linux", "CI/CD", "Terraform", "Jenkins", "Monitoring"]
+        """Get market insights for a specific career from the occupation dataset"""
+        
+        row = occupation_store.row(career_id)
+        if row is not None:
+            return {
+                "growth_rate": occupation_store.column("growth_rate", row),
+                "avg_salary": occupation_store.column("avg_salary", row),
+                "top_companies": occupation_store.column("top_companies", row),
+                "key_skills": occupation_store.key_skills(row, limit=8)
             }
-        }
         
-        return market_data.get(career_id, {
+        return {
             "growth_rate": "+15%",
             "avg_salary": "$85K",
             "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple"],
             "key_skills": ["Communication", "Problem Solving", "Leadership", "Analytics", "Project Management"]
-        })
+        }
 
     def _get_real_courses_for_skill(self, skill: str) -> List[Dict]:
-        """Get real courses based on skill type"""
-        
-        skill_lower = skill.lower()
-        
-        # Programming/Technical Skills
-        if any(tech in skill_lower for tech in ["programming", "coding", "python", "javascript", "java", "web development", "software"]):
-            return [
-                {"name": "CS50: Introduction to Computer Science", "provider": "Harvard University (edX)", "duration": "12 weeks", "cost": "Free", "url": "https://www.edx.org/course/cs50s-introduction-computer-science-harvardx-cs50x"},
-                {"name": "Python for Everybody", "provider": "University of Michigan (Coursera)", "duration": "7 months", "cost": "Free", "url": "https://www.coursera.org/specializations/python"},
-                {"name": "The Web Developer Bootcamp", "provider": "Colt Steele (Udemy)", "duration": "46 hours", "cost": "$89.99", "url": "https://www.udemy.com/course/the-web-developer-bootcamp/"}
-            ]
-        
-        # Data Science/Analytics
-        elif any(data in skill_lower for data in ["data", "analytics", "statistics", "machine learning", "ai"]):
-            return [
-                {"name": "Machine Learning", "provider": "Stanford University (Coursera)", "duration": "11 weeks", "cost": "Free", "url": "https://www.coursera.org/learn/machine-learning"},
-                {"name": "Data Science Specialization", "provider": "Johns Hopkins (Coursera)", "duration": "10 months", "cost": "$49/month", "url": "https://www.coursera.org/specializations/jhu-data-science"},
-                {"name": "Introduction to Data Science", "provider": "IBM (Coursera)", "duration": "4 months", "cost": "Free", "url": "https://www.coursera.org/learn/introduction-data-science"}
-            ]
-        
-        # Design/Creative Skills
-        elif any(design in skill_lower for design in ["design", "ui", "ux", "graphic", "visual", "creative", "adobe", "photoshop", "illustrator"]):
-            return [
-                {"name": "Google UX Design Certificate", "provider": "Google (Coursera)", "duration": "6 months", "cost": "$39/month", "url": "https://www.coursera.org/professional-certificates/google-ux-design"},
-                {"name": "Graphic Design Specialization", "provider": "CalArts (Coursera)", "duration": "6 months", "cost": "$49/month", "url": "https://www.coursera.org/specializations/graphic-design"},
-                {"name": "Adobe Creative Suite", "provider": "Adobe", "duration": "Self-paced", "cost": "$20.99/month", "url": "https://www.adobe.com/creativecloud.html"}
-            ]
-        
-        # Business/Management Skills
-        elif any(business in skill_lower for business in ["business", "management", "leadership", "project", "marketing", "sales", "finance"]):
-            return [
-                {"name": "Business Foundations", "provider": "University of Pennsylvania (Coursera)", "duration": "4 months", "cost": "Free", "url": "https://www.coursera.org/specializations/wharton-business-foundations"},
-                {"name": "Project Management Professional (PMP)", "provider": "PMI", "duration": "35 hours", "cost": "$405", "url": "https://www.pmi.org/certifications/project-management-pmp"},
-                {"name": "Digital Marketing", "provider": "Google (Coursera)", "duration": "6 months", "cost": "$39/month", "url": "https://www.coursera.org/professional-certificates/google-digital-marketing-ecommerce"}
-            ]
-        
-        # Architecture/Engineering
-        elif any(arch in skill_lower for arch in ["architecture", "construction", "engineering", "autocad", "revit", "building"]):
-            return [
-                {"name": "Architecture and Design", "provider": "MIT OpenCourseWare", "duration": "Self-paced", "cost": "Free", "url": "https://ocw.mit.edu/courses/architecture/"},
-                {"name": "AutoCAD Certification", "provider": "Autodesk", "duration": "40 hours", "cost": "$99", "url": "https://www.autodesk.com/certification"},
-                {"name": "Sustainable Design", "provider": "Harvard Graduate School of Design", "duration": "8 weeks", "cost": "$1,500", "url": "https://www.gsd.harvard.edu/"}
-            ]
-        
-        # Communication/Soft Skills
-        elif any(comm in skill_lower for comm in ["communication", "presentation", "writing", "public speaking", "leadership"]):
-            return [
-                {"name": "Communication Skills", "provider": "University of London (Coursera)", "duration": "4 weeks", "cost": "Free", "url": "https://www.coursera.org/learn/communication-skills"},
-                {"name": "Public Speaking", "provider": "University of Washington (Coursera)", "duration": "4 weeks", "cost": "Free", "url": "https://www.coursera.org/learn/public-speaking"},
-                {"name": "Business Writing", "provider": "University of Colorado (Coursera)", "duration": "4 weeks", "cost": "Free", "url": "https://www.coursera.org/learn/business-writing"}
-            ]
-        
-        # Default fallback for unknown skills
-        else:
-            return [
-                {"name": f"Introduction to {skill}", "provider": "Coursera", "duration": "4-6 weeks", "cost": "Free-$99", "url": "https://www.coursera.org"},
-                {"name": f"Advanced {skill}", "provider": "Udemy", "duration": "8-12 weeks", "cost": "$200-$500", "url": "https://www.udemy.com"},
-                {"name": f"{skill} Fundamentals", "provider": "edX", "duration": "6-8 weeks", "cost": "Free-$150", "url": "https://www.edx.org"}
-            ]
+        """Get real courses for a skill from the local course catalog"""
+        return self.course_catalog.courses_for_skill(skill)
 
 # Global instance
 career_path_optimizer = CareerPathOptimizer()
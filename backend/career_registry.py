@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Canonical career ID registry
+GPT invents career IDs freely ("software_engineer", "swe", "career_1"), and every cache and storage key
+built from them fragments. The registry resolves an ID or title to the dataset career ID through, in
+order: the occupation store's IDs, titles and alternate titles; data/career_synonyms.json; a fuzzy match
+over all of those names (seniority words dropped, close spellings); and finally the occupations vector
+index. Anything still unknown gets its normalized title key, so it is at least stable across spellings.
+The vector stage embeds the query (and may load the embedding model), so it never runs on the event loop:
+async endpoints use resolve_async(), and a plain resolve() called from the loop answers from the tables
+and finishes the vector stage in a worker thread for the next lookup
+
+Usage:
+    python career_registry.py "Sr. Software Engineer" swe career_1
+"""
+
+import asyncio
+import difflib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from occupation_store import OccupationStore, occupation_store, title_key
+from vector_index import vector_indexes
+
+SYNONYMS_PATH = Path(__file__).parent / "data" / "career_synonyms.json"
+CAREER_REGISTRY_CACHE_SIZE = int(os.getenv("CAREER_REGISTRY_CACHE_SIZE", "10000"))
+# Minimum difflib ratio between name keys for a fuzzy match
+CAREER_FUZZY_CUTOFF = float(os.getenv("CAREER_FUZZY_CUTOFF", "0.88"))
+# Minimum cosine similarity (and lead over the runner-up) for a vector-index match (> 1 disables)
+CAREER_VECTOR_MIN_SIMILARITY = float(os.getenv("CAREER_VECTOR_MIN_SIMILARITY", "0.6"))
+CAREER_VECTOR_MIN_MARGIN = 0.05
+
+# Placeholder IDs GPT falls back to ("career_1", "3"); these say nothing about the career
+_PLACEHOLDER = re.compile(r"^(career_?)?\d+$")
+# Words that don't change which career a title names
+_QUALIFIERS = {"senior", "sr", "junior", "jr", "lead", "principal", "staff", "associate", "entry", "level", "mid",
+               "i", "ii", "iii", "iv", "intern", "trainee", "chief", "head", "of", "the"}
+
+def _strip_qualifiers(key: str) -> str:
+    """Title key without seniority words and plural endings ("sr_software_engineers" -> "software_engineer")"""
+    words = [word for word in key.split("_") if word not in _QUALIFIERS]
+    if words and len(words[-1]) > 3 and words[-1].endswith("s") and not words[-1].endswith("ss"):
+        words[-1] = words[-1][:-1]
+    return "_".join(words)
+
+def _on_event_loop() -> bool:
+    """Whether the caller is running on an asyncio event loop thread"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+class CareerRegistry:
+    def __init__(self, store: OccupationStore = occupation_store, synonyms_path: Path = SYNONYMS_PATH,
+                 cache_size: int = CAREER_REGISTRY_CACHE_SIZE, fuzzy_cutoff: float = CAREER_FUZZY_CUTOFF,
+                 vector_min_similarity: float = CAREER_VECTOR_MIN_SIMILARITY):
+        """
+        Career ID resolver (names are indexed on first use)
+
+        Args:
+            store: Occupation dataset the canonical IDs come from
+            synonyms_path: Synonym list per career ID
+            cache_size: Resolved names kept in memory
+            fuzzy_cutoff: Minimum similarity for a fuzzy name match
+            vector_min_similarity: Minimum cosine similarity for a vector-index match
+        """
+        self.store = store
+        self.synonyms_path = Path(synonyms_path)
+        self.cache_size = cache_size
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.vector_min_similarity = vector_min_similarity
+        self._lock = threading.Lock()
+        self._loaded = False
+        # Name key -> career ID, for IDs, titles, alternate titles and synonyms
+        self._names: Dict[str, str] = {}
+        self._synonyms: Dict[str, str] = {}
+        # Qualifier-free name key -> career ID, the fuzzy matching candidates
+        self._stripped: Dict[str, str] = {}
+        self._resolved: "OrderedDict[Tuple[str, str], Tuple[str, str]]" = OrderedDict()
+        # Names whose vector stage is running in a worker thread
+        self._deferred = set()
+        self._stats = {"lookups": 0, "cache_hits": 0, "exact": 0, "synonym": 0, "fuzzy": 0, "vector": 0, "unresolved": 0, "deferred": 0}
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            ids = self.store.ids()
+            for row, career_id in enumerate(ids):
+                names = [career_id, self.store.title_list()[row]] + list(self.store.column("alternate_titles", row))
+                for name in names:
+                    self._names.setdefault(title_key(name), career_id)
+            try:
+                with open(self.synonyms_path, "r", encoding="utf-8") as f:
+                    synonyms = json.load(f)["synonyms"]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not load career synonyms {self.synonyms_path}: {e}")
+                synonyms = {}
+            known = set(ids)
+            for career_id, names in synonyms.items():
+                if career_id not in known:
+                    print(f"⚠️ Synonyms listed for unknown career '{career_id}'")
+                    continue
+                for name in names:
+                    self._synonyms.setdefault(title_key(name), career_id)
+            for key, career_id in list(self._names.items()) + list(self._synonyms.items()):
+                self._stripped.setdefault(_strip_qualifiers(key), career_id)
+            self._loaded = True
+
+    def _match(self, text: str, use_vector: bool = True) -> Tuple[Optional[str], str]:
+        """Career ID for one ID or title, and the stage that found it"""
+        key = title_key(text)
+        if not key or _PLACEHOLDER.match(key):
+            return None, "unresolved"
+        if key in self._names:
+            return self._names[key], "exact"
+        if key in self._synonyms:
+            return self._synonyms[key], "synonym"
+        stripped = _strip_qualifiers(key)
+        if stripped in self._stripped:
+            return self._stripped[stripped], "fuzzy"
+        close = difflib.get_close_matches(stripped, self._stripped.keys(), n=1, cutoff=self.fuzzy_cutoff)
+        if close:
+            return self._stripped[close[0]], "fuzzy"
+        if use_vector and self.vector_min_similarity <= 1.0:
+            results = vector_indexes.search_text("occupations", [text.replace("_", " ")], k=2)
+            if results and results[0]:
+                hits = results[0]
+                runner_up = hits[1][1] if len(hits) > 1 else 0.0
+                career_id, similarity = hits[0]
+                if similarity >= self.vector_min_similarity and similarity - runner_up >= CAREER_VECTOR_MIN_MARGIN:
+                    return career_id, "vector"
+        return None, "unresolved"
+
+    def resolve(self, career_id: str, title: Optional[str] = None) -> str:
+        """
+        Canonical career ID
+
+        Args:
+            career_id: Career ID, title or alternate title in any spelling
+            title: Career title, tried when the ID doesn't resolve (e.g. GPT's "career_1")
+
+        Returns:
+            The dataset career ID, or a normalized key (from the title when the ID is a placeholder)
+        """
+        self._load()
+        cache_key = (career_id or "", title or "")
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        return self._resolve_uncached(cache_key, career_id, title)
+
+    def _resolve_uncached(self, cache_key: Tuple[str, str], career_id: str, title: Optional[str]) -> str:
+        """Run the resolution stages and cache the result"""
+        self._load()
+        # On the event loop only the in-memory tables are consulted
+        on_loop = _on_event_loop()
+        resolved, stage = self._match(career_id or "", use_vector=not on_loop)
+        if resolved is None and title:
+            resolved, stage = self._match(title, use_vector=not on_loop)
+        if resolved is None:
+            fallback = title_key(career_id or "")
+            if (not fallback or _PLACEHOLDER.match(fallback)) and title:
+                fallback = title_key(title)
+            if on_loop and self.vector_min_similarity <= 1.0:
+                self._defer(cache_key, career_id, title)
+                return fallback
+            resolved = fallback
+
+        with self._lock:
+            self._stats[stage] += 1
+            self._resolved[cache_key] = (resolved, stage)
+            while len(self._resolved) > self.cache_size:
+                self._resolved.popitem(last=False)
+        return resolved
+
+    def _cached(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        """Previously resolved ID, counting the lookup"""
+        with self._lock:
+            self._stats["lookups"] += 1
+            cached = self._resolved.get(cache_key)
+            if cached is None:
+                return None
+            self._resolved.move_to_end(cache_key)
+            self._stats["cache_hits"] += 1
+            return cached[0]
+
+    def _defer(self, cache_key: Tuple[str, str], career_id: str, title: Optional[str]):
+        """Run the full resolution in a worker thread so the next lookup gets the vector stage's answer"""
+        with self._lock:
+            if cache_key in self._deferred:
+                return
+            self._deferred.add(cache_key)
+            self._stats["deferred"] += 1
+
+        def finish():
+            try:
+                self._resolve_uncached(cache_key, career_id, title)
+            except Exception as e:
+                print(f"⚠️ Deferred career resolution failed for {career_id!r}: {e}")
+            finally:
+                with self._lock:
+                    self._deferred.discard(cache_key)
+
+        asyncio.get_event_loop().run_in_executor(None, finish)
+
+    async def resolve_async(self, career_id: str, title: Optional[str] = None) -> str:
+        """resolve() for async endpoints: a cache miss is resolved in a worker thread, vector stage included"""
+        cache_key = (career_id or "", title or "")
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        return await asyncio.get_event_loop().run_in_executor(None, self._resolve_uncached, cache_key, career_id, title)
+
+    def resolve_all(self, career_ids: List[str]) -> List[str]:
+        """Canonical IDs for a list, duplicates removed (first occurrence kept)"""
+        resolved = []
+        for career_id in career_ids:
+            canonical = self.resolve(career_id)
+            if canonical not in resolved:
+                resolved.append(canonical)
+        return resolved
+
+    def is_known(self, career_id: str) -> bool:
+        """Whether an ID resolves to a career in the occupation dataset"""
+        return self.store.row(self.resolve(career_id)) is not None
+
+    def stats(self) -> Dict:
+        self._load()
+        with self._lock:
+            stats = dict(self._stats)
+            stats["names_indexed"] = len(self._names) + len(self._synonyms)
+            stats["cache_size"] = len(self._resolved)
+        return stats
+
+# Global instance
+career_registry = CareerRegistry()
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or ["software_engineer", "swe", "Sr. Software Engineers", "Machine Learning Engineer II", "career_1"]:
+        print(f"  {name!r} -> {career_registry.resolve(name)}")
+    print(career_registry.stats())
@@ -0,0 +1,223 @@
+"""
+Circuit breaker and retry policy for OpenAI calls
+Tracks failure rates per model so fallbacks are served instantly during an upstream outage
+"""
+
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple, Type
+import os
+import random
+import threading
+import time
+import logging
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying and counting against the circuit (upstream trouble, not bad requests)
+RETRYABLE_ERRORS: Tuple[Type[Exception], ...] = (
+    openai.error.RateLimitError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+    openai.error.APIError,
+)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while its circuit is open"""
+
+    def __init__(self, model: str, retry_after_s: float):
+        super().__init__(f"Circuit open for {model}, retry in {retry_after_s:.1f}s")
+        self.model = model
+        self.retry_after_s = retry_after_s
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, window_s: float = 60.0, min_calls: int = 5, open_duration_s: float = 30.0, half_open_probes: int = 1):
+        """
+        Failure-rate circuit breaker over a sliding time window
+
+        Args:
+            name: Name of the protected resource (model)
+            failure_rate_threshold: Failure ratio in the window that opens the circuit
+            window_s: Sliding window length in seconds
+            min_calls: Minimum calls in the window before the rate is evaluated
+            open_duration_s: How long the circuit stays open before probing
+            half_open_probes: Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_s = window_s
+        self.min_calls = min_calls
+        self.open_duration_s = open_duration_s
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._outcomes = deque()  # (timestamp, success)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._rejected = 0
+        self._times_opened = 0
+
+    def allow(self) -> bool:
+        """Check whether a call may proceed, moving open -> half-open once the open period has passed"""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                if now - self._opened_at < self.open_duration_s:
+                    self._rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._probes_in_flight = 0
+
+            if self._state == self.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    self._rejected += 1
+                    return False
+                self._probes_in_flight += 1
+
+            return True
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is currently rejecting calls"""
+        with self._lock:
+            return self._state == self.OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit will allow a probe"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.open_duration_s - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # Probe succeeded - close the circuit and start a fresh window
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                logger.info(f"Circuit for {self.name} closed after successful probe")
+            self._append(True)
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the failure rate is too high"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._append(False)
+            failures = sum(1 for _, success in self._outcomes if not success)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate_threshold:
+                self._open()
+
+    def release_probe(self):
+        """Release a half-open probe slot without recording an outcome (e.g. non-retryable error)"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def _append(self, success: bool):
+        now = time.monotonic()
+        self._outcomes.append((now, success))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_s:
+            self._outcomes.popleft()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        logger.warning(f"Circuit for {self.name} opened")
+        print(f"⚠️ Circuit breaker opened for {self.name} - serving fallbacks for {self.open_duration_s:.0f}s")
+
+    def snapshot(self) -> Dict:
+        """Current breaker state for monitoring"""
+        with self._lock:
+            now = time.monotonic()
+            recent = [success for ts, success in self._outcomes if now - ts <= self.window_s]
+            failures = recent.count(False)
+            return {
+                "state": self._state,
+                "calls_in_window": len(recent),
+                "failures_in_window": failures,
+                "failure_rate": round(failures / len(recent), 3) if recent else 0.0,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected,
+                "retry_after_s": round(max(0.0, self.open_duration_s - (now - self._opened_at)), 1) if self._state == self.OPEN else 0.0
+            }
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a model"""
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(
+                    name,
+                    failure_rate_threshold=float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5")),
+                    window_s=float(os.getenv("CIRCUIT_WINDOW_S", "60")),
+                    min_calls=int(os.getenv("CIRCUIT_MIN_CALLS", "5")),
+                    open_duration_s=float(os.getenv("CIRCUIT_OPEN_S", "30")),
+                )
+            return self._breakers[name]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """State of every breaker"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an OpenAI error is transient"""
+    if isinstance(error, openai.error.APIError):
+        # Generic API errors are only transient when the server side failed
+        status = getattr(error, "http_status", None)
+        return status is None or status >= 500
+    return isinstance(error, RETRYABLE_ERRORS)
+
+def backoff_delay(attempt: int, base_s: float, max_s: float) -> float:
+    """Full-jitter exponential backoff delay for a retry attempt (0-based)"""
+    return random.uniform(0, min(max_s, base_s * (2 ** attempt)))
+
+def call_with_retries(call: Callable, breaker: CircuitBreaker, max_retries: int, base_delay_s: float, max_delay_s: float, on_retry: Optional[Callable[[int, Exception], None]] = None):
+    """
+    Run a call through a circuit breaker, retrying transient errors with jittered exponential backoff
+
+    Raises:
+        CircuitOpenError: If the circuit is open (immediately, without calling)
+        Exception: The last error once retries are exhausted or the error is not retryable
+    """
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.name, breaker.retry_after())
+
+        try:
+            result = call()
+        except Exception as e:
+            if not is_retryable(e):
+                breaker.release_probe()
+                raise
+            breaker.record_failure()
+            if attempt >= max_retries or breaker.is_open:
+                raise
+            if on_retry:
+                on_retry(attempt, e)
+            time.sleep(backoff_delay(attempt, base_delay_s, max_delay_s))
+            attempt += 1
+            continue
+
+        breaker.record_success()
+        return result
+
+# Global registry, one breaker per model
+circuit_breakers = CircuitBreakerRegistry()
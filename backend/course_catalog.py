@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Indexed local course catalog
+data/courses.json lists every course once with parsed cost (USD) and duration (weeks) columns and the
+canonical ontology skills it teaches; it is loaded into numpy columns plus inverted indexes (skill ID,
+keyword and skill category -> course rows), so "top courses for skill X under $Y" is a dictionary lookup
+and a mask over a few rows
+
+Usage:
+    python course_catalog.py "Docker" [max_cost]    # look up courses and time the query
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from skill_ontology import SkillOntology, skill_ontology
+
+CATALOG_PATH = Path(os.getenv("COURSE_CATALOG_PATH", str(Path(__file__).parent / "data" / "courses.json")))
+COURSE_FIELDS = ("id", "name", "provider", "duration", "cost", "url")
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {"and", "for", "the", "of", "in", "to", "with", "a", "an", "skills", "basics", "advanced", "fundamentals"}
+
+def _tokens(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1 and token not in _STOPWORDS]
+
+class CourseCatalog:
+    def __init__(self, path: Path = CATALOG_PATH, ontology: SkillOntology = skill_ontology):
+        """
+        Course catalog with skill, keyword and category postings (loaded on first use)
+
+        Args:
+            path: Catalog JSON file
+            ontology: Skill ontology used to resolve skill names to IDs
+        """
+        self.path = Path(path)
+        self.ontology = ontology
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._courses: List[Dict] = []
+        self._rows: Dict[str, int] = {}
+        self.cost_usd = np.zeros(0, dtype=np.float32)
+        self.duration_weeks = np.zeros(0, dtype=np.float32)
+        self._by_skill: Dict[int, np.ndarray] = {}
+        self._by_keyword: Dict[str, np.ndarray] = {}
+        self._by_category: Dict[str, np.ndarray] = {}
+        self._stats = {"lookups": 0, "skill_hits": 0, "keyword_hits": 0, "category_hits": 0, "placeholders": 0, "ids_hydrated": 0, "ids_unknown": 0}
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    courses = json.load(f)["courses"]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not load course catalog {self.path}: {e}")
+                courses = []
+
+            self.cost_usd = np.array([course.get("cost_usd", np.nan) for course in courses], dtype=np.float32)
+            self.duration_weeks = np.array([np.nan if course.get("duration_weeks") is None else course["duration_weeks"] for course in courses], dtype=np.float32)
+
+            # Postings are ranked by how central the skill is to the course (its position in the
+            # course's skill list), then by cost
+            by_skill: Dict[int, List] = {}
+            by_keyword: Dict[str, List] = {}
+            for row, course in enumerate(courses):
+                cost = float(self.cost_usd[row]) if not np.isnan(self.cost_usd[row]) else float("inf")
+                for position, skill in enumerate(course.get("skills", [])):
+                    skill_id = self.ontology.resolve(skill)
+                    if skill_id is None:
+                        print(f"⚠️ Unknown skill '{skill}' for course {course.get('id')}")
+                        continue
+                    by_skill.setdefault(skill_id, []).append((position, cost, row))
+                for keyword in course.get("keywords", []):
+                    by_keyword.setdefault(self.ontology.normalize(keyword), []).append((0, cost, row))
+                    for token in _tokens(keyword):
+                        by_keyword.setdefault(token, []).append((1, cost, row))
+
+            def postings(entries: List) -> np.ndarray:
+                rows = []
+                for _, _, row in sorted(entries):
+                    if row not in rows:
+                        rows.append(row)
+                return np.array(rows, dtype=np.int32)
+
+            self._courses = courses
+            self._rows = {course["id"]: row for row, course in enumerate(courses) if "id" in course}
+            self._by_skill = {skill_id: postings(entries) for skill_id, entries in by_skill.items()}
+            self._by_keyword = {keyword: postings(entries) for keyword, entries in by_keyword.items()}
+            self._by_category = {
+                category: postings([(1, float(self.cost_usd[row]), int(row)) for skill_id in ids for row in self._by_skill.get(skill_id, [])])
+                for category, ids in self.ontology.categories.items()
+            }
+            self._loaded = True
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._courses)
+
+    def course(self, course_id: str) -> Optional[Dict]:
+        """Catalog entry by course ID"""
+        self._load()
+        row = self._rows.get(course_id)
+        return self._courses[row] if row is not None else None
+
+    def _filter(self, rows: np.ndarray, max_cost: Optional[float], max_weeks: Optional[float], free_only: bool) -> np.ndarray:
+        """Rows within the budget and duration limits (self-paced courses pass any duration limit)"""
+        if len(rows) == 0:
+            return rows
+        mask = np.ones(len(rows), dtype=bool)
+        if free_only:
+            max_cost = 0.0
+        if max_cost is not None:
+            mask &= self.cost_usd[rows] <= max_cost
+        if max_weeks is not None:
+            weeks = self.duration_weeks[rows]
+            mask &= np.isnan(weeks) | (weeks <= max_weeks)
+        return rows[mask]
+
+    def _candidates(self, skill: str):
+        """Candidate rows per lookup tier, most specific first"""
+        skill_id = self.ontology.resolve(skill)
+        if skill_id is not None and skill_id in self._by_skill:
+            yield "skill_hits", self._by_skill[skill_id]
+        phrase = self._by_keyword.get(self.ontology.normalize(skill))
+        if phrase is not None:
+            yield "keyword_hits", phrase
+        tokens = [self._by_keyword[token] for token in _tokens(skill) if token in self._by_keyword]
+        if tokens:
+            yield "keyword_hits", np.concatenate(tokens)
+        if skill_id is not None:
+            categories = [self._by_category[category] for category, ids in self.ontology.categories.items()
+                          if category in self._by_category and skill_id in ids]
+            if categories:
+                yield "category_hits", np.concatenate(categories)
+
+    def search(self, skill: str, limit: int = 3, max_cost: Optional[float] = None, max_weeks: Optional[float] = None, free_only: bool = False) -> List[Dict]:
+        """
+        Catalog entries for a skill
+
+        Args:
+            skill: Skill name or alias (free-form skills fall back to keyword and category matches)
+            limit: Maximum number of courses
+            max_cost: Maximum total cost in USD
+            max_weeks: Maximum duration in weeks
+            free_only: Only free courses
+
+        Returns:
+            Full catalog entries, most specific match first (empty if nothing in the catalog matches)
+        """
+        self._load()
+        with self._lock:
+            self._stats["lookups"] += 1
+        found: List[int] = []
+        for tier, rows in self._candidates(skill):
+            if tier == "category_hits" and found:
+                # Category matches are too broad to pad a list of specific ones
+                break
+            rows = self._filter(rows, max_cost, max_weeks, free_only)
+            if len(rows) and not found:
+                with self._lock:
+                    self._stats[tier] += 1
+            # Keyword matches fill the slots the skill postings left open
+            for row in rows.tolist():
+                if row not in found:
+                    found.append(row)
+            if len(found) >= limit:
+                break
+        return [self._courses[row] for row in found[:limit]]
+
+    def courses_for_skill(self, skill: str, limit: int = 3, max_cost: Optional[float] = None, max_weeks: Optional[float] = None, free_only: bool = False) -> List[Dict]:
+        """
+        Courses for a learning path step, in the {"id", "name", "provider", "duration", "cost", "url"} format
+
+        Falls back to generic placeholder courses when the catalog has nothing for the skill
+        """
+        courses = self.search(skill, limit, max_cost, max_weeks, free_only)
+        if courses:
+            return [{field: course.get(field) for field in COURSE_FIELDS} for course in courses]
+        with self._lock:
+            self._stats["placeholders"] += 1
+        return [
+            {"name": f"Introduction to {skill}", "provider": "Coursera", "duration": "4-6 weeks", "cost": "Free-$99", "url": "https://www.coursera.org"},
+            {"name": f"Advanced {skill}", "provider": "Udemy", "duration": "8-12 weeks", "cost": "$200-$500", "url": "https://www.udemy.com"},
+            {"name": f"{skill} Fundamentals", "provider": "edX", "duration": "6-8 weeks", "cost": "Free-$150", "url": "https://www.edx.org"}
+        ][:limit]
+
+    def describe(self, course: Dict) -> str:
+        """One-line course summary for the catalog excerpt of a prompt"""
+        return f"{course['id']} {course['name']} ({course['provider']}, {course['cost']}, {course['duration']})"
+
+    def hydrate(self, course_ids: List[str]) -> List[Dict]:
+        """
+        Courses for catalog IDs returned by the model, in the courses_for_skill format
+
+        Unknown IDs are skipped, as are repeats
+        """
+        self._load()
+        courses, seen, unknown = [], set(), 0
+        for course_id in course_ids:
+            course_id = course_id.strip().lower()
+            row = self._rows.get(course_id)
+            if row is None:
+                unknown += 1
+            elif course_id not in seen:
+                seen.add(course_id)
+                courses.append({field: self._courses[row].get(field) for field in COURSE_FIELDS})
+        with self._lock:
+            self._stats["ids_hydrated"] += len(courses)
+            self._stats["ids_unknown"] += unknown
+        return courses
+
+    def stats(self) -> Dict:
+        self._load()
+        with self._lock:
+            stats = dict(self._stats)
+        stats["courses"] = len(self._courses)
+        stats["skills_indexed"] = len(self._by_skill)
+        stats["keywords_indexed"] = len(self._by_keyword)
+        stats["free_courses"] = int((self.cost_usd == 0).sum())
+        return stats
+
+# Global instance
+course_catalog = CourseCatalog()
+
+if __name__ == "__main__":
+    skill = sys.argv[1] if len(sys.argv) > 1 else "Docker"
+    max_cost = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    course_catalog.courses_for_skill(skill)
+    runs = 10000
+    start = time.perf_counter()
+    for _ in range(runs):
+        courses = course_catalog.courses_for_skill(skill, max_cost=max_cost)
+    elapsed = (time.perf_counter() - start) / runs
+    for course in courses:
+        print(f"  {course['name']} ({course['provider']}) - {course['cost']}, {course['duration']}")
+    print(f"⏱️ {elapsed * 1e6:.1f} µs per lookup ({course_catalog.stats()['courses']} courses)")
@@ -0,0 +1,97 @@
+"""
+Latency-deadline execution for LLM-backed endpoints
+Runs the LLM call against a per-endpoint latency budget and serves a local result when the budget runs out
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default latency budgets in seconds; override with LATENCY_BUDGET_<ENDPOINT> (0 disables the deadline)
+DEFAULT_LATENCY_BUDGETS = {
+    "career_matches": 8.0,
+    "career_path": 20.0
+}
+
+# Late LLM results still running in the background (kept referenced so they are not garbage collected)
+_background_tasks = set()
+
+def get_latency_budget(endpoint: str) -> Optional[float]:
+    """Get the latency budget for an endpoint, or None if the deadline is disabled"""
+    raw = os.getenv(f"LATENCY_BUDGET_{endpoint.upper()}")
+    try:
+        budget = float(raw) if raw is not None else DEFAULT_LATENCY_BUDGETS.get(endpoint, 0.0)
+    except ValueError:
+        logger.warning(f"Invalid latency budget for {endpoint}: {raw!r}")
+        budget = DEFAULT_LATENCY_BUDGETS.get(endpoint, 0.0)
+    return budget if budget > 0 else None
+
+class Deadline:
+    def __init__(self, budget_s: Optional[float]):
+        """One latency budget shared by the sequential steps of a request (None means no deadline)"""
+        self.expires_at = time.monotonic() + budget_s if budget_s is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (never negative), or None without a deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+async def run_with_deadline(primary: Callable[[], Any], fallback: Callable[[], Any], budget_s: Optional[float], on_late_result: Optional[Callable[[Any], None]] = None) -> Tuple[Any, str]:
+    """
+    Run a blocking primary call with a deadline, falling back to a local result
+
+    Args:
+        primary: Blocking LLM call; raises on failure
+        fallback: Blocking local computation used on timeout or failure
+        budget_s: Latency budget in seconds (None waits for the primary indefinitely)
+        on_late_result: Called on the event loop with the primary result if it finishes after the deadline
+
+    Returns:
+        Tuple of (result, source) where source is "llm", "deadline_fallback" or "error_fallback"
+    """
+    loop = asyncio.get_event_loop()
+    task = loop.run_in_executor(None, primary)
+
+    try:
+        done, _ = await asyncio.wait({task}, timeout=budget_s)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    if done:
+        try:
+            return task.result(), "llm"
+        except Exception as e:
+            logger.warning(f"LLM call failed, serving local result: {e}")
+            return await loop.run_in_executor(None, fallback), "error_fallback"
+
+    logger.warning(f"LLM call exceeded {budget_s:.1f}s budget, serving local result")
+    _background_tasks.add(task)
+    task.add_done_callback(lambda finished: _handle_late_result(finished, on_late_result))
+    return await loop.run_in_executor(None, fallback), "deadline_fallback"
+
+def _handle_late_result(task: asyncio.Future, on_late_result: Optional[Callable[[Any], None]]):
+    """Hand a late LLM result to the upgrade callback"""
+    _background_tasks.discard(task)
+    if task.cancelled() or on_late_result is None:
+        return
+    if task.exception() is not None:
+        logger.warning(f"Late LLM call failed: {task.exception()}")
+        return
+    try:
+        on_late_result(task.result())
+    except Exception as e:
+        logger.error(f"Error upgrading with late LLM result: {e}")
+
+def pending_upgrades() -> int:
+    """Number of LLM calls still running past their deadline"""
+    return len(_background_tasks)
+
+def latency_budgets() -> Dict[str, Optional[float]]:
+    """Effective latency budget per endpoint"""
+    return {endpoint: get_latency_budget(endpoint) for endpoint in DEFAULT_LATENCY_BUDGETS}
@@ -0,0 +1,190 @@
+"""
+Embedding cache keyed by text hash
+Vectors are keyed by SHA-1 of the normalized text, per embedding model, in an in-process LRU backed by an
+append-only on-disk store (a raw float32 file that is memory-mapped, plus a key file listing one SHA-1
+per row) shared by every worker on the host
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+# Empty disables the on-disk store
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", str(Path(__file__).parent / "data" / "embedding_cache"))
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting differences share an embedding"""
+    return " ".join(text.split())
+
+def text_key(text: str) -> str:
+    """Cache key of an already-normalized text"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class DiskEmbeddingStore:
+    def __init__(self, directory: Path, model_id: str, dim: int):
+        """
+        Append-only vector file for one embedding model
+
+        Rows are appended vector first, key second, under an exclusive file lock, so any key another
+        process can read already has its vector on disk. A key's row is its line number in the key file;
+        each append first truncates whatever a crashed writer left past the last complete key, so later
+        keys never pair with an orphaned vector
+        """
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id)
+        self.dim = dim
+        self.vectors_path = Path(directory) / f"{name}.f32"
+        self.keys_path = Path(directory) / f"{name}.keys"
+        self.lock_path = Path(directory) / f"{name}.lock"
+        self._rows: Dict[str, int] = {}
+        self._lines = 0
+        self._keys_offset = 0
+        self._map: Optional[np.memmap] = None
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.lock_path.touch(exist_ok=True)
+        self.refresh()
+
+    def refresh(self):
+        """Pick up rows appended by other processes since the last read"""
+        if not self.keys_path.exists():
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # Ignore a trailing partial line (a writer mid-append)
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            self._rows.setdefault(line.decode("ascii"), self._lines)
+            self._lines += 1
+        self._keys_offset += len(complete)
+
+    def _reconcile(self):
+        """Cut vectors without a key and a partial key line left by a crashed writer (caller holds the file lock)"""
+        vector_bytes = self._lines * self.dim * 4
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size > vector_bytes:
+            os.truncate(self.vectors_path, vector_bytes)
+            self._map = None
+        if self.keys_path.exists() and self.keys_path.stat().st_size > self._keys_offset:
+            os.truncate(self.keys_path, self._keys_offset)
+
+    def _vectors(self, rows_needed: int) -> np.memmap:
+        if self._map is None or len(self._map) < rows_needed:
+            rows = self.vectors_path.stat().st_size // (self.dim * 4)
+            self._map = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._map
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        return np.array(self._vectors(row + 1)[row])
+
+    def append(self, keys: List[str], vectors: np.ndarray):
+        """Append new rows (keys already on disk are skipped)"""
+        with open(self.lock_path, "r+") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                fresh = [i for i, key in enumerate(keys) if key not in self._rows]
+                if not fresh:
+                    return
+                self._reconcile()
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.ascontiguousarray(vectors[fresh], dtype=np.float32).tobytes())
+                with open(self.keys_path, "ab") as f:
+                    f.write("".join(f"{keys[i]}\n" for i in fresh).encode("ascii"))
+                self.refresh()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+class EmbeddingCache:
+    def __init__(self, model_id: str, dim: int, max_entries: int = EMBEDDING_CACHE_SIZE, cache_dir: str = EMBEDDING_CACHE_DIR):
+        """
+        Two-tier embedding cache for one model
+
+        Args:
+            model_id: Embedding model identifier (part of the key: vectors from different models never mix)
+            dim: Vector dimension
+            max_entries: In-process LRU size
+            cache_dir: Directory of the shared on-disk store ("" for memory only)
+        """
+        self.model_id = model_id
+        self.dim = dim
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk: Optional[DiskEmbeddingStore] = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if cache_dir:
+            try:
+                self._disk = DiskEmbeddingStore(Path(cache_dir), model_id, dim)
+            except OSError as e:
+                print(f"⚠️ Embedding cache directory unavailable ({e}), caching in memory only")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the keys that have one"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    found[key] = vector
+            missing = [key for key in keys if key not in found]
+            if missing and self._disk is not None:
+                if any(key not in self._disk for key in missing):
+                    self._disk.refresh()
+                for key in missing:
+                    vector = self._disk.get(key)
+                    if vector is not None:
+                        self._stats["disk_hits"] += 1
+                        self._remember(key, vector)
+                        found[key] = vector
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Store freshly computed vectors in both tiers"""
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+            if self._disk is not None:
+                try:
+                    self._disk.append(keys, vectors)
+                except OSError as e:
+                    print(f"⚠️ Could not write embedding cache ({e}), caching in memory only")
+                    self._disk = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+            stats["disk_size"] = len(self._disk) if self._disk is not None else None
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
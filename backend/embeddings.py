@@ -0,0 +1,136 @@
+"""
+Text embeddings for similarity lookups
+Uses sentence-transformers when it is installed, loaded lazily on first use, and falls back to a
+deterministic feature-hashing embedding so similarity features keep working without the model.
+Embeddings are cached per model by text hash (embedding_cache.py)
+"""
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+import logging
+import numpy as np
+from embedding_cache import EmbeddingCache, normalize_text, text_key
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+HASHING_DIM = 384
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+class EmbeddingModel:
+    def __init__(self, model_name: str = EMBEDDING_MODEL, hashing_dim: int = HASHING_DIM):
+        """Lazy embedding model (sentence-transformers if available, feature hashing otherwise)"""
+        self.model_name = model_name
+        self.hashing_dim = hashing_dim
+        self._model = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._cache: Optional[EmbeddingCache] = None
+        self._computed = 0
+        self._batches = 0
+
+    def _load(self):
+        """Load the sentence-transformers model once"""
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+                print(f"✅ Loaded embedding model {self.model_name}")
+            except Exception as e:
+                logger.warning(f"sentence-transformers unavailable, using hashing embeddings: {e}")
+                self._model = None
+            model_id = self.model_name if self._model is not None else f"hashing-{self.hashing_dim}"
+            dim = self._model.get_sentence_embedding_dimension() if self._model is not None else self.hashing_dim
+            self._cache = EmbeddingCache(model_id, dim)
+            self._loaded = True
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the embedding space (vectors from different models are not comparable)"""
+        self._load()
+        return self.model_name if self._model is not None else f"hashing-{self.hashing_dim}"
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension"""
+        self._load()
+        return self._model.get_sentence_embedding_dimension() if self._model is not None else self.hashing_dim
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts as L2-normalized float32 rows, so inner product is cosine similarity
+
+        Duplicate texts are embedded once, cached texts not at all; the misses go to the model in a
+        single batch
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            (len(texts), dim) float32 array
+        """
+        self._load()
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        normalized = [normalize_text(text) for text in texts]
+        keys = [text_key(text) for text in normalized]
+        vectors = self._cache.get_many(list(dict.fromkeys(keys)))
+
+        missing = {}
+        for key, text in zip(keys, normalized):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        if missing:
+            computed = self._compute(list(missing.values()))
+            self._cache.put_many(list(missing), computed)
+            vectors.update(zip(missing, computed))
+            self._computed += len(missing)
+            self._batches += 1
+        return np.vstack([vectors[key] for key in keys])
+
+    def _compute(self, texts: List[str]) -> np.ndarray:
+        """Run the model (or the hashing fallback) on uncached texts"""
+        if self._model is not None:
+            vectors = self._model.encode(texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+            return vectors.astype(np.float32)
+        return np.vstack([self._hash_embed(text) for text in texts])
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """Embed a single text"""
+        return self.encode([text])[0]
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the model has been loaded (reading this never triggers the load)"""
+        return self._loaded
+
+    def stats(self) -> Dict:
+        """Cache hit rates and how much was actually embedded; never loads the model (safe for health checks)"""
+        if not self._loaded:
+            return {"loaded": False, "model_name": self.model_name, "computed": 0, "model_batches": 0, "cache": None}
+        return {"loaded": True, "model_name": self.model_name, "model_id": self.model_id, "computed": self._computed, "model_batches": self._batches, "cache": self._cache.stats()}
+
+    def _hash_embed(self, text: str) -> np.ndarray:
+        """Signed feature hashing over word unigrams and bigrams"""
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.hashing_dim, dtype=np.float32)
+        for feature in features:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.hashing_dim] += 1.0 if digest >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two vectors"""
+    denominator = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b)) / denominator if denominator else 0.0
+
+# Global instance
+embedding_model = EmbeddingModel()
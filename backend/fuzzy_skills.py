@@ -0,0 +1,224 @@
+"""
+Typo-tolerant skill lookup
+SymSpell-style deletion dictionary over the parser's skill keywords, so garbled PDF tokens ("Kubernets")
+and split words ("Tensor Flow", "Postgre SQL") resolve to canonical skills with a few hash lookups
+instead of comparing against the whole vocabulary.
+
+Ordinary prose is full of words a couple of edits from a skill ("objective" / Objective-C, "conference" /
+Confluence, "ellipse" / Eclipse), so in running text a typo only counts when the token looks like a skill:
+written in mixed case ("TensorFLow", "JavaScirpt"), or a single interior edit on a long token that sits
+next to an exactly matched skill ("Python, Kubernets, Docker"). Split words only count when they join into
+an exact keyword
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from skill_ontology import SkillOntology, skill_ontology
+
+# Terms shorter than this only match exactly; short words are too close to ordinary English
+# ("sigma" / "figma", "sprint" / "spring", "docket" / "docker")
+FUZZY_MIN_LENGTH = 7
+# Terms of this length or longer tolerate a second edit
+FUZZY_LONG_LENGTH = 10
+
+# Shortest lowercase or capitalized token that may be corrected in running text (one edit, and only next
+# to an exactly matched skill)
+PROSE_MIN_LENGTH = 8
+# Tokens on either side searched for an exactly matched skill
+PROSE_CONTEXT_WINDOW = 3
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9+#]+(?:[.\-][A-Za-z0-9+#]+)*")
+_MIXED_CASE = re.compile(r"[a-z][A-Z]")
+
+def compact(term: str) -> str:
+    """Lowercase and drop separators ("Postgre SQL" -> "postgresql")"""
+    return re.sub(r"[\s.\-_/]", "", term.lower())
+
+def _deletes(term: str, distance: int) -> Set[str]:
+    """All strings reachable from term by deleting up to `distance` characters (term included)"""
+    results = {term}
+    frontier = {term}
+    for _ in range(distance):
+        next_frontier = set()
+        for word in frontier:
+            if len(word) <= 1:
+                continue
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count once), or max_distance + 1 if larger"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous_previous is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+class FuzzySkillIndex:
+    def __init__(self, terms: Iterable[Tuple[str, int]], min_length: int = FUZZY_MIN_LENGTH, long_length: int = FUZZY_LONG_LENGTH):
+        """
+        Build the deletion dictionary
+
+        Args:
+            terms: (term, skill ID) pairs
+            min_length: Shortest term (after compaction) that tolerates typos
+            long_length: Shortest term that tolerates two edits
+        """
+        self.min_length = min_length
+        self.long_length = long_length
+        self.max_distance = 2
+        self._exact: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._term_skills: List[int] = []
+        self._deletes: Dict[str, List[int]] = defaultdict(list)
+
+        for term, skill_id in terms:
+            key = compact(term)
+            if not key or key in self._exact:
+                continue
+            self._exact[key] = skill_id
+            distance = self.allowed_distance(len(key))
+            if distance == 0:
+                continue
+            term_index = len(self._terms)
+            self._terms.append(key)
+            self._term_skills.append(skill_id)
+            for deleted in _deletes(key, distance):
+                self._deletes[deleted].append(term_index)
+
+        self.size = len(self._exact)
+        self.stats = {"lookups": 0, "exact": 0, "fuzzy": 0, "candidates_checked": 0}
+
+    def allowed_distance(self, length: int) -> int:
+        """Edits tolerated for a term of the given length"""
+        if length < self.min_length:
+            return 0
+        return 2 if length >= self.long_length else 1
+
+    def lookup(self, token: str) -> Optional[Tuple[int, int]]:
+        """
+        Resolve a token to a skill (no prose safeguards; see find_in_text)
+
+        Returns:
+            (skill ID, edit distance), or None if nothing is close enough
+        """
+        result = self._closest(compact(token))
+        return result[:2] if result else None
+
+    def _closest(self, key: str) -> Optional[Tuple[int, int, str]]:
+        """(skill ID, edit distance, matched term) for a compacted token, or None"""
+        self.stats["lookups"] += 1
+        if key in self._exact:
+            self.stats["exact"] += 1
+            return self._exact[key], 0, key
+        if len(key) < self.min_length - 1:
+            return None
+
+        best = None
+        checked = set()
+        for deleted in _deletes(key, self.max_distance):
+            for term_index in self._deletes.get(deleted, ()):
+                if term_index in checked:
+                    continue
+                checked.add(term_index)
+                term = self._terms[term_index]
+                allowed = self.allowed_distance(len(term))
+                distance = edit_distance(key, term, allowed)
+                if distance <= allowed and (best is None or distance < best[1] or (distance == best[1] and len(term) < len(self._terms[best[2]]))):
+                    best = (self._term_skills[term_index], distance, term_index)
+        self.stats["candidates_checked"] += len(checked)
+        if best is None:
+            return None
+        self.stats["fuzzy"] += 1
+        return best[0], best[1], self._terms[best[2]]
+
+    @staticmethod
+    def _is_inflection(key: str, term: str) -> bool:
+        """One term extends the other ("objective" / "objectivec", "cucumbers" / "cucumber"): grammar, not a typo"""
+        return key.startswith(term) or term.startswith(key)
+
+    def find_in_text(self, text: str) -> Dict[int, Tuple[str, int]]:
+        """
+        Resolve the tokens and bigrams of running text (original casing)
+
+        Exact keywords always count. A typo counts for a mixed-case token, or for a long token one interior
+        edit from a skill with an exactly matched skill within PROSE_CONTEXT_WINDOW tokens; everything else
+        is taken to be an ordinary word. Bigrams count only when they join into an exact keyword.
+
+        Returns:
+            {skill ID: (matched text, edit distance)}, keeping the closest match per skill
+        """
+        tokens = _TOKEN_PATTERN.findall(text)
+        lowered = [token.lower() for token in tokens]
+        found: Dict[int, Tuple[str, int]] = {}
+
+        def keep(skill_id: int, matched: str, distance: int):
+            if skill_id not in found or distance < found[skill_id][1]:
+                found[skill_id] = (matched, distance)
+
+        exact_positions = set()
+        typos = []
+        for position, token in enumerate(tokens):
+            result = self._closest(compact(token))
+            if result is None:
+                continue
+            skill_id, distance, term = result
+            if distance == 0:
+                exact_positions.add(position)
+                keep(skill_id, lowered[position], 0)
+            elif _MIXED_CASE.search(token):
+                keep(skill_id, lowered[position], distance)
+            elif distance == 1 and len(compact(token)) >= PROSE_MIN_LENGTH and not self._is_inflection(compact(token), term):
+                typos.append((position, skill_id))
+
+        for position in range(len(tokens) - 1):
+            key = compact(lowered[position] + lowered[position + 1])
+            if key in self._exact:
+                exact_positions.update((position, position + 1))
+                keep(self._exact[key], f"{lowered[position]} {lowered[position + 1]}", 0)
+
+        for position, skill_id in typos:
+            window = range(position - PROSE_CONTEXT_WINDOW, position + PROSE_CONTEXT_WINDOW + 1)
+            if any(other in exact_positions for other in window if other != position):
+                keep(skill_id, lowered[position], 1)
+        return found
+
+class OntologyFuzzyMatcher:
+    def __init__(self, ontology: SkillOntology = skill_ontology):
+        """Fuzzy index over the resume parser's keywords, with each skill's parser categories"""
+        self.ontology = ontology
+        self.skill_categories: Dict[int, List[str]] = defaultdict(list)
+        terms = []
+        for category, keywords in ontology.keywords_by_category().items():
+            for keyword, skill_id in keywords:
+                terms.append((keyword, skill_id))
+                if category not in self.skill_categories[skill_id]:
+                    self.skill_categories[skill_id].append(category)
+        self.index = FuzzySkillIndex(terms)
+
+    def find_skills(self, text: str) -> Dict[int, Tuple[str, int]]:
+        """Skills found in a text (original casing), typo-tolerant"""
+        return self.index.find_in_text(text)
+
+    def categories(self, skill_id: int) -> List[str]:
+        """Parser categories a skill is reported under"""
+        return self.skill_categories.get(skill_id, [])
+
+# Global instance
+fuzzy_skill_matcher = OntologyFuzzyMatcher()
@@ -4,165 +4,30 @@ Uses OpenAI GPT-4 to analyze resume data and suggest relevant career paths
 """
 
 import openai
-import json
 from typing import Dict, List
 from dotenv import load_dotenv
 import os
+from llm_client import chat_completion
+from prompt_templates import PromptTemplate, prompt_templates
+from llm_json import decode_career_suggestions, decode_career_narratives
+from skill_ontology import skill_ontology
+from skill_gap import skill_gap_index
+from occupation_store import occupation_store
+from career_registry import career_registry
+from profile_index import profile_match_index
 
 # Load environment variables
 load_dotenv()
 
-class GPT4CareerMatcher:
-    def __init__(self, openai_api_key: str = None):
-        """Initialize the GPT-4 career matcher"""
-        self.api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
-        if self.api_key:
-            openai.api_key = self.api_key
-        else:
-            print("WARNING: No OpenAI API key found. Set OPENAI_API_KEY environment variable.")
-    
-    def get_career_matches(self, parsed_resume: Dict) -> List[Dict]:
-        """
-        Get career matches using GPT-4 analysis
-        
-        Args:
-            parsed_resume: Dictionary containing parsed resume data
-            
-        Returns:
-            List of career match dictionaries
-        """
-        try:
-            # Extract resume information
-            name = parsed_resume.get('name', 'Unknown')
-            skills = parsed_resume.get('skills', {})
-            all_skills = skills.get('all_skills', []) if isinstance(skills, dict) else skills or []
-            
-            # Safely convert experience_years (handle string formats like "3-5 years")
-            raw_experience = parsed_resume.get('experience_years', 0)
-            try:
-                if isinstance(raw_experience, str):
-                    # Handle formats like "3-5 years", "5+ years", "2-3 years"
-                    import re
-                    # Extract numbers from string
-                    numbers = re.findall(r'\d+', raw_experience)
-                    if numbers:
-                        # Take the first number as minimum experience
-                        experience_years = int(numbers[0])
-                    else:
-                        experience_years = 0
-                else:
-                    experience_years = int(raw_experience) if raw_experience is not None else 0
-            except (ValueError, TypeError):
-                experience_years = 0
-            
-            education = parsed_resume.get('education', [])
-            job_titles = parsed_resume.get('job_titles', [])
-            
-            # Create a comprehensive resume summary
-            resume_summary = self._create_resume_summary(name, all_skills, experience_years, education, job_titles)
-            
-            # DEBUG: Print what we're sending to GPT-4
-            print(f"DEBUG: Sending to GPT-4:")
-            print(f"Name: {name}")
-            print(f"Job Titles: {job_titles}")
-            print(f"Education: {education}")
-            print(f"Original Skills: {all_skills}")
-            print(f"Resume Summary: {resume_summary}")
-            print("=" * 50)
-            
-            # Create the GPT-4 prompt
-            prompt = self._create_career_analysis_prompt(resume_summary)
-            
-            # Call GPT-4 (compatible with v0.28.1)
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional career counselor and expert in career transitions. You analyze resumes and suggest the most suitable career paths based on skills, experience, and background. Always respond with valid JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.3  # Lower temperature for more consistent results
-            )
-            
-            # Parse the response
-            career_suggestions = json.loads(response.choices[0].message.content)
-            
-            # Convert to our expected format
-            career_matches = self._format_career_matches(career_suggestions, parsed_resume)
-            
-            return career_matches
-            
-        except Exception as e:
-            print(f"Error in GPT-4 career matching: {e}")
-            # Fallback to simple matching
-            return self._get_fallback_matches(parsed_resume)
-    
-    def _create_resume_summary(self, name: str, skills: List[str], experience_years: int, education: List[str], job_titles: List[str]) -> str:
-        """Create a comprehensive resume summary for GPT-4 analysis"""
-        
-        summary_parts = []
-        
-        if name and name != 'Unknown':
-            summary_parts.append(f"Candidate: {name}")
-        
-        if experience_years > 0:
-            summary_parts.append(f"Experience: {experience_years} years")
-        
-        if skills:
-            # Filter out programming languages for non-tech fields
-            filtered_skills = self._filter_skills_for_field(skills, job_titles, education)
-            if filtered_skills:
-                skills_text = ", ".join(filtered_skills[:15])  # Limit to top 15 skills
-                summary_parts.append(f"Skills: {skills_text}")
-        
-        if job_titles:
-            titles_text = ", ".join(job_titles[:5])  # Limit to top 5 job titles
-            summary_parts.append(f"Previous roles: {titles_text}")
-        
-        if education:
-            education_text = ", ".join(education[:3])  # Limit to top 3 education entries
-            summary_parts.append(f"Education: {education_text}")
-        
-        return "\n".join(summary_parts)
-    
-    def _filter_skills_for_field(self, skills: List[str], job_titles: List[str], education: List[str]) -> List[str]:
-        """Filter out programming languages for non-tech fields"""
-        
-        # Check if this is clearly a non-tech field
-        is_non_tech = self._is_non_tech_field(job_titles, education)
-        
-        if is_non_tech:
-            # Filter out programming languages
-            programming_langs = ["C", "C++", "Java", "Python", "JavaScript", "Go", "R", "Lua", "Ruby", "PHP", "Swift", "Kotlin", "Rust", "TypeScript", "C#", "Scala", "Haskell", "Clojure", "Erlang", "F#", "OCaml", "Prolog", "Lisp", "Assembly", "MATLAB", "SAS", "Stata", "SPSS", "Rspec"]
-            return [skill for skill in skills if skill not in programming_langs]
-        else:
-            return skills
-    
-    def _is_non_tech_field(self, job_titles: List[str], education: List[str]) -> bool:
-        """Check if this is clearly a non-tech field"""
-        
-        # Check job titles for non-tech indicators
-        non_tech_titles = ["architect", "designer", "manager", "analyst", "consultant", "coordinator", "specialist", "director", "supervisor", "teacher", "professor", "researcher", "scientist", "doctor", "nurse", "lawyer", "accountant", "marketing", "sales", "hr", "operations"]
-        
-        for title in job_titles:
-            title_lower = title.lower()
-            if any(non_tech in title_lower for non_tech in non_tech_titles):
-                return True
-        
-        # Check education for non-tech degrees
-        education_text = " ".join(education).lower()
-        non_tech_degrees = ["architecture", "design", "business", "marketing", "education", "psychology", "sociology", "political", "history", "english", "art", "music", "theater", "medicine", "nursing", "law", "accounting", "finance", "economics"]
-        
-        if any(degree in education_text for degree in non_tech_degrees):
-            return True
-        
-        return False
-    
-    def _create_career_analysis_prompt(self, resume_summary: str) -> str:
-        """Create the GPT-4 prompt for career analysis"""
-        
-        return f"""
-You are an expert career counselor with access to comprehensive occupational data. Your task is to analyze this resume and recommend 5 career paths that are actually relevant to the person's real background, skills, and work history.
+# Prompt variant for career analysis: "compact" (default, rules only) or "full" (adds the worked example and
+# static sample output, kept for comparing output quality)
+CAREER_PROMPT_VARIANT = os.getenv("CAREER_PROMPT_VARIANT", "compact")
+
+# Static career-analysis instructions. Everything here is identical across requests, so it
+# goes in the system message ahead of the resume summary to maximize prefix-cache reuse.
+CAREER_ANALYSIS_INSTRUCTIONS = """You are a professional career counselor and expert in career transitions. You analyze resumes and suggest the most suitable career paths based on skills, experience, and background. Always respond with valid JSON format.
+
+You are an expert career counselor with access to comprehensive occupational data. Your task is to analyze the resume summary provided by the user and recommend 5 career paths that are actually relevant to the person's real background, skills, and work history.
 
 ⚠️ CRITICAL RULES:
 
@@ -226,9 +91,9 @@ Growth outlook
 Next steps (certifications, courses, networking tips)
 
 RESPONSE FORMAT (JSON)
-{{
+{
   "career_suggestions": [
-    {{
+    {
       "title": "Job Title",
         "career_id": "software_developer",  // Use descriptive names like: architect, software_developer, data_scientist, etc.
       "match_percentage": 85,
@@ -239,9 +104,9 @@ RESPONSE FORMAT (JSON)
       "salary_range": "$60,000 - $90,000",
       "growth_outlook": "Strong growth expected",
       "next_steps": ["Action 1", "Action 2"]
-    }}
+    }
   ]
-}}
+}
 
 FIELD-SPECIFIC CHECKLIST
 
@@ -267,9 +132,6 @@ Are you avoiding software/data/AI unless it's clearly supported?
 
 Are you grounding matches in actual career transitions, not generic buzzwords?
 
-Resume Summary:
-{resume_summary}
-
 SPECIFIC EXAMPLE TO FOLLOW:
 If the resume shows:
 - Name: "Roopika Rayala" 
@@ -294,6 +156,301 @@ IMPORTANT: Use descriptive career_id format like:
 
 DO NOT use numbers like "1", "2", "3" for career_id!
 """
+
+# Compact variant: same rules, output schema and field checklist with the long walkthrough removed
+COMPACT_CAREER_ANALYSIS_INSTRUCTIONS = """You are a professional career counselor and expert in career transitions. You analyze resumes and suggest the most suitable career paths based on skills, experience, and background. Always respond with valid JSON format.
+
+Recommend 5 career paths grounded in the person's real field, skills and work history.
+
+Rules:
+- Decide the primary field from degrees, job titles and recurring industry skills.
+- Only suggest tech/software roles with real evidence: a CS/IT degree, software/IT job titles, or substantial coding work. Listing programming languages is NOT enough.
+- Ignore programming languages when the field is clearly non-tech (e.g. "Architect" title + "Bachelor of Architecture" -> Architect, Interior Designer, Urban Planner, Construction Manager, Landscape Architect; never Software Architect).
+- Suggest roles within the field or realistic transitions based on skill overlap.
+
+Field checklist:
+Architecture/Engineering: Architect, Interior Designer, Urban Planner, Construction Manager, Landscape Architect
+Design/Creative: Graphic Designer, UX Designer, Industrial Designer, Art Director, Creative Director
+Business/Marketing: Business Analyst, Marketing Manager, Project Manager, Operations Manager, Sales Manager
+Healthcare/Science: Research Scientist, Lab Technician, Public Health Specialist
+Education/Training: Teacher, Curriculum Developer, Educational Technologist, Training Specialist
+Tech/Software/IT (only if proven): Software Developer, Data Analyst, IT Specialist, Systems Engineer
+
+career_id must be a descriptive snake_case name (architect, interior_designer, software_developer), never a number.
+
+Respond with JSON only:
+{"career_suggestions": [{"title": "Job Title", "career_id": "snake_case_id", "match_percentage": 85, "description": "...", "why_good_fit": "...", "matched_skills": ["..."], "missing_skills": ["..."], "salary_range": "$60,000 - $90,000", "growth_outlook": "...", "next_steps": ["..."]}]}
+"""
+
+CAREER_ANALYSIS_USER_TEMPLATE = """Resume Summary:
+{resume_summary}"""
+
+CAREER_ANALYSIS_TEMPLATES = {
+    "full": "career_analysis",
+    "compact": "career_analysis_compact"
+}
+
+CAREER_NARRATIVE_INSTRUCTIONS = """You are an expert career counselor. A candidate's skill profile changed and the careers listed below are now among their best matches.
+
+For each listed career write a short, specific narrative based on the candidate's skills:
+- description: one sentence on what the role does
+- why_good_fit: one or two sentences tying the candidate's skills to the role
+- next_steps: 2-3 concrete actions
+- salary_range and growth_outlook: typical US figures
+
+Respond with JSON only:
+{"career_narratives": [{"career_id": "snake_case_id", "description": "...", "why_good_fit": "...", "salary_range": "$60,000 - $90,000", "growth_outlook": "...", "next_steps": ["..."]}]}
+"""
+
+CAREER_NARRATIVE_USER_TEMPLATE = """Candidate skills: {skills}
+
+Careers:
+{careers}"""
+
+prompt_templates.register(PromptTemplate("career_analysis", "2", CAREER_ANALYSIS_INSTRUCTIONS, CAREER_ANALYSIS_USER_TEMPLATE))
+prompt_templates.register(PromptTemplate("career_analysis_compact", "1", COMPACT_CAREER_ANALYSIS_INSTRUCTIONS, CAREER_ANALYSIS_USER_TEMPLATE))
+prompt_templates.register(PromptTemplate("career_narrative", "1", CAREER_NARRATIVE_INSTRUCTIONS, CAREER_NARRATIVE_USER_TEMPLATE))
+
+class GPT4CareerMatcher:
+    def __init__(self, openai_api_key: str = None):
+        """Initialize the GPT-4 career matcher"""
+        self.api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
+        if self.api_key:
+            openai.api_key = self.api_key
+        else:
+            print("WARNING: No OpenAI API key found. Set OPENAI_API_KEY environment variable.")
+    
+    def get_career_matches(self, parsed_resume: Dict) -> List[Dict]:
+        """
+        Get career matches using GPT-4 analysis
+        
+        Args:
+            parsed_resume: Dictionary containing parsed resume data
+            
+        Returns:
+            List of career match dictionaries
+        """
+        try:
+            return self.get_gpt_career_matches(parsed_resume)
+            
+        except Exception as e:
+            print(f"Error in GPT-4 career matching: {e}")
+            # Fallback to simple matching
+            return self.get_local_matches(parsed_resume)
+    
+    def get_local_matches(self, parsed_resume: Dict) -> List[Dict]:
+        """Get career matches without calling GPT-4 (used on failure or when the latency budget runs out)"""
+        return self._get_fallback_matches(parsed_resume)
+    
+    def get_gpt_career_matches(self, parsed_resume: Dict) -> List[Dict]:
+        """
+        Get career matches from GPT-4, raising on any failure
+        
+        Args:
+            parsed_resume: Dictionary containing parsed resume data
+            
+        Returns:
+            List of career match dictionaries
+        """
+        # Extract resume information
+        name = parsed_resume.get('name', 'Unknown')
+        skills = parsed_resume.get('skills', {})
+        all_skills = skills.get('all_skills', []) if isinstance(skills, dict) else skills or []
+        
+        # Safely convert experience_years (handle string formats like "3-5 years")
+        raw_experience = parsed_resume.get('experience_years', 0)
+        try:
+            if isinstance(raw_experience, str):
+                # Handle formats like "3-5 years", "5+ years", "2-3 years"
+                import re
+                # Extract numbers from string
+                numbers = re.findall(r'\d+', raw_experience)
+                if numbers:
+                    # Take the first number as minimum experience
+                    experience_years = int(numbers[0])
+                else:
+                    experience_years = 0
+            else:
+                experience_years = int(raw_experience) if raw_experience is not None else 0
+        except (ValueError, TypeError):
+            experience_years = 0
+        
+        education = parsed_resume.get('education', [])
+        job_titles = parsed_resume.get('job_titles', [])
+        
+        # Create a comprehensive resume summary
+        resume_summary = self._create_resume_summary(name, all_skills, experience_years, education, job_titles)
+        
+        # DEBUG: Print what we're sending to GPT-4
+        print(f"DEBUG: Sending to GPT-4:")
+        print(f"Name: {name}")
+        print(f"Job Titles: {job_titles}")
+        print(f"Education: {education}")
+        print(f"Original Skills: {all_skills}")
+        print(f"Resume Summary: {resume_summary}")
+        print("=" * 50)
+        
+        # Near-duplicate profiles (same skills and background, different name or dates) reuse earlier suggestions.
+        # Name and years are left out of the key; experience_alignment and skill fields are recomputed per profile.
+        profile_text = self._create_resume_summary('Unknown', all_skills, 0, education, job_titles)
+        reused = profile_match_index.lookup(profile_text)
+        if reused:
+            career_suggestions, similarity = reused
+            print(f"Reusing career suggestions from a similar profile (similarity {similarity:.3f})")
+            return self._format_career_matches(self._verify_reused_suggestions(career_suggestions, all_skills), parsed_resume)
+        
+        # Create the GPT-4 prompt (static instructions first, resume summary last)
+        template_name = CAREER_ANALYSIS_TEMPLATES.get(CAREER_PROMPT_VARIANT, "career_analysis")
+        messages = self._create_career_analysis_prompt(resume_summary, template_name)
+        
+        # Call GPT-4 (compatible with v0.28.1); usage and latency are recorded per call
+        response = chat_completion(
+            model="gpt-4",
+            messages=messages,
+            template=template_name,
+            max_tokens=1500,
+            temperature=0.3  # Lower temperature for more consistent results
+        )
+        
+        # Parse, repair and validate the response, keeping every valid suggestion
+        career_suggestions = decode_career_suggestions(response.choices[0].message.content)
+        profile_match_index.add(profile_text, career_suggestions)
+        
+        # Convert to our expected format
+        career_matches = self._format_career_matches(career_suggestions, parsed_resume)
+        
+        return career_matches
+    
+    def _verify_reused_suggestions(self, career_suggestions: Dict, all_skills: List[str]) -> Dict:
+        """Keep only matched skills the actual profile has; the gap index recomputes the rest for known careers"""
+        profile, unknown_skills = skill_ontology.split_known(all_skills)
+        unknown_keys = {skill_ontology.normalize(skill) for skill in unknown_skills}
+        verified = []
+        for suggestion in career_suggestions.get("career_suggestions", []):
+            matched_skills = [
+                skill for skill in suggestion.get("matched_skills", [])
+                if skill_ontology.contains(profile, skill) or skill_ontology.normalize(skill) in unknown_keys
+            ]
+            verified.append({**suggestion, "matched_skills": matched_skills})
+        return {"career_suggestions": verified}
+    
+    def get_career_narratives(self, skills: List[str], careers: List[Dict]) -> Dict[str, Dict]:
+        """
+        Narrative fields (description, why_good_fit, next_steps, salary, outlook) for careers that
+        entered a user's top matches, falling back to generic text if GPT-4 fails
+        
+        Args:
+            skills: The user's current skills
+            careers: Dicts with career_id and title
+            
+        Returns:
+            Narrative dict per career_id
+        """
+        try:
+            narratives = self.get_gpt_career_narratives(skills, careers)
+        except Exception as e:
+            print(f"Error generating career narratives: {e}")
+            narratives = {}
+        
+        return {
+            career["career_id"]: narratives.get(career["career_id"]) or self._get_fallback_narrative(career)
+            for career in careers
+        }
+    
+    def get_gpt_career_narratives(self, skills: List[str], careers: List[Dict]) -> Dict[str, Dict]:
+        """Narratives for the given careers from GPT-4, raising on any failure"""
+        template = prompt_templates.get("career_narrative")
+        messages = template.render(
+            skills=", ".join(skills[:30]) or "None listed",
+            careers="\n".join(f"- {career['career_id']}: {career['title']}" for career in careers)
+        )
+        
+        response = chat_completion(
+            model="gpt-4",
+            messages=messages,
+            template="career_narrative",
+            max_tokens=250 * len(careers),
+            temperature=0.3
+        )
+        
+        return decode_career_narratives(response.choices[0].message.content)
+    
+    def _get_fallback_narrative(self, career: Dict) -> Dict:
+        """Narrative from the occupation dataset, used when GPT-4 is unavailable"""
+        occupation = occupation_store.get(career["career_id"]) or {}
+        return {
+            "description": occupation.get("description", f"Work as a {career['title']}"),
+            "why_good_fit": "Your updated skills cover a large share of what this role needs",
+            "salary_range": occupation.get("salary_range", "$50,000 - $80,000"),
+            "growth_outlook": occupation.get("growth_outlook", "Positive growth expected"),
+            "next_steps": ["Close the top missing skills", "Build a portfolio project for this role"]
+        }
+    
+    def _create_resume_summary(self, name: str, skills: List[str], experience_years: int, education: List[str], job_titles: List[str]) -> str:
+        """Create a comprehensive resume summary for GPT-4 analysis"""
+        
+        summary_parts = []
+        
+        if name and name != 'Unknown':
+            summary_parts.append(f"Candidate: {name}")
+        
+        if experience_years > 0:
+            summary_parts.append(f"Experience: {experience_years} years")
+        
+        if skills:
+            # Filter out programming languages for non-tech fields
+            filtered_skills = self._filter_skills_for_field(skills, job_titles, education)
+            if filtered_skills:
+                skills_text = ", ".join(filtered_skills[:15])  # Limit to top 15 skills
+                summary_parts.append(f"Skills: {skills_text}")
+        
+        if job_titles:
+            titles_text = ", ".join(job_titles[:5])  # Limit to top 5 job titles
+            summary_parts.append(f"Previous roles: {titles_text}")
+        
+        if education:
+            education_text = ", ".join(education[:3])  # Limit to top 3 education entries
+            summary_parts.append(f"Education: {education_text}")
+        
+        return "\n".join(summary_parts)
+    
+    def _filter_skills_for_field(self, skills: List[str], job_titles: List[str], education: List[str]) -> List[str]:
+        """Filter out programming languages for non-tech fields"""
+        
+        # Check if this is clearly a non-tech field
+        is_non_tech = self._is_non_tech_field(job_titles, education)
+        
+        if is_non_tech:
+            # Filter out programming languages (one vectorized mask lookup per skill)
+            return [skill for skill in skills if not skill_ontology.in_category(skill, "programming_languages")]
+        else:
+            return skills
+    
+    def _is_non_tech_field(self, job_titles: List[str], education: List[str]) -> bool:
+        """Check if this is clearly a non-tech field"""
+        
+        # Check job titles for non-tech indicators
+        non_tech_titles = ["architect", "designer", "manager", "analyst", "consultant", "coordinator", "specialist", "director", "supervisor", "teacher", "professor", "researcher", "scientist", "doctor", "nurse", "lawyer", "accountant", "marketing", "sales", "hr", "operations"]
+        
+        for title in job_titles:
+            title_lower = title.lower()
+            if any(non_tech in title_lower for non_tech in non_tech_titles):
+                return True
+        
+        # Check education for non-tech degrees
+        education_text = " ".join(education).lower()
+        non_tech_degrees = ["architecture", "design", "business", "marketing", "education", "psychology", "sociology", "political", "history", "english", "art", "music", "theater", "medicine", "nursing", "law", "accounting", "finance", "economics"]
+        
+        if any(degree in education_text for degree in non_tech_degrees):
+            return True
+        
+        return False
+    
+    def _create_career_analysis_prompt(self, resume_summary: str, template_name: str = "career_analysis") -> List[Dict]:
+        """Create the GPT-4 chat messages for career analysis (static instructions first, resume summary last)"""
+        
+        template = prompt_templates.get(template_name) or prompt_templates.get("career_analysis")
+        return template.render(resume_summary=resume_summary)
     
     def _format_career_matches(self, gpt_response: Dict, parsed_resume: Dict) -> List[Dict]:
         """Format GPT-4 response into our expected career match format"""
@@ -301,7 +458,22 @@ DO NOT use numbers like "1", "2", "3" for career_id!
         career_matches = []
         suggestions = gpt_response.get("career_suggestions", [])
         
+        # User profile as a bool vector over the skill ontology
+        skills = parsed_resume.get('skills', {})
+        all_skills = skills.get('all_skills', []) if isinstance(skills, dict) else skills or []
+        profile = skill_ontology.encode(all_skills)
+        
+        # Coverage and ranked gaps for every known occupation in one pass
+        gap_analysis = skill_gap_index.analyze(profile)
+        
+        seen_careers = set()
         for i, suggestion in enumerate(suggestions[:5]):  # Limit to 5 suggestions
+            # GPT's IDs and titles resolved to one canonical ID; a career suggested twice keeps its first entry
+            career_id = career_registry.resolve(suggestion.get("career_id", f"career_{i+1}"), suggestion.get("title"))
+            if career_id in seen_careers:
+                continue
+            seen_careers.add(career_id)
+            
             # Safely convert match_percentage to float
             try:
                 match_percentage = float(suggestion.get("match_percentage", 75))
@@ -314,19 +486,36 @@ DO NOT use numbers like "1", "2", "3" for career_id!
             except (ValueError, TypeError):
                 experience_years = 0
             
+            local_gaps = gap_analysis.for_career(career_id) or gap_analysis.for_career(suggestion.get("title", ""))
+            if local_gaps:
+                # Known occupation - matched/missing skills come from the importance matrix, most important first
+                matched_skills = local_gaps["matched_skills"]
+                missing_skills = local_gaps["missing_skills"]
+                skill_overlap = local_gaps["skill_overlap"]
+            else:
+                # Canonicalize GPT's skill strings; drop "missing" skills the user already has
+                matched_skills = skill_ontology.canonicalize(suggestion.get("matched_skills", []))
+                matched_vector, unverified_matches = skill_ontology.split_known(matched_skills)
+                missing_skills = [
+                    skill for skill in skill_ontology.canonicalize(suggestion.get("missing_skills", []))
+                    if not skill_ontology.contains(profile, skill)
+                ]
+                # Known skills are verified against the profile; skills outside the ontology are taken on trust
+                skill_overlap = skill_ontology.overlap(profile, matched_vector) + len(unverified_matches)
+            
             match = {
-                "career_id": suggestion.get("career_id", f"career_{i+1}"),
+                "career_id": career_id,
                 "title": suggestion.get("title", "Career Opportunity"),
                 "match_percentage": match_percentage,
                 "description": suggestion.get("description", "Exciting career opportunity"),
                 "why_good_fit": suggestion.get("why_good_fit", "Good match for your skills"),
-                "matched_skills": suggestion.get("matched_skills", [])[:5],
-                "missing_skills": suggestion.get("missing_skills", [])[:3],
+                "matched_skills": matched_skills[:5],
+                "missing_skills": missing_skills[:3],
                 "salary_range": suggestion.get("salary_range", "$50,000 - $80,000"),
                 "growth_outlook": suggestion.get("growth_outlook", "Positive growth expected"),
                 "next_steps": suggestion.get("next_steps", ["Continue learning", "Build portfolio"]),
                 "vector_similarity": match_percentage / 100.0,  # Convert to 0-1 scale
-                "skill_overlap": len(suggestion.get("matched_skills", [])),
+                "skill_overlap": skill_overlap,
                 "experience_alignment": min(experience_years / 5.0, 1.0) if experience_years > 0 else 0.0 if experience_years > 0 else 0.0
             }
             career_matches.append(match)
@@ -334,7 +523,7 @@ DO NOT use numbers like "1", "2", "3" for career_id!
         return career_matches
     
     def _get_fallback_matches(self, parsed_resume: Dict) -> List[Dict]:
-        """Fallback career matches if GPT-4 fails"""
+        """Fallback career matches if GPT-4 fails, ranked locally over the occupation dataset"""
         
         skills = parsed_resume.get('skills', {})
         all_skills = skills.get('all_skills', []) if isinstance(skills, dict) else skills or []
@@ -345,56 +534,40 @@ DO NOT use numbers like "1", "2", "3" for career_id!
         except (ValueError, TypeError):
             experience_years = 0
         
-        # Simple fallback based on common skills
-        fallback_careers = [
-            {
-                "career_id": "software_developer",
-                "title": "Software Developer",
-                "match_percentage": 70.0,
-                "description": "Develop software applications and systems",
-                "why_good_fit": "Based on your technical skills and experience",
-                "matched_skills": [skill for skill in all_skills if any(tech in skill.lower() for tech in ['python', 'java', 'javascript', 'programming', 'software', 'code'])][:5],
-                "missing_skills": ["Advanced algorithms", "System design"],
-                "salary_range": "$60,000 - $100,000",
-                "growth_outlook": "Strong growth in tech sector",
-                "next_steps": ["Build coding portfolio", "Practice algorithms"],
-                "vector_similarity": 0.7,
-                "skill_overlap": 3,
-                "experience_alignment": min(experience_years / 5.0, 1.0) if experience_years > 0 else 0.0
-            },
-            {
-                "career_id": "data_analyst",
-                "title": "Data Analyst",
-                "match_percentage": 65.0,
-                "description": "Analyze data to help businesses make decisions",
-                "why_good_fit": "Your analytical skills would be valuable",
-                "matched_skills": [skill for skill in all_skills if any(data in skill.lower() for data in ['excel', 'sql', 'data', 'analysis', 'statistics'])][:5],
-                "missing_skills": ["SQL", "Data visualization"],
-                "salary_range": "$50,000 - $80,000",
-                "growth_outlook": "High demand for data skills",
-                "next_steps": ["Learn SQL", "Practice with datasets"],
-                "vector_similarity": 0.65,
-                "skill_overlap": 2,
-                "experience_alignment": min(experience_years / 5.0, 1.0) if experience_years > 0 else 0.0
-            },
-            {
-                "career_id": "project_manager",
-                "title": "Project Manager",
-                "match_percentage": 60.0,
-                "description": "Lead and coordinate projects from start to finish",
-                "why_good_fit": "Your experience shows leadership potential",
-                "matched_skills": [skill for skill in all_skills if any(pm in skill.lower() for pm in ['management', 'leadership', 'project', 'coordination'])][:5],
-                "missing_skills": ["PMP certification", "Agile methodology"],
-                "salary_range": "$55,000 - $90,000",
-                "growth_outlook": "Consistent demand across industries",
-                "next_steps": ["Get PMP certification", "Learn Agile/Scrum"],
-                "vector_similarity": 0.6,
-                "skill_overlap": 2,
+        # Rank every occupation by importance-weighted skill coverage
+        gap_analysis = skill_gap_index.analyze(skill_ontology.encode(all_skills))
+        
+        fallback_careers = []
+        for career_id, coverage in gap_analysis.top(3):
+            occupation = occupation_store.get(career_id)
+            local_gaps = gap_analysis.for_career(career_id)
+            matched_skills = local_gaps["matched_skills"][:5]
+            missing_skills = local_gaps["missing_skills"][:3]
+            # Map coverage onto 50-95 so local matches read on the same scale as GPT-4's
+            match_percentage = round(50.0 + 45.0 * coverage, 1)
+            
+            if matched_skills:
+                why_good_fit = f"You already have {local_gaps['skill_overlap']} of its core skills, including {', '.join(matched_skills[:3])}"
+            else:
+                why_good_fit = "A common starting point - its core skills are learnable with focused study"
+            
+            fallback_careers.append({
+                "career_id": career_id,
+                "title": occupation["title"],
+                "match_percentage": match_percentage,
+                "description": occupation["description"],
+                "why_good_fit": why_good_fit,
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+                "salary_range": occupation["salary_range"],
+                "growth_outlook": occupation["growth_outlook"],
+                "next_steps": [f"Learn {skill}" for skill in missing_skills[:2]] + [f"Build a portfolio project as a {occupation['title']}"],
+                "vector_similarity": match_percentage / 100.0,
+                "skill_overlap": local_gaps["skill_overlap"],
                 "experience_alignment": min(experience_years / 5.0, 1.0) if experience_years > 0 else 0.0
-            }
-        ]
+            })
         
-        return fallback_careers[:3]  # Return top 3 fallback matches
+        return fallback_careers  # Top 3 local matches
 
 # Create global instance
 gpt4_career_matcher = GPT4CareerMatcher()
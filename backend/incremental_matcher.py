@@ -0,0 +1,209 @@
+"""
+Incremental career re-ranking for profile edits
+Keeps per-occupation partial scores for each user's skill profile so adding or removing skills only
+touches the occupations that use those skills, instead of re-parsing the resume and re-running GPT-4
+"""
+
+import asyncio
+import threading
+from typing import Dict, List
+import numpy as np
+from skill_gap import SkillGapIndex, skill_gap_index
+
+class IncrementalMatchState:
+    def __init__(self, index: SkillGapIndex, skills: List[str], matches: List[Dict], top_k: int = 5):
+        """
+        Build the partial scores for one user from their skills and current matches
+
+        Score for an occupation = 100 * coverage + offset. Careers GPT-4 ranked keep their own offset
+        (GPT score minus coverage at match time); other occupations get the mean offset, capped so they
+        start below the current matches and enter the top-k only when edits raise their coverage.
+        """
+        self.index = index
+        self.top_k = top_k
+        self.profile, self.unknown_skills = index.ontology.split_known(skills)
+        self.numerators = self.index.importance @ self.profile.astype(np.float32)
+        self.edits = 0
+
+        # Match dicts with a narrative, by matrix row; careers outside the dataset keep a fixed score
+        self.narratives: Dict[int, Dict] = {}
+        self.external: List[Dict] = []
+        self.offsets = np.zeros(index.size, dtype=np.float32)
+        own_offsets = {}
+        coverage = self.coverage()
+        for match in matches:
+            row = index.row(match.get("career_id", ""))
+            if row is None:
+                row = index.row(match.get("title", ""))
+            if row is None:
+                self.external.append(match)
+                continue
+            self.narratives[row] = match
+            own_offsets[row] = float(match.get("match_percentage", 0)) - 100.0 * float(coverage[row])
+
+        if own_offsets:
+            # Outsiders start just below the weakest current match, so only an edit can promote them
+            weakest = min(float(self.narratives[row].get("match_percentage", 0)) for row in own_offsets)
+            mean_offset = float(np.mean(list(own_offsets.values())))
+            self.offsets[:] = np.minimum(mean_offset, weakest - 0.1 - 100.0 * coverage)
+            for row, offset in own_offsets.items():
+                self.offsets[row] = offset
+
+        self.top_rows = self._rank()
+
+    @property
+    def skills(self) -> List[str]:
+        """Current skill list (canonical known skills, then unknown strings)"""
+        return self.index.ontology.decode(self.profile) + self.unknown_skills
+
+    def coverage(self) -> np.ndarray:
+        """Importance-weighted coverage from the partial scores"""
+        return self.numerators / self.index.total_importance
+
+    def scores(self) -> np.ndarray:
+        """Match scores (0-100 scale) for every occupation"""
+        return np.clip(100.0 * self.coverage() + self.offsets, 0.0, 100.0)
+
+    def _rank(self) -> List[int]:
+        """Rows of the current top-k, best first (external careers compete by their fixed score)"""
+        scores = self.scores()
+        k = min(self.top_k, self.index.size)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = [(float(scores[row]), row) for row in candidates.tolist()]
+        ranked += [(float(match.get("match_percentage", 0)), None) for match in self.external]
+        ranked.sort(key=lambda item: -item[0])
+        ranked = ranked[:self.top_k]
+        self.external_in_top = sum(1 for _, row in ranked if row is None)
+        return [row for _, row in ranked if row is not None]
+
+    def apply(self, add_skills: List[str], remove_skills: List[str]) -> Dict:
+        """
+        Apply a skill edit, updating only the occupations that use the changed skills
+
+        Returns:
+            Dict with the canonical added/removed skills, unknown skills, the number of occupations
+            re-scored, and the rows that entered and left the top-k
+        """
+        ontology = self.index.ontology
+        added, removed, unknown = [], [], []
+        for skill in add_skills or []:
+            skill_id = ontology.resolve(skill)
+            if skill_id is None:
+                if skill.strip() and skill.strip() not in self.unknown_skills:
+                    self.unknown_skills.append(skill.strip())
+                    unknown.append(skill.strip())
+            elif not self.profile[skill_id] and skill_id not in added:
+                added.append(skill_id)
+        for skill in remove_skills or []:
+            skill_id = ontology.resolve(skill)
+            if skill_id is None:
+                self.unknown_skills = [s for s in self.unknown_skills if ontology.normalize(s) != ontology.normalize(skill)]
+            elif self.profile[skill_id] and skill_id not in removed and skill_id not in added:
+                removed.append(skill_id)
+
+        changed = added + removed
+        affected = np.flatnonzero(self.index.required[:, changed].any(axis=1)) if changed else np.empty(0, dtype=np.int64)
+        if affected.size:
+            delta = np.zeros(affected.size, dtype=np.float32)
+            if added:
+                delta += self.index.importance[np.ix_(affected, added)].sum(axis=1)
+            if removed:
+                delta -= self.index.importance[np.ix_(affected, removed)].sum(axis=1)
+            self.numerators[affected] += delta
+        self.profile[added] = True
+        self.profile[removed] = False
+
+        previous = self.top_rows
+        self.top_rows = self._rank() if affected.size else previous
+        self.edits += 1
+
+        return {
+            "added": [ontology.names[i] for i in added],
+            "removed": [ontology.names[i] for i in removed],
+            "unknown_skills": unknown,
+            "occupations_rescored": int(affected.size),
+            "entered": [row for row in self.top_rows if row not in previous],
+            "left": [row for row in previous if row not in self.top_rows]
+        }
+
+    def needs_narrative(self) -> List[int]:
+        """Top-k rows that have no GPT-4 narrative yet"""
+        return [row for row in self.top_rows if row not in self.narratives]
+
+    def add_narratives(self, narratives: Dict[int, Dict]):
+        """Store narratives generated for careers that entered the top-k"""
+        self.narratives.update(narratives)
+
+    def matches(self) -> List[Dict]:
+        """Current top-k as match dicts, with skill fields and scores refreshed from the profile"""
+        analysis = self.index.analyze(self.profile)
+        scores = self.scores()
+        results = []
+        for row in self.top_rows:
+            match = dict(self.narratives.get(row, {}))
+            local_gaps = analysis.for_career(self.index.career_ids[row])
+            match.update({
+                "career_id": match.get("career_id", self.index.career_ids[row]),
+                "title": match.get("title", self.index.titles[row]),
+                "match_percentage": round(float(scores[row]), 1),
+                "vector_similarity": round(float(scores[row]) / 100.0, 3),
+                "matched_skills": local_gaps["matched_skills"][:5],
+                "missing_skills": local_gaps["missing_skills"][:3],
+                "skill_overlap": local_gaps["skill_overlap"]
+            })
+            results.append(match)
+        results.extend(sorted(self.external, key=lambda m: -float(m.get("match_percentage", 0)))[:self.external_in_top])
+        results.sort(key=lambda m: -float(m.get("match_percentage", 0)))
+        return results
+
+class IncrementalMatcher:
+    def __init__(self, index: SkillGapIndex = skill_gap_index, top_k: int = 5):
+        """Per-user incremental match states"""
+        self.index = index
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self._states: Dict[str, IncrementalMatchState] = {}
+        self._user_locks: Dict[str, asyncio.Lock] = {}
+
+    def user_lock(self, user_id: str) -> asyncio.Lock:
+        """
+        Lock serializing a user's edits and refreshes
+
+        A state is read before an await (GPT-4 narratives, re-matching) and written after it; without this
+        two concurrent updates for the same user interleave and one is lost
+        """
+        with self._lock:
+            lock = self._user_locks.get(user_id)
+            if lock is None:
+                lock = self._user_locks[user_id] = asyncio.Lock()
+            return lock
+
+    def get_or_create(self, user_id: str, skills: List[str], matches: List[Dict]) -> IncrementalMatchState:
+        """Get the user's state, building it from their skills and current matches on first use"""
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                state = IncrementalMatchState(self.index, skills, matches, top_k=max(self.top_k, len(matches)))
+                self._states[user_id] = state
+            return state
+
+    def discard(self, user_id: str):
+        """Drop a user's state (their matches were recomputed from scratch)"""
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def clear(self):
+        """Drop every state (new resume uploaded)"""
+        with self._lock:
+            self._states.clear()
+
+    def stats(self) -> Dict:
+        """Active states and total edits applied"""
+        with self._lock:
+            return {
+                "active_profiles": len(self._states),
+                "edits_applied": sum(state.edits for state in self._states.values())
+            }
+
+# Global instance
+incremental_matcher = IncrementalMatcher()
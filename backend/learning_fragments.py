@@ -0,0 +1,92 @@
+"""
+Per-skill learning fragment cache
+A fragment is the reusable part of a roadmap step for one skill at one experience level (courses,
+projects, estimated effort). The block for "learn Docker" is the same whichever career or user it is
+for, so fragments are cached in an in-process LRU backed by blob storage and paths are assembled from them
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from azure_storage import azure_storage
+from occupation_store import title_key
+from skill_ontology import skill_ontology
+
+LEARNING_FRAGMENT_CACHE_SIZE = int(os.getenv("LEARNING_FRAGMENT_CACHE_SIZE", "2000"))
+# Bump whenever the fragment prompt changes
+LEARNING_FRAGMENT_VERSION = "2"
+
+class LearningFragmentStore:
+    def __init__(self, max_entries: int = LEARNING_FRAGMENT_CACHE_SIZE, storage=azure_storage):
+        """
+        Two-tier fragment cache keyed by (canonical skill, experience level)
+
+        Args:
+            max_entries: In-process LRU size
+            storage: Blob storage tier (save_learning_fragment / get_learning_fragment)
+        """
+        self.max_entries = max_entries
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "storage_hits": 0, "misses": 0, "stored": 0}
+
+    def key(self, skill: str, level: str) -> str:
+        return f"{title_key(skill_ontology.canonical_name(skill))}/{title_key(level or 'entry')}/v{LEARNING_FRAGMENT_VERSION}"
+
+    def _remember(self, key: str, fragment: Dict):
+        self._memory[key] = fragment
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, skill: str, level: str) -> Optional[Dict]:
+        """Cached fragment for a skill, or None"""
+        key = self.key(skill, level)
+        with self._lock:
+            fragment = self._memory.get(key)
+            if fragment is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return fragment
+        fragment = self.storage.get_learning_fragment(key)
+        with self._lock:
+            if fragment is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["storage_hits"] += 1
+            self._remember(key, fragment)
+            return fragment
+
+    def get_many(self, skills: List[str], level: str) -> Dict[str, Dict]:
+        """Cached fragments for the skills that have one"""
+        found = {}
+        for skill in skills:
+            fragment = self.get(skill, level)
+            if fragment is not None:
+                found[skill] = fragment
+        return found
+
+    def put(self, skill: str, level: str, fragment: Dict):
+        """Cache a generated fragment (blocking storage write)"""
+        key = self.key(skill, level)
+        with self._lock:
+            self._remember(key, fragment)
+            self._stats["stored"] += 1
+        self.storage.save_learning_fragment(key, fragment)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["storage_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+# Global instance
+learning_fragment_store = LearningFragmentStore()
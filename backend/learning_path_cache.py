@@ -0,0 +1,191 @@
+"""
+Profile-aware learning path cache
+Learning paths are cached per (canonical career ID, user skill set, missing skills, experience level,
+prompt version) in an in-process LRU backed by blob storage, and a path generated for a nearly identical
+profile (same career, level and prompt, overlapping skill sets) is reused instead of calling GPT again
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from azure_storage import azure_storage
+from career_registry import career_registry
+from occupation_store import title_key
+from skill_ontology import skill_ontology
+
+LEARNING_PATH_CACHE_SIZE = int(os.getenv("LEARNING_PATH_CACHE_SIZE", "500"))
+# Minimum Jaccard similarity of both the user skills and the missing skills for near-miss reuse (> 1 disables)
+LEARNING_PATH_REUSE_JACCARD = float(os.getenv("LEARNING_PATH_REUSE_JACCARD", "0.85"))
+
+def _skill_set(skills: Iterable[str]) -> FrozenSet[str]:
+    """Canonical, case-folded skill names"""
+    return frozenset(name.lower() for name in skill_ontology.canonicalize(skills))
+
+def _set_hash(skills: FrozenSet[str]) -> str:
+    return hashlib.sha1("\n".join(sorted(skills)).encode("utf-8")).hexdigest()[:16]
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two sets (1.0 for two empty sets)"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class LearningPathKey:
+    def __init__(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str, prompt_version: str):
+        """Cache key of a personalized learning path"""
+        self.career_id = career_registry.resolve(career_id)
+        self.skills = _skill_set(user_skills)
+        self.missing = _skill_set(missing_skills)
+        self.level = title_key(experience_level or "entry")
+        self.prompt_version = prompt_version
+
+    @property
+    def bucket(self) -> str:
+        """Paths that may be reused for each other share a bucket"""
+        return f"{self.career_id}/{self.level}/v{self.prompt_version}"
+
+    @property
+    def key(self) -> str:
+        return f"{self.bucket}/{_set_hash(self.skills)}-{_set_hash(self.missing)}"
+
+class LearningPathCache:
+    def __init__(self, max_entries: int = LEARNING_PATH_CACHE_SIZE, reuse_jaccard: float = LEARNING_PATH_REUSE_JACCARD, storage=azure_storage):
+        """
+        Two-tier learning path cache
+
+        Args:
+            max_entries: In-process LRU size
+            reuse_jaccard: Skill-set similarity needed to reuse another profile's path
+            storage: Blob storage tier (save_learning_path / get_learning_path)
+        """
+        self.max_entries = max_entries
+        self.reuse_jaccard = reuse_jaccard
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        # bucket -> {key: (skills, missing)}, mirrored to storage as the bucket's manifest
+        self._buckets: Dict[str, Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]] = {}
+        self._stats = {"memory_hits": 0, "storage_hits": 0, "near_miss_hits": 0, "misses": 0, "stored": 0}
+
+    def key_for(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str, prompt_version: str) -> LearningPathKey:
+        return LearningPathKey(career_id, user_skills, missing_skills, experience_level, prompt_version)
+
+    def key_for_match(self, match: Dict, user_skills: List[str], prompt_version: str) -> LearningPathKey:
+        """Key of a career match's learning path; the one derivation shared by /career-path and speculation"""
+        return LearningPathKey(match["career_id"], user_skills, match.get("missing_skills", []), match.get("experience_level", "Entry"), prompt_version)
+
+    def _remember(self, key: str, entry: Dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _fetch_bucket(self, bucket: str) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """Known variants of a bucket, downloading its manifest on first use (call without holding the lock)"""
+        with self._lock:
+            variants = self._buckets.get(bucket)
+        if variants is not None:
+            return variants
+        manifest = self.storage.get_learning_path(f"{bucket}/index") or {}
+        return {
+            key: (frozenset(variant["skills"]), frozenset(variant["missing_skills"]))
+            for key, variant in manifest.get("variants", {}).items()
+        }
+
+    def _bucket(self, bucket: str, fetched: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """Bucket variants, keeping a concurrently loaded copy if there is one (caller holds the lock)"""
+        return self._buckets.setdefault(bucket, fetched)
+
+    def get(self, path_key: LearningPathKey) -> Optional[Dict]:
+        """
+        Cached learning path for a profile
+
+        Returns:
+            {"learning_path", "source", "match" ("exact" or "near_miss"), "similarity"}, or None on a miss
+        """
+        with self._lock:
+            if path_key.key in self._memory:
+                self._stats["memory_hits"] += 1
+                entry = self._memory[path_key.key]
+                self._memory.move_to_end(path_key.key)
+                return {"learning_path": entry["learning_path"], "source": entry["source"], "match": "exact", "similarity": 1.0}
+
+        # Storage reads happen outside the lock
+        entry = self.storage.get_learning_path(path_key.key)
+        if entry is not None:
+            with self._lock:
+                self._remember(path_key.key, entry)
+                self._stats["storage_hits"] += 1
+            return {"learning_path": entry["learning_path"], "source": entry["source"], "match": "exact", "similarity": 1.0}
+
+        best_key, best_similarity = None, 0.0
+        if self.reuse_jaccard <= 1.0:
+            fetched = self._fetch_bucket(path_key.bucket)
+            with self._lock:
+                for key, (skills, missing) in self._bucket(path_key.bucket, fetched).items():
+                    similarity = min(jaccard(skills, path_key.skills), jaccard(missing, path_key.missing))
+                    if similarity >= self.reuse_jaccard and similarity > best_similarity:
+                        best_key, best_similarity = key, similarity
+        entry = None
+        if best_key:
+            with self._lock:
+                entry = self._memory.get(best_key)
+                if entry is not None:
+                    self._memory.move_to_end(best_key)
+            if entry is None:
+                entry = self.storage.get_learning_path(best_key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._remember(best_key, entry)
+            self._stats["near_miss_hits"] += 1
+        return {"learning_path": entry["learning_path"], "source": entry["source"], "match": "near_miss", "similarity": round(best_similarity, 3)}
+
+    def created_at(self, path_key: LearningPathKey) -> Optional[str]:
+        """Creation time (ISO format) of an exact entry, or None; not counted in the hit statistics"""
+        with self._lock:
+            entry = self._memory.get(path_key.key)
+        if entry is None:
+            entry = self.storage.get_learning_path(path_key.key)
+        return entry.get("created_at") if entry else None
+
+    def put(self, path_key: LearningPathKey, learning_path: Dict, source: str = "llm"):
+        """Cache a generated learning path in memory and storage (blocking storage writes)"""
+        entry = {
+            "learning_path": learning_path,
+            "source": source,
+            "career_id": path_key.career_id,
+            "skills": sorted(path_key.skills),
+            "missing_skills": sorted(path_key.missing),
+            "created_at": datetime.now().isoformat()
+        }
+        fetched = self._fetch_bucket(path_key.bucket)
+        with self._lock:
+            self._remember(path_key.key, entry)
+            bucket = self._bucket(path_key.bucket, fetched)
+            bucket[path_key.key] = (path_key.skills, path_key.missing)
+            manifest = {"variants": {key: {"skills": sorted(skills), "missing_skills": sorted(missing)} for key, (skills, missing) in bucket.items()}}
+            self._stats["stored"] += 1
+        self.storage.save_learning_path(path_key.key, entry)
+        self.storage.save_learning_path(f"{path_key.bucket}/index", manifest)
+
+    def clear(self):
+        """Drop the in-process tier"""
+        with self._lock:
+            self._memory.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["storage_hits"] + stats["near_miss_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+# Global instance
+learning_path_cache = LearningPathCache()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Skill prerequisite graph and learning schedule optimizer
+data/skill_prerequisites.json gives per-skill effort (weeks at the file's reference hours/week) and
+prerequisite edges between canonical ontology skills. The scheduler pulls in the prerequisites a learner
+is missing, and list-schedules them in topological order (most important target first, then the longest
+remaining prerequisite chain, i.e. the critical path) under a weekly-hours budget. A skill absorbs at
+most the reference hours per week, so a larger budget runs independent skills in parallel and the plan
+length is bounded by the critical path rather than the total effort
+
+Usage:
+    python learning_scheduler.py "Kubernetes, Machine Learning, SQL" ["Python, Git"]
+"""
+
+import heapq
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from occupation_store import title_key
+from skill_ontology import SkillOntology, skill_ontology
+
+PREREQUISITES_PATH = Path(__file__).parent / "data" / "skill_prerequisites.json"
+
+LEARNING_HOURS_PER_WEEK = float(os.getenv("LEARNING_HOURS_PER_WEEK", "10"))
+# Upper bound on skills studied at the same time
+LEARNING_MAX_PARALLEL = int(os.getenv("LEARNING_MAX_PARALLEL", "3"))
+
+# Steps starting before these weeks go to immediate_steps / short_term_goals; the rest are long_term_goals
+PHASE_BOUNDARIES = (("immediate_steps", 13), ("short_term_goals", 26), ("long_term_goals", math.inf))
+# Effort multiplier by experience level prefix (experienced learners pick up new skills faster)
+LEVEL_EFFORT = {"entry": 1.0, "junior": 1.0, "mid": 0.85, "senior": 0.7, "lead": 0.7, "principal": 0.7}
+
+class SkillGraph:
+    def __init__(self, path: Path = PREREQUISITES_PATH, ontology: SkillOntology = skill_ontology):
+        """Load effort estimates and prerequisite edges (cycles are broken with a warning)"""
+        self.ontology = ontology
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load skill prerequisites {path}: {e}")
+            data = {}
+
+        self.reference_hours = float(data.get("hours_per_week", 10))
+        self._default_weeks = data.get("default_weeks", {})
+        self._weeks: Dict[str, float] = {}
+        self._requires: Dict[str, List[str]] = {}
+        for skill, entry in data.get("skills", {}).items():
+            name = self._name(skill)
+            if "weeks" in entry:
+                self._weeks[name] = float(entry["weeks"])
+            requires = [self._name(prerequisite) for prerequisite in entry.get("requires", [])]
+            self._requires[name] = [prerequisite for prerequisite in requires if prerequisite != name]
+        self._break_cycles()
+
+    def _name(self, skill: str) -> str:
+        return self.ontology.canonical_name(skill)
+
+    def _break_cycles(self):
+        """Drop edges that close a cycle so every subgraph has a topological order"""
+        state: Dict[str, int] = {}
+        for root in list(self._requires):
+            if state.get(root):
+                continue
+            state[root] = 1
+            stack = [(root, iter(list(self._requires.get(root, []))))]
+            while stack:
+                node, edges = stack[-1]
+                prerequisite = next(edges, None)
+                if prerequisite is None:
+                    state[node] = 2
+                    stack.pop()
+                elif state.get(prerequisite) == 1:
+                    print(f"⚠️ Prerequisite cycle: dropping {node} -> {prerequisite}")
+                    self._requires[node].remove(prerequisite)
+                elif not state.get(prerequisite):
+                    state[prerequisite] = 1
+                    stack.append((prerequisite, iter(list(self._requires.get(prerequisite, [])))))
+
+    def requires(self, skill: str) -> List[str]:
+        """Direct prerequisites of a skill (canonical names)"""
+        return self._requires.get(self._name(skill), [])
+
+    def effort_weeks(self, skill: str) -> float:
+        """Weeks to learn a skill at the reference hours/week (category default when not listed)"""
+        name = self._name(skill)
+        if name in self._weeks:
+            return self._weeks[name]
+        skill_id = self.ontology.resolve(name)
+        if skill_id is not None:
+            for category, ids in self.ontology.categories.items():
+                if skill_id in ids and category in self._default_weeks:
+                    return float(self._default_weeks[category])
+        return float(self._default_weeks.get("unknown", 4))
+
+    def stats(self) -> Dict:
+        return {
+            "skills": len(set(self._weeks) | set(self._requires)),
+            "edges": sum(len(requires) for requires in self._requires.values()),
+            "reference_hours_per_week": self.reference_hours
+        }
+
+class LearningScheduler:
+    def __init__(self, graph: Optional[SkillGraph] = None, hours_per_week: float = LEARNING_HOURS_PER_WEEK, max_parallel: int = LEARNING_MAX_PARALLEL):
+        """
+        Deterministic learning schedule optimizer
+
+        Args:
+            graph: Prerequisite graph (loaded on first use by default)
+            hours_per_week: Default weekly study budget
+            max_parallel: Upper bound on skills studied at the same time
+        """
+        self._graph = graph
+        self.hours_per_week = hours_per_week
+        self.max_parallel = max(1, max_parallel)
+
+    @property
+    def graph(self) -> SkillGraph:
+        if self._graph is None:
+            self._graph = SkillGraph()
+        return self._graph
+
+    def _select(self, targets: List[str], known, max_skills: Optional[int]) -> Dict[str, Dict]:
+        """
+        Targets plus the prerequisites the learner lacks, in target order
+
+        A target is dropped (with everything only it needed) when its missing prerequisites would not
+        fit in max_skills.
+        """
+        graph, ontology = self.graph, self.graph.ontology
+        selected: Dict[str, Dict] = {}
+        for rank, target in enumerate(targets):
+            if target in selected:
+                # Already pulled in as a prerequisite of a more important target
+                selected[target]["target"] = True
+                continue
+            closure, stack = [], [target]
+            while stack:
+                skill = stack.pop()
+                if skill in selected or skill in closure:
+                    continue
+                if skill != target and ontology.contains(known, skill):
+                    continue
+                closure.append(skill)
+                stack.extend(graph.requires(skill))
+            if max_skills is not None and len(selected) + len(closure) > max_skills:
+                continue
+            for skill in closure:
+                selected[skill] = {"rank": rank, "target": skill == target}
+        return selected
+
+    def schedule(self, skills: List[str], user_skills: List[str], experience_level: str = "Entry", hours_per_week: Optional[float] = None,
+                 effort_weeks: Optional[Dict[str, float]] = None, max_skills: Optional[int] = None) -> Dict:
+        """
+        Time-ordered study plan for a list of missing skills
+
+        Args:
+            skills: Missing skills, most important first
+            user_skills: Skills the learner already has (their prerequisites are not added)
+            experience_level: Scales effort estimates
+            hours_per_week: Weekly study budget (defaults to LEARNING_HOURS_PER_WEEK)
+            effort_weeks: Per-skill effort overrides in weeks at the reference hours/week (e.g. from fragments)
+            max_skills: Cap on scheduled skills, prerequisites included
+
+        Returns:
+            {"steps": [...] in start order, "phases": {phase: [skills]}, "critical_path", "total_weeks",
+             "critical_path_weeks" (lower bound on total_weeks), "hours_per_week", "added_prerequisites"}
+        """
+        graph, ontology = self.graph, self.graph.ontology
+        hours_per_week = hours_per_week or self.hours_per_week
+        level = title_key(experience_level or "entry")
+        level_factor = next((factor for prefix, factor in LEVEL_EFFORT.items() if level.startswith(prefix)), 1.0)
+        overrides = {ontology.canonical_name(skill): weeks for skill, weeks in (effort_weeks or {}).items() if weeks}
+
+        known = ontology.encode(user_skills)
+        nodes = self._select(ontology.canonicalize(skills), known, max_skills)
+
+        requires = {skill: [p for p in graph.requires(skill) if p in nodes] for skill in nodes}
+        dependents: Dict[str, List[str]] = {skill: [] for skill in nodes}
+        for skill, prerequisites in requires.items():
+            for prerequisite in prerequisites:
+                dependents[prerequisite].append(skill)
+        hours = {
+            skill: max(0.5, overrides.get(skill, graph.effort_weeks(skill)) * graph.reference_hours * level_factor)
+            for skill in nodes
+        }
+
+        # Topological order (Kahn), then the longest chain of effort from each skill to the end of the plan
+        pending = {skill: len(prerequisites) for skill, prerequisites in requires.items()}
+        order = [skill for skill in nodes if pending[skill] == 0]
+        for skill in order:
+            for dependent in dependents[skill]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    order.append(dependent)
+        tail: Dict[str, float] = {}
+        for skill in reversed(order):
+            tail[skill] = hours[skill] + max((tail[d] for d in dependents[skill]), default=0.0)
+
+        critical_path = []
+        if tail:
+            skill = min(nodes, key=lambda s: (-tail[s] if not requires[s] else math.inf, nodes[s]["rank"]))
+            while skill is not None:
+                critical_path.append(skill)
+                skill = max(dependents[skill], key=lambda d: (tail[d], -nodes[d]["rank"]), default=None)
+
+        # List scheduling: ready skills by importance, then longest remaining chain; each active skill
+        # studies at up to the reference hours/week and the budget decides how many run at once
+        capacity = graph.reference_hours
+        slots = max(1, min(self.max_parallel, math.ceil(hours_per_week / capacity - 1e-9)))
+        ready = [(nodes[skill]["rank"], -tail[skill], skill) for skill in nodes if not requires[skill]]
+        heapq.heapify(ready)
+        waiting = {skill: len(prerequisites) for skill, prerequisites in requires.items()}
+        remaining = dict(hours)
+        active: List[str] = []
+        start, end = {}, {}
+        now = 0.0
+        while ready or active:
+            while ready and len(active) < slots:
+                _, _, skill = heapq.heappop(ready)
+                active.append(skill)
+                start[skill] = now
+            rate = min(capacity, hours_per_week / len(active))
+            step = min(remaining[skill] for skill in active) / rate
+            now += step
+            for skill in list(active):
+                remaining[skill] -= step * rate
+                if remaining[skill] <= 1e-9:
+                    active.remove(skill)
+                    end[skill] = now
+                    for dependent in dependents[skill]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            heapq.heappush(ready, (nodes[dependent]["rank"], -tail[dependent], dependent))
+
+        critical = set(critical_path)
+        steps, phases = [], {phase: [] for phase, _ in PHASE_BOUNDARIES}
+        for skill in sorted(nodes, key=lambda s: (start[s], end[s], nodes[s]["rank"])):
+            phase = next(phase for phase, boundary in PHASE_BOUNDARIES if start[skill] < boundary)
+            phases[phase].append(skill)
+            steps.append({
+                "skill": skill,
+                "phase": phase,
+                "start_week": int(start[skill]) + 1,
+                "end_week": max(int(start[skill]) + 1, math.ceil(end[skill] - 1e-9)),
+                "effort_hours": round(hours[skill], 1),
+                "prerequisites": requires[skill],
+                "critical": skill in critical,
+                "prerequisite": not nodes[skill]["target"]
+            })
+
+        return {
+            "steps": steps,
+            "phases": phases,
+            "critical_path": critical_path,
+            "total_weeks": math.ceil(now - 1e-9),
+            "critical_path_weeks": math.ceil(max(tail.values(), default=0.0) / capacity - 1e-9),
+            "hours_per_week": hours_per_week,
+            "added_prerequisites": [skill for skill in nodes if not nodes[skill]["target"]]
+        }
+
+# Global instance
+learning_scheduler = LearningScheduler()
+
+if __name__ == "__main__":
+    targets = [s.strip() for s in (sys.argv[1] if len(sys.argv) > 1 else "Kubernetes, Machine Learning, SQL").split(",")]
+    known = [s.strip() for s in sys.argv[2].split(",")] if len(sys.argv) > 2 else []
+    learning_scheduler.schedule(targets, known)
+    runs = 1000
+    started = time.perf_counter()
+    for _ in range(runs):
+        plan = learning_scheduler.schedule(targets, known)
+    elapsed = (time.perf_counter() - started) / runs
+    for step in plan["steps"]:
+        flags = ("*" if step["critical"] else " ") + ("p" if step["prerequisite"] else " ")
+        print(f"  {flags} weeks {step['start_week']:>3}-{step['end_week']:<3} {step['phase']:<17} {step['skill']} <- {', '.join(step['prerequisites']) or '-'}")
+    print(f"📅 {plan['total_weeks']} weeks at {plan['hours_per_week']:g} h/week, critical path: {' -> '.join(plan['critical_path'])}")
+    print(f"⏱️ {elapsed * 1e3:.2f} ms per schedule ({learning_scheduler.graph.stats()['edges']} prerequisite edges)")
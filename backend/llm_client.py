@@ -0,0 +1,114 @@
+"""
+Shared OpenAI chat completion client
+Every ChatCompletion call goes through here so usage, latency, retries and circuit breaking are handled in one place
+"""
+
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+import openai
+from dotenv import load_dotenv
+from llm_metrics import llm_metrics
+from circuit_breaker import circuit_breakers, call_with_retries, is_retryable
+from prompt_templates import count_message_tokens, count_tokens
+
+# Load environment variables
+load_dotenv()
+
+# Point the client at another OpenAI-compatible endpoint (e.g. mock_openai_server.py) via OPENAI_API_BASE
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE")
+if OPENAI_API_BASE:
+    openai.api_base = OPENAI_API_BASE
+openai.api_key = os.getenv("OPENAI_API_KEY") or ("mock-key" if OPENAI_API_BASE else None)
+
+# Retry and timeout policy for OpenAI calls
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_S = float(os.getenv("LLM_RETRY_BASE_S", "0.5"))
+LLM_RETRY_MAX_S = float(os.getenv("LLM_RETRY_MAX_S", "8"))
+LLM_REQUEST_TIMEOUT_S = float(os.getenv("LLM_REQUEST_TIMEOUT_S", "60"))
+
+def chat_completion(model: str, messages: List[Dict], template: Optional[str] = None, **kwargs):
+    """
+    Call openai.ChatCompletion.create through the model's circuit breaker and record token usage and latency
+
+    Args:
+        model: OpenAI model name
+        messages: Chat messages
+        template: Prompt template name used to group metrics
+        **kwargs: Extra ChatCompletion parameters (max_tokens, temperature, ...)
+
+    Returns:
+        The raw ChatCompletion response
+
+    Raises:
+        CircuitOpenError: Immediately, while the model's circuit is open
+    """
+    kwargs.setdefault("request_timeout", LLM_REQUEST_TIMEOUT_S)
+    breaker = circuit_breakers.get(model)
+
+    def attempt():
+        start_time = time.perf_counter()
+        try:
+            response = openai.ChatCompletion.create(model=model, messages=messages, **kwargs)
+        except Exception as e:
+            llm_metrics.record(model, template, time.perf_counter() - start_time, success=False, error=type(e).__name__)
+            raise
+        llm_metrics.record(model, template, time.perf_counter() - start_time, usage=response.get("usage"))
+        return response
+
+    return call_with_retries(
+        attempt,
+        breaker,
+        max_retries=LLM_MAX_RETRIES,
+        base_delay_s=LLM_RETRY_BASE_S,
+        max_delay_s=LLM_RETRY_MAX_S,
+        on_retry=lambda attempt_number, error: print(f"Retrying {model} call after {type(error).__name__} (attempt {attempt_number + 1})")
+    )
+
+def stream_chat_completion(model: str, messages: List[Dict], template: Optional[str] = None, **kwargs) -> Iterator[str]:
+    """
+    Streamed ChatCompletion: yields content deltas as they arrive
+
+    Opening the stream goes through the model's circuit breaker and retries; an error after that is
+    recorded against the circuit and raised to the caller (a retry would replay text it already consumed).
+    Token usage isn't reported on streams, so it is counted locally.
+
+    Raises:
+        CircuitOpenError: Immediately, while the model's circuit is open
+    """
+    kwargs.setdefault("request_timeout", LLM_REQUEST_TIMEOUT_S)
+    breaker = circuit_breakers.get(model)
+    start_time = time.perf_counter()
+
+    def fail(error: Exception):
+        llm_metrics.record(model, template, time.perf_counter() - start_time, success=False, error=type(error).__name__)
+
+    try:
+        chunks = call_with_retries(
+            lambda: openai.ChatCompletion.create(model=model, messages=messages, stream=True, **kwargs),
+            breaker,
+            max_retries=LLM_MAX_RETRIES,
+            base_delay_s=LLM_RETRY_BASE_S,
+            max_delay_s=LLM_RETRY_MAX_S,
+            on_retry=lambda attempt_number, error: print(f"Retrying {model} stream after {type(error).__name__} (attempt {attempt_number + 1})")
+        )
+    except Exception as e:
+        fail(e)
+        raise
+
+    parts = []
+    try:
+        for chunk in chunks:
+            choices = chunk.get("choices") or []
+            delta = choices[0].get("delta", {}).get("content") if choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+    except Exception as e:
+        if is_retryable(e):
+            breaker.record_failure()
+        fail(e)
+        raise
+
+    usage = {"prompt_tokens": count_message_tokens(messages), "completion_tokens": count_tokens("".join(parts))}
+    llm_metrics.record(model, template, time.perf_counter() - start_time, usage=usage)
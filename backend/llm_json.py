@@ -0,0 +1,605 @@
+"""
+Tolerant JSON decoder for LLM output
+Parses model responses fast, repairs common damage (markdown fences, comments, trailing commas, truncation)
+and validates them against compiled pydantic models, keeping every item that is still valid
+"""
+
+import json
+import math
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, field_validator, model_validator
+
+_FENCE_PATTERN = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+_CLOSERS = {"{": "}", "[": "]"}
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+class LLMJSONError(ValueError):
+    """Raised when LLM output cannot be decoded into anything usable"""
+
+def _coerce_string_list(value: Any) -> Any:
+    """Accept "a, b, c" where a list of strings is expected and drop non-string junk"""
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    if isinstance(value, list):
+        return [str(item) for item in value if isinstance(item, (str, int, float)) and str(item).strip()]
+    return value
+
+def _parse_weeks(value: Any) -> Optional[int]:
+    """Whole weeks from 4, 2.5, "4-6" or "about 3 weeks" (ranges take their midpoint, rounded up); None if unparseable"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        numbers = [float(value)]
+    elif isinstance(value, str):
+        numbers = [float(number) for number in _NUMBER_PATTERN.findall(value)[:2]]
+    else:
+        return None
+    if not numbers or not all(math.isfinite(number) for number in numbers):
+        return None
+    weeks = math.ceil(sum(numbers) / len(numbers))
+    return weeks if weeks > 0 else None
+
+class CareerSuggestion(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    title: str
+    match_percentage: float
+    career_id: Optional[str] = None
+    description: Optional[str] = None
+    why_good_fit: Optional[str] = None
+    matched_skills: Optional[List[str]] = None
+    missing_skills: Optional[List[str]] = None
+    salary_range: Optional[str] = None
+    growth_outlook: Optional[str] = None
+    next_steps: Optional[List[str]] = None
+
+    @field_validator("match_percentage", mode="before")
+    @classmethod
+    def _parse_percentage(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value.strip().rstrip("%").strip()
+        return value
+
+    @field_validator("matched_skills", "missing_skills", "next_steps", mode="before")
+    @classmethod
+    def _parse_string_list(cls, value: Any) -> Any:
+        return _coerce_string_list(value)
+
+class CareerNarrative(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    career_id: str
+    description: Optional[str] = None
+    why_good_fit: Optional[str] = None
+    salary_range: Optional[str] = None
+    growth_outlook: Optional[str] = None
+    next_steps: Optional[List[str]] = None
+
+    @field_validator("next_steps", mode="before")
+    @classmethod
+    def _parse_string_list(cls, value: Any) -> Any:
+        return _coerce_string_list(value)
+
+class Course(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    provider: Optional[str] = None
+    duration: Optional[str] = None
+    cost: Optional[str] = None
+    url: Optional[str] = None
+
+    @field_validator("duration", "cost", mode="before")
+    @classmethod
+    def _stringify(cls, value: Any) -> Any:
+        return str(value) if isinstance(value, (int, float)) else value
+
+# Skill and courses named in full, or referenced by ID in the compact output schema
+class CatalogReferences(BaseModel):
+    skill: Optional[str] = None
+    skill_id: Optional[str] = None
+    courses: List[Dict] = []
+    course_ids: Optional[List[str]] = None
+
+    @field_validator("skill_id", mode="before")
+    @classmethod
+    def _stringify_id(cls, value: Any) -> Any:
+        return str(value) if isinstance(value, int) else value
+
+    @field_validator("course_ids", mode="before")
+    @classmethod
+    def _parse_ids(cls, value: Any) -> Any:
+        return _coerce_string_list(value)
+
+    @model_validator(mode="after")
+    def _require_skill(self):
+        if not self.skill and not self.skill_id:
+            raise ValueError("skill or skill_id is required")
+        return self
+
+class RoadmapStep(CatalogReferences):
+    model_config = ConfigDict(extra="allow")
+
+    priority: Optional[str] = None
+    projects: List[str] = []
+    timeline: Optional[str] = None
+
+    @field_validator("projects", mode="before")
+    @classmethod
+    def _parse_projects(cls, value: Any) -> Any:
+        return _coerce_string_list(value)
+
+class LearningFragment(CatalogReferences):
+    model_config = ConfigDict(extra="ignore")
+
+    projects: List[str] = []
+    estimated_weeks: Optional[int] = None
+
+    @field_validator("projects", mode="before")
+    @classmethod
+    def _parse_projects(cls, value: Any) -> Any:
+        return _coerce_string_list(value)
+
+    @field_validator("estimated_weeks", mode="before")
+    @classmethod
+    def _parse_estimated_weeks(cls, value: Any) -> Any:
+        # An odd estimate must never cost the whole fragment
+        return _parse_weeks(value)
+
+class PathPersonalization(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    personalized_assessment: Optional[Dict[str, Any]] = None
+    priorities: Dict[str, str] = {}
+    next_actions: Optional[List[str]] = None
+
+    @field_validator("next_actions", mode="before")
+    @classmethod
+    def _parse_string_list(cls, value: Any) -> Any:
+        return _coerce_string_list(value)
+
+ROADMAP_PHASES = ("immediate_steps", "short_term_goals", "long_term_goals")
+LEARNING_PATH_SECTIONS = ("career_title", "personalized_assessment", "market_insights", "learning_roadmap", "timeline_overview", "success_metrics", "next_actions")
+
+# Compiled once; validation runs in pydantic-core
+_career_suggestion_adapter = TypeAdapter(CareerSuggestion)
+_career_narrative_adapter = TypeAdapter(CareerNarrative)
+_course_adapter = TypeAdapter(Course)
+_roadmap_step_adapter = TypeAdapter(RoadmapStep)
+_learning_fragment_adapter = TypeAdapter(LearningFragment)
+_path_personalization_adapter = TypeAdapter(PathPersonalization)
+_string_list_adapter = TypeAdapter(List[str])
+_dict_adapter = TypeAdapter(Dict[str, Any])
+
+# Decode statistics
+_stats_lock = threading.Lock()
+_stats = {"clean": 0, "repaired": 0, "failed": 0, "items_kept": 0, "items_dropped": 0}
+
+def _count(key: str, amount: int = 1):
+    """Increment a decode statistic"""
+    with _stats_lock:
+        _stats[key] += amount
+
+def decode_stats() -> Dict[str, int]:
+    """Counts of clean, repaired and failed decodes, plus validated items kept and dropped"""
+    with _stats_lock:
+        return dict(_stats)
+
+def strip_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence"""
+    return _FENCE_PATTERN.sub("", text.strip())
+
+def _clean(text: str) -> str:
+    """Drop comments and trailing commas outside of strings"""
+    out = []
+    i, n = 0, len(text)
+    in_string = False
+    while i < n:
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if ch == "\\" and i + 1 < n:
+                out.append(text[i + 1])
+                i += 2
+                continue
+            if ch == '"':
+                in_string = False
+            i += 1
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = n if newline == -1 else newline
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        elif ch == ",":
+            j = i + 1
+            while j < n and text[j] in " \t\r\n":
+                j += 1
+            if j < n and text[j] in "}]":
+                i += 1
+                continue
+            out.append(ch)
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+def _close_truncated(text: str) -> List[str]:
+    """
+    Candidate completions for truncated JSON, best first
+
+    Closes every open string/array/object at the end of the text, then at each earlier
+    comma so that a half-written trailing element is dropped instead of the whole document.
+    """
+    stack = []
+    cut_points = []  # (index of comma, stack snapshot)
+    in_string = False
+    escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == "," and stack:
+            cut_points.append((i, list(stack)))
+
+    closers = lambda open_stack: "".join(_CLOSERS[c] for c in reversed(open_stack))
+    candidates = []
+    tail = text + ('"' if in_string else "")
+    candidates.append(tail + closers(stack))
+    for index, open_stack in reversed(cut_points[-50:]):
+        candidates.append(text[:index] + closers(open_stack))
+    return candidates
+
+def _decode(text: str) -> Tuple[Any, str]:
+    """
+    Decode without touching the statistics
+
+    Returns:
+        (result, "clean" or "repaired")
+
+    Raises:
+        LLMJSONError: If nothing usable can be recovered
+    """
+    if not text or not text.strip():
+        raise LLMJSONError("Empty LLM response")
+
+    try:
+        return json.loads(text), "clean"
+    except json.JSONDecodeError:
+        pass
+
+    repaired = _clean(strip_fences(text))
+    start = min((i for i in (repaired.find("{"), repaired.find("[")) if i != -1), default=-1)
+    if start == -1:
+        raise LLMJSONError("No JSON object found in LLM response")
+    repaired = repaired[start:].strip()
+
+    try:
+        return json.loads(repaired), "repaired"
+    except json.JSONDecodeError as e:
+        # Extra text after a complete document
+        try:
+            result, _ = json.JSONDecoder().raw_decode(repaired)
+            return result, "repaired"
+        except json.JSONDecodeError:
+            last_error = e
+
+    for candidate in _close_truncated(repaired):
+        try:
+            return json.loads(_clean(candidate)), "repaired"
+        except json.JSONDecodeError:
+            continue
+
+    raise LLMJSONError(f"Could not repair LLM JSON: {last_error}")
+
+def decode_llm_json(text: str) -> Any:
+    """
+    Decode JSON from an LLM response, repairing it if the fast path fails
+
+    Raises:
+        LLMJSONError: If nothing usable can be recovered
+    """
+    try:
+        result, outcome = _decode(text)
+    except LLMJSONError:
+        _count("failed")
+        raise
+    _count(outcome)
+    return result
+
+def _validate_items(adapter: TypeAdapter, items: Any, record_stats: bool = True) -> List[Dict]:
+    """Validate each item on its own, keeping the valid ones"""
+    if not isinstance(items, list):
+        return []
+    kept = []
+    for item in items:
+        try:
+            kept.append(adapter.validate_python(item).model_dump(exclude_none=True))
+        except ValidationError:
+            continue
+    if record_stats:
+        _count("items_kept", len(kept))
+        _count("items_dropped", len(items) - len(kept))
+    return kept
+
+def decode_career_suggestions(text: str) -> Dict[str, List[Dict]]:
+    """
+    Decode a career-analysis response into {"career_suggestions": [...]}
+
+    Raises:
+        LLMJSONError: If no valid suggestion can be recovered
+    """
+    data = decode_llm_json(text)
+    items = data.get("career_suggestions") if isinstance(data, dict) else data
+    suggestions = _validate_items(_career_suggestion_adapter, items)
+    if not suggestions:
+        raise LLMJSONError("LLM response contained no valid career suggestions")
+    return {"career_suggestions": suggestions}
+
+def decode_career_narratives(text: str) -> Dict[str, Dict]:
+    """
+    Decode a career-narrative response into {career_id: narrative}
+
+    Raises:
+        LLMJSONError: If no valid narrative can be recovered
+    """
+    data = decode_llm_json(text)
+    items = data.get("career_narratives") if isinstance(data, dict) else data
+    narratives = _validate_items(_career_narrative_adapter, items)
+    if not narratives:
+        raise LLMJSONError("LLM response contained no valid career narratives")
+    return {narrative.pop("career_id"): narrative for narrative in narratives}
+
+def decode_learning_fragments(text: str) -> Dict[str, Dict]:
+    """
+    Decode a learning-fragment response into {skill: fragment} (keyed by skill ID when the model gave one)
+
+    Raises:
+        LLMJSONError: If no valid fragment can be recovered
+    """
+    data = decode_llm_json(text)
+    items = data.get("learning_fragments") if isinstance(data, dict) else data
+    fragments = _validate_items(_learning_fragment_adapter, items)
+    if not fragments:
+        raise LLMJSONError("LLM response contained no valid learning fragments")
+    for fragment in fragments:
+        fragment["courses"] = _validate_items(_course_adapter, fragment.get("courses", []))
+    decoded = {}
+    for fragment in fragments:
+        skill, skill_id = fragment.pop("skill", None), fragment.pop("skill_id", None)
+        decoded[skill_id or skill] = fragment
+    return decoded
+
+def decode_path_personalization(text: str) -> Dict:
+    """
+    Decode the personalization layer of a fragment-assembled learning path
+
+    Raises:
+        LLMJSONError: If the response doesn't match the schema
+    """
+    data = decode_llm_json(text)
+    if isinstance(data, dict) and "path_personalization" in data:
+        data = data["path_personalization"]
+    try:
+        return _path_personalization_adapter.validate_python(data).model_dump(exclude_none=True)
+    except ValidationError as e:
+        raise LLMJSONError(f"Invalid path personalization: {e}") from e
+
+def validate_roadmap_step(step: Any, record_stats: bool = True) -> Optional[Dict]:
+    """Validate one roadmap step and its courses, or None if the step is unusable"""
+    try:
+        validated = _roadmap_step_adapter.validate_python(step).model_dump(exclude_none=True)
+    except ValidationError:
+        return None
+    validated["courses"] = _validate_items(_course_adapter, validated.get("courses", []), record_stats)
+    return validated
+
+def _is_valid(adapter: TypeAdapter, value: Any) -> bool:
+    """Check a value against a compiled schema"""
+    try:
+        adapter.validate_python(value)
+        return True
+    except ValidationError:
+        return False
+
+def _validate_phase(steps: Any, record_stats: bool = True) -> List[Dict]:
+    """Valid steps of one roadmap phase"""
+    steps = [validate_roadmap_step(step, record_stats) for step in steps] if isinstance(steps, list) else []
+    kept = [step for step in steps if step]
+    if record_stats:
+        _count("items_kept", len(kept))
+        _count("items_dropped", len(steps) - len(kept))
+    return kept
+
+def validate_learning_path_section(section: str, value: Any, record_stats: bool = True) -> Optional[Any]:
+    """
+    Validate one learning-path section (or one roadmap phase, by phase name)
+
+    Args:
+        section: Section or phase name
+        value: Decoded value
+        record_stats: Count kept and dropped items (off for partial sections of a stream, which the final
+            document is validated again as a whole)
+
+    Returns:
+        The validated value, or None if the section is unusable
+    """
+    if section in ROADMAP_PHASES:
+        return _validate_phase(value, record_stats)
+    if section == "learning_roadmap":
+        roadmap = value if isinstance(value, dict) else {}
+        phases = {phase: _validate_phase(roadmap[phase], record_stats) for phase in ROADMAP_PHASES if phase in roadmap}
+        return phases or None
+    if section == "career_title":
+        return value if isinstance(value, str) else None
+    if section in ("success_metrics", "next_actions"):
+        return value if _is_valid(_string_list_adapter, value) else None
+    return value if _is_valid(_dict_adapter, value) else None
+
+def validate_learning_path(data: Any) -> Dict:
+    """
+    Validate a learning-path document section by section
+
+    Invalid sections and roadmap steps are dropped; the caller fills missing sections locally.
+    """
+    if not isinstance(data, dict):
+        raise LLMJSONError("Learning path must be a JSON object")
+
+    path = {}
+    for section in LEARNING_PATH_SECTIONS:
+        if section in data:
+            value = validate_learning_path_section(section, data[section])
+            if value is not None:
+                path[section] = value
+
+    # Keep any extra top-level fields the model added
+    for key, value in data.items():
+        if key not in LEARNING_PATH_SECTIONS:
+            path[key] = value
+
+    if "learning_roadmap" not in path:
+        raise LLMJSONError("LLM learning path has no usable roadmap")
+    return path
+
+def decode_learning_path_overview(text: str) -> Dict:
+    """
+    Decode the overview part of a learning path generated in parallel parts
+
+    Raises:
+        LLMJSONError: If no section is usable
+    """
+    data = decode_llm_json(text)
+    if isinstance(data, dict) and "learning_path_overview" in data:
+        data = data["learning_path_overview"]
+    if not isinstance(data, dict):
+        raise LLMJSONError("Learning path overview must be a JSON object")
+    overview = {}
+    for section in LEARNING_PATH_SECTIONS:
+        if section in data and section != "learning_roadmap":
+            value = validate_learning_path_section(section, data[section])
+            if value is not None:
+                overview[section] = value
+    if not overview:
+        raise LLMJSONError("Learning path overview has no usable sections")
+    return overview
+
+def decode_roadmap_phase(text: str) -> List[Dict]:
+    """
+    Decode one roadmap phase generated on its own
+
+    Raises:
+        LLMJSONError: If no valid step can be recovered
+    """
+    data = decode_llm_json(text)
+    items = data.get("roadmap_phase") if isinstance(data, dict) else data
+    steps = _validate_phase(items)
+    if not steps:
+        raise LLMJSONError("LLM response contained no valid roadmap steps")
+    return steps
+
+class JSONSectionStream:
+    def __init__(self, paths: List[Tuple[str, ...]]):
+        """
+        Incremental detector for sections of a JSON document that is still being generated
+
+        Args:
+            paths: Key paths of the object/array values to report, e.g. ("learning_roadmap", "immediate_steps")
+        """
+        self.paths = set(paths)
+        self._size = 0
+        self._text = ""
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        # Open containers: [bracket, key path of the container, current key, expecting a key, start offset if watched]
+        self._stack: List[list] = []
+        self._done = False
+
+    def feed(self, text: str) -> List[Tuple[Tuple[str, ...], Any]]:
+        """
+        Scan newly generated text
+
+        Returns:
+            (path, decoded value) for every watched section that closed in this text; sections are decoded
+            without counting decode statistics (the finished document is decoded and counted once)
+        """
+        completed = []
+        offset = self._size
+        self._text += text
+        self._size += len(text)
+        for i in range(offset, self._size):
+            if self._done:
+                break
+            ch = self._text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    frame = self._stack[-1] if self._stack else None
+                    if frame is not None and frame[0] == "{" and frame[3]:
+                        try:
+                            frame[2] = json.loads(self._text[self._string_start:i + 1])
+                        except json.JSONDecodeError:
+                            frame[2] = None
+                        frame[3] = False
+                continue
+
+            if ch == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._string_start = i
+            elif ch in "{[":
+                if self._stack:
+                    parent = self._stack[-1]
+                    path = parent[1] + ((parent[2],) if parent[0] == "{" else ("[]",))
+                elif ch == "{":
+                    path = ()
+                else:
+                    # Only an object can be the document root here; skip prose before it
+                    continue
+                self._stack.append([ch, path, None, ch == "{", i if path in self.paths else None])
+            elif ch in "}]" and self._stack:
+                frame = self._stack.pop()
+                if frame[4] is not None:
+                    try:
+                        completed.append((frame[1], _decode(self._text[frame[4]:i + 1])[0]))
+                    except LLMJSONError:
+                        pass
+                if not self._stack:
+                    self._done = True
+            elif ch == "," and self._stack and self._stack[-1][0] == "{":
+                self._stack[-1][3] = True
+        return completed
+
+def decode_learning_path(text: str) -> Dict:
+    """
+    Decode and validate a learning-path response
+
+    Raises:
+        LLMJSONError: If no usable roadmap can be recovered
+    """
+    return validate_learning_path(decode_llm_json(text))
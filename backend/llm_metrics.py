@@ -0,0 +1,82 @@
+"""
+Per-call LLM usage and latency metrics
+Records prompt/completion tokens and wall-clock latency for every OpenAI call
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+import threading
+
+class LLMMetrics:
+    def __init__(self, history_size: int = 500):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=history_size)
+        self._totals: Dict[str, Dict] = {}
+
+    def record(self, model: str, template: Optional[str], latency_s: float, usage: Optional[Dict] = None, success: bool = True, error: Optional[str] = None) -> Dict:
+        """Record one LLM call"""
+        usage = usage or {}
+        details = usage.get("prompt_tokens_details") or {}
+        entry = {
+            "model": model,
+            "template": template or "untemplated",
+            "prompt_tokens": int(usage.get("prompt_tokens", 0) or 0),
+            "completion_tokens": int(usage.get("completion_tokens", 0) or 0),
+            "cached_tokens": int(details.get("cached_tokens", 0) or 0),
+            "latency_s": round(latency_s, 4),
+            "success": success,
+            "error": error,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        with self._lock:
+            self._recent.append(entry)
+            totals = self._totals.setdefault(entry["template"], {
+                "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "cached_tokens": 0, "latency_s": 0.0
+            })
+            totals["calls"] += 1
+            totals["errors"] += 0 if success else 1
+            totals["prompt_tokens"] += entry["prompt_tokens"]
+            totals["completion_tokens"] += entry["completion_tokens"]
+            totals["cached_tokens"] += entry["cached_tokens"]
+            totals["latency_s"] += latency_s
+
+        return entry
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """Most recent calls, newest last"""
+        with self._lock:
+            return list(self._recent)[-limit:]
+
+    def summary(self) -> Dict:
+        """Aggregated usage per template with latency percentiles over recent calls"""
+        with self._lock:
+            totals = {name: dict(values) for name, values in self._totals.items()}
+            recent = list(self._recent)
+
+        summary = {}
+        for name, values in totals.items():
+            calls = values["calls"] or 1
+            latencies = sorted(e["latency_s"] for e in recent if e["template"] == name)
+            summary[name] = {
+                **values,
+                "latency_s": round(values["latency_s"], 3),
+                "avg_prompt_tokens": round(values["prompt_tokens"] / calls, 1),
+                "avg_completion_tokens": round(values["completion_tokens"] / calls, 1),
+                "avg_latency_s": round(values["latency_s"] / calls, 3),
+                "p50_latency_s": _percentile(latencies, 0.50),
+                "p95_latency_s": _percentile(latencies, 0.95)
+            }
+        return summary
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+# Global instance
+llm_metrics = LLMMetrics()
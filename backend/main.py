@@ -1,19 +1,40 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 # Removed PhoneCallRequest - no longer needed without VAPI
 import uvicorn
+import json
 from datetime import datetime
 import os
+import time
 import shutil
 from pathlib import Path
 from resume_parser import resume_parser
 from persona_chat import PersonaChat
 from gpt4_career_matcher import gpt4_career_matcher
-from career_path_optimizer import career_path_optimizer
+from career_path_optimizer import career_path_optimizer, LEARNING_PATH_PROMPT_VERSION, LEARNING_PATH_STREAM_VERSION, STREAM_SECTIONS
 from azure_storage import azure_storage
+from llm_client import chat_completion
+from llm_metrics import llm_metrics
+from circuit_breaker import circuit_breakers
+from llm_json import decode_stats
+from prompt_templates import prompt_templates
+from deadline import Deadline, run_with_deadline, get_latency_budget, latency_budgets, pending_upgrades
+from skill_ontology import skill_ontology
+from skill_gap import skill_gap_index
+from incremental_matcher import incremental_matcher
+from profile_index import profile_match_index
+from occupation_store import occupation_store
+from career_registry import career_registry
+from vector_index import vector_indexes
+from embeddings import embedding_model
+from learning_path_cache import learning_path_cache, LearningPathKey
+from learning_fragments import learning_fragment_store
+from course_catalog import course_catalog
+from path_warmup import learning_path_warmup
+from speculation import speculative_precompute
 # Removed VAPI voice chat - using OpenAI voice instead
 from typing import List, Dict, Optional
 import asyncio
@@ -28,6 +49,9 @@ persona_chat = None
 # Simple in-memory cache for career matches
 career_matches_cache = {}
 
+# Parsed skills per user, so local re-scoring doesn't re-parse the resume
+user_skill_profiles = {}
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan with proper startup and shutdown"""
@@ -37,6 +61,11 @@ async def lifespan(app: FastAPI):
     try:
         print("🚀 Starting CareerView API...")
         persona_chat = PersonaChat(openai_api_key=OPENAI_API_KEY)
+        # Map the prebuilt embedding indexes (nothing is embedded at startup)
+        loaded = vector_indexes.load_all(["occupations", "skills"])
+        status = ", ".join(f"{name}={'mapped' if ok else 'missing'}" for name, ok in loaded.items())
+        print(f"🧭 Vector indexes: {status}")
+        learning_path_warmup.start()
         print("✅ All services initialized successfully!")
         yield
     except asyncio.CancelledError:
@@ -49,7 +78,7 @@ async def lifespan(app: FastAPI):
         # Shutdown
         try:
             print("🛑 Shutting down CareerView API...")
-            # Clean up any resources here if needed
+            await learning_path_warmup.stop()
             print("✅ Shutdown complete!")
         except asyncio.CancelledError:
             print("⚠️ Shutdown cancelled")
@@ -70,6 +99,15 @@ class ChatResponse(BaseModel):
     timestamp: str
     conversation_id: str
 
+class WhatIfRequest(BaseModel):
+    skills: List[str]
+    career_ids: Optional[List[str]] = None
+    top_k: Optional[int] = 5
+
+class ProfileEditRequest(BaseModel):
+    add_skills: Optional[List[str]] = []
+    remove_skills: Optional[List[str]] = []
+
 # Initialize FastAPI app with lifespan management
 app = FastAPI(
     title="CareerView API",
@@ -78,6 +116,20 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Monitoring endpoints that don't count as interactive traffic for the warm-up scheduler
+WARMUP_EXEMPT_PATHS = {"/", "/health", "/performance"}
+
+@app.middleware("http")
+async def track_interactive_requests(request: Request, call_next):
+    """Let background warm-up know when interactive requests are in flight"""
+    if request.url.path in WARMUP_EXEMPT_PATHS:
+        return await call_next(request)
+    learning_path_warmup.request_started()
+    try:
+        return await call_next(request)
+    finally:
+        learning_path_warmup.request_finished()
+
 # CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -133,6 +185,23 @@ async def performance_check():
         "azure_available": azure_available,
         "azure_response_time": f"{azure_time:.3f}s",
         "cache_size": len(getattr(azure_storage, '_azure_cache', {})),
+        "llm_usage": llm_metrics.summary(),
+        "prompt_templates": prompt_templates.token_report(),
+        "circuit_breakers": circuit_breakers.snapshot(),
+        "llm_json": decode_stats(),
+        "latency_budgets": latency_budgets(),
+        "pending_llm_upgrades": pending_upgrades(),
+        "incremental_matching": incremental_matcher.stats(),
+        "profile_reuse": profile_match_index.stats(),
+        "occupation_store": occupation_store.stats(),
+        "vector_indexes": vector_indexes.stats(),
+        "embeddings": embedding_model.stats(),
+        "learning_path_cache": learning_path_cache.stats(),
+        "learning_fragments": learning_fragment_store.stats(),
+        "course_catalog": course_catalog.stats(),
+        "learning_path_warmup": learning_path_warmup.stats(),
+        "speculation": speculative_precompute.stats(),
+        "career_registry": career_registry.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -270,6 +339,9 @@ async def upload_resume(file: UploadFile = File(...)):
         # Clear career matches cache since new resume was uploaded
         global career_matches_cache
         career_matches_cache.clear()
+        user_skill_profiles.clear()
+        incremental_matcher.clear()
+        speculative_precompute.cancel()
         print("Career matches cache cleared due to new resume upload")
         
         # Also clear Azure cache
@@ -350,121 +422,351 @@ async def get_career_matches(user_id: str, force_refresh: bool = False):
                 print(f"Returning Azure-stored career matches for {user_id}")
                 return azure_matches
         
-        # Check in-memory cache as fallback
-        if user_id in career_matches_cache:
-            cached_data = career_matches_cache[user_id]
-            print(f"Returning cached career matches for {user_id}")
-            return cached_data
-        
-        # Get the most recent resume for this user
-        upload_dir = Path("uploads")
-        if not upload_dir.exists():
-            raise HTTPException(status_code=404, detail="No resumes found")
-        
-        # Get the most recent file (in a real app, you'd filter by user_id)
-        files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx"))
-        if not files:
-            raise HTTPException(status_code=404, detail="No resume files found")
-        
-        latest_file = max(files, key=os.path.getctime)
-        
-        # Parse the resume
-        parsed_resume = resume_parser.parse_resume(latest_file)
+        # A refresh replaces the user's matches; serialize it with their profile edits
+        async with incremental_matcher.user_lock(user_id):
+            # Check in-memory cache as fallback
+            if user_id in career_matches_cache:
+                cached_data = career_matches_cache[user_id]
+                print(f"Returning cached career matches for {user_id}")
+                return cached_data
+            
+            # Get the most recent resume for this user
+            upload_dir = Path("uploads")
+            if not upload_dir.exists():
+                raise HTTPException(status_code=404, detail="No resumes found")
+            
+            # Get the most recent file (in a real app, you'd filter by user_id)
+            files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx"))
+            if not files:
+                raise HTTPException(status_code=404, detail="No resume files found")
+            
+            latest_file = max(files, key=os.path.getctime)
+            
+            # Parse the resume
+            parsed_resume = resume_parser.parse_resume(latest_file)
+            user_skill_profiles[user_id] = {
+                "skills": parsed_resume.get("skills", {}).get("all_skills", []),
+                "based_on_resume": latest_file.name
+            }
+            
+            # Get career matches based on parsed resume, bounded by the endpoint's latency budget.
+            # If GPT-4 misses the deadline the local matches are served and upgraded when GPT-4 finishes.
+            matches, match_source = await run_with_deadline(
+                lambda: gpt4_career_matcher.get_gpt_career_matches(parsed_resume),
+                lambda: gpt4_career_matcher.get_local_matches(parsed_resume),
+                get_latency_budget("career_matches"),
+                on_late_result=lambda late_matches: _upgrade_career_matches(user_id, latest_file.name, late_matches)
+            )
+            
+            # Create response data
+            response_data = {
+                "user_id": user_id,
+                "matches": matches,
+                "match_source": match_source,
+                "timestamp": datetime.now().isoformat(),
+                "total_matches": len(matches),
+                "based_on_resume": latest_file.name,
+                "user_profile": {
+                    "name": parsed_resume.get("name", "Unknown"),
+                    "experience_years": parsed_resume.get("experience_years", "Not specified"),
+                    "total_skills": len(parsed_resume.get("skills", {}).get("all_skills", [])),
+                    "top_skills": parsed_resume.get("skills", {}).get("all_skills", [])[:8]
+                }
+            }
+            
+            # Save to Azure storage
+            azure_storage.save_career_matches(user_id, response_data)
+            print(f"Saved career matches to Azure for {user_id}")
+            
+            # Also cache in memory as backup
+            career_matches_cache[user_id] = response_data
+            incremental_matcher.discard(user_id)
+            print(f"Cached career matches for {user_id}")
+            
+            # The user opens one of these next; start on their learning paths in the background
+            speculative_precompute.speculate(matches, user_skill_profiles[user_id]["skills"])
+            
+            return response_data
         
-        # Get career matches based on parsed resume
-        matches = gpt4_career_matcher.get_career_matches(parsed_resume)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating career matches: {str(e)}")
+
+def _upgrade_career_matches(user_id: str, resume_name: str, matches: List[Dict]):
+    """Replace deadline-fallback matches with late GPT-4 matches, unless a newer resume has been analyzed"""
+    cached_data = career_matches_cache.get(user_id)
+    if not cached_data or cached_data.get("based_on_resume") != resume_name:
+        print(f"Discarding late GPT-4 matches for {user_id}: resume changed")
+        return
+    
+    upgraded_data = {
+        **cached_data,
+        "matches": matches,
+        "match_source": "llm_upgrade",
+        "total_matches": len(matches),
+        "timestamp": datetime.now().isoformat()
+    }
+    career_matches_cache[user_id] = upgraded_data
+    incremental_matcher.discard(user_id)
+    speculative_precompute.speculate(matches, user_skill_profiles.get(user_id, {}).get("skills", []))
+    asyncio.get_event_loop().run_in_executor(None, azure_storage.save_career_matches, user_id, upgraded_data)
+    print(f"Upgraded career matches for {user_id} with late GPT-4 result")
+
+def _get_user_skill_profile(user_id: str) -> Dict:
+    """Parsed skills for a user, parsing their latest resume if they haven't been matched yet"""
+    if user_id in user_skill_profiles:
+        return user_skill_profiles[user_id]
+    
+    upload_dir = Path("uploads")
+    files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx")) if upload_dir.exists() else []
+    if not files:
+        raise HTTPException(status_code=404, detail="No resume files found")
+    
+    latest_file = max(files, key=os.path.getctime)
+    parsed_resume = resume_parser.parse_resume(latest_file)
+    user_skill_profiles[user_id] = {
+        "skills": parsed_resume.get("skills", {}).get("all_skills", []),
+        "based_on_resume": latest_file.name
+    }
+    return user_skill_profiles[user_id]
+
+@app.post("/career-matches/{user_id}/what-if")
+async def simulate_career_matches(user_id: str, request: WhatIfRequest):
+    """Simulate how learning candidate skills would change the user's career scores (local, no GPT-4 call)"""
+    if not request.skills:
+        raise HTTPException(status_code=400, detail="Provide at least one skill to simulate")
+    
+    try:
+        profile_data = _get_user_skill_profile(user_id)
+        
+        # Measure gains on the careers the user was actually matched with, when we know them
+        career_ids = career_registry.resolve_all(request.career_ids) if request.career_ids else None
+        if not career_ids and user_id in career_matches_cache:
+            career_ids = [match.get("career_id") for match in career_matches_cache[user_id].get("matches", [])]
+        
+        start_time = time.perf_counter()
+        simulation = skill_gap_index.what_if(
+            skill_ontology.encode(profile_data["skills"]),
+            request.skills,
+            career_ids=career_ids,
+            top_k=request.top_k or 5
+        )
         
-        # Create response data
-        response_data = {
+        return {
             "user_id": user_id,
-            "matches": matches,
-            "timestamp": datetime.now().isoformat(),
-            "total_matches": len(matches),
-            "based_on_resume": latest_file.name,
-            "user_profile": {
-                "name": parsed_resume.get("name", "Unknown"),
-                "experience_years": parsed_resume.get("experience_years", "Not specified"),
-                "total_skills": len(parsed_resume.get("skills", {}).get("all_skills", [])),
-                "top_skills": parsed_resume.get("skills", {}).get("all_skills", [])[:8]
-            }
+            "based_on_resume": profile_data["based_on_resume"],
+            **simulation,
+            "score": "importance-weighted skill coverage (0-1)",
+            "processing_time_ms": round((time.perf_counter() - start_time) * 1000, 3),
+            "timestamp": datetime.now().isoformat()
         }
-        
-        # Save to Azure storage
-        azure_storage.save_career_matches(user_id, response_data)
-        print(f"Saved career matches to Azure for {user_id}")
-        
-        # Also cache in memory as backup
-        career_matches_cache[user_id] = response_data
-        print(f"Cached career matches for {user_id}")
-        
-        return response_data
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating career matches: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error simulating career matches: {str(e)}")
+
+@app.patch("/career-matches/{user_id}/skills")
+async def edit_profile_skills(user_id: str, request: ProfileEditRequest):
+    """Add or remove skills and re-rank the user's career matches incrementally"""
+    if not request.add_skills and not request.remove_skills:
+        raise HTTPException(status_code=400, detail="Provide skills to add or remove")
+    
+    try:
+        # Serialized per user: the state is read before the narrative await and written after it
+        async with incremental_matcher.user_lock(user_id):
+            base_data = career_matches_cache.get(user_id) or await azure_storage.get_career_matches_async(user_id)
+            if not base_data:
+                raise HTTPException(status_code=404, detail=f"No career matches for {user_id} yet - call /career-matches/{user_id} first")
+            
+            profile_data = _get_user_skill_profile(user_id)
+            start_time = time.perf_counter()
+            
+            # Only occupations that use the edited skills are re-scored
+            state = incremental_matcher.get_or_create(user_id, profile_data["skills"], base_data.get("matches", []))
+            edit = state.apply(request.add_skills, request.remove_skills)
+            
+            # GPT-4 narrative only for careers that just entered the top matches
+            new_rows = state.needs_narrative()
+            if new_rows:
+                careers = [{"career_id": skill_gap_index.career_ids[row], "title": skill_gap_index.titles[row]} for row in new_rows]
+                narratives = await asyncio.get_event_loop().run_in_executor(
+                    None, gpt4_career_matcher.get_career_narratives, state.skills, careers
+                )
+                experience_alignment = next((m.get("experience_alignment") for m in base_data.get("matches", []) if "experience_alignment" in m), 0.0)
+                state.add_narratives({
+                    row: {**career, **narratives[career["career_id"]], "experience_alignment": experience_alignment}
+                    for row, career in zip(new_rows, careers)
+                })
+            
+            matches = state.matches()
+            skills = state.skills
+            user_skill_profiles[user_id] = {**profile_data, "skills": skills}
+            
+            response_data = {
+                **base_data,
+                "matches": matches,
+                "match_source": "incremental",
+                "total_matches": len(matches),
+                "timestamp": datetime.now().isoformat(),
+                "user_profile": {
+                    **base_data.get("user_profile", {}),
+                    "total_skills": len(skills),
+                    "top_skills": skills[:8]
+                }
+            }
+            
+            # Update the cached matches in place instead of clearing them
+            career_matches_cache[user_id] = response_data
+            asyncio.get_event_loop().run_in_executor(None, azure_storage.save_career_matches, user_id, response_data)
+            
+            return {
+                **response_data,
+                "profile_edit": {
+                    "added": edit["added"],
+                    "removed": edit["removed"],
+                    "unknown_skills": edit["unknown_skills"],
+                    "occupations_rescored": edit["occupations_rescored"],
+                    "entered_top_matches": [skill_gap_index.career_ids[row] for row in edit["entered"]],
+                    "left_top_matches": [skill_gap_index.career_ids[row] for row in edit["left"]],
+                    "narratives_generated": len(new_rows),
+                    "processing_time_ms": round((time.perf_counter() - start_time) * 1000, 3)
+                }
+            }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating career matches: {str(e)}")
+
+def _latest_resume(not_found_detail: str = "No resume files found") -> Path:
+    """Most recently uploaded resume file"""
+    upload_dir = Path("uploads")
+    files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx")) if upload_dir.exists() else []
+    if not files:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    return max(files, key=os.path.getctime)
+
+async def _current_resume_matches(budget_s: Optional[float] = None, not_found_detail: str = "No resume files found") -> Dict:
+    """
+    Career matches, skills and profile of the most recent resume
+    
+    Served from career_matches_cache / user_skill_profiles when the resume has already been matched, so the
+    event loop never blocks on a resume parse or a GPT-4 round trip. Otherwise the resume is parsed and matched
+    in a worker thread, bounded by the matching latency budget (or budget_s, if smaller).
+    """
+    latest_file = _latest_resume(not_found_detail)
+    
+    cached = [data for data in career_matches_cache.values() if data.get("based_on_resume") == latest_file.name]
+    profile = next((data for data in user_skill_profiles.values() if data.get("based_on_resume") == latest_file.name), None)
+    if cached and profile:
+        cached_data = max(cached, key=lambda data: data.get("timestamp", ""))
+        return {
+            "matches": cached_data.get("matches", []),
+            "user_skills": profile["skills"],
+            "name": cached_data.get("user_profile", {}).get("name", "Unknown"),
+            "experience_years": cached_data.get("user_profile", {}).get("experience_years", "Not specified")
+        }
+    
+    loop = asyncio.get_event_loop()
+    parsed_resume = await loop.run_in_executor(None, resume_parser.parse_resume, latest_file)
+    match_budget = get_latency_budget("career_matches")
+    if budget_s is not None:
+        match_budget = budget_s if match_budget is None else min(match_budget, budget_s)
+    matches, _ = await run_with_deadline(
+        lambda: gpt4_career_matcher.get_gpt_career_matches(parsed_resume),
+        lambda: gpt4_career_matcher.get_local_matches(parsed_resume),
+        match_budget
+    )
+    return {
+        "matches": matches,
+        "user_skills": parsed_resume.get("skills", {}).get("all_skills", []),
+        "name": parsed_resume.get("name", "Unknown"),
+        "experience_years": parsed_resume.get("experience_years", "Not specified")
+    }
+
+def _find_match(matches: List[Dict], career_id: str) -> Optional[Dict]:
+    """Match for a canonical career ID, or None"""
+    for match in matches:
+        if career_registry.resolve(match.get("career_id", "")) == career_id:
+            return match
+    return None
+
+async def _career_path_context(career_id: str, budget_s: Optional[float] = None) -> Dict:
+    """Profile and target match behind a career's learning path (from the most recent resume)"""
+    resume_matches = await _current_resume_matches(budget_s)
+    target_match = _find_match(resume_matches["matches"], career_id)
+    
+    # If not found in matches, create a generic match
+    if not target_match:
+        target_match = {
+            "career_id": career_id,
+            "title": career_id.replace("_", " ").title(),
+            "missing_skills": ["Industry Knowledge", "Technical Skills", "Professional Development"],
+            "experience_level": "Entry"
+        }
+    
+    user_skills = resume_matches["user_skills"]
+    return {
+        "current_match": target_match,
+        "user_skills": user_skills,
+        "missing_skills": target_match.get("missing_skills", []),
+        "experience_level": target_match.get("experience_level", "Entry"),
+        "user_profile": {
+            "name": resume_matches["name"],
+            "current_skills": user_skills[:10],  # Top 10 skills
+            "experience_level": resume_matches["experience_years"]
+        }
+    }
 
 @app.get("/career-path/{career_id}")
 async def get_career_path_optimization(career_id: str):
     """Get detailed learning path for a specific career based on user's current skills"""
+    career_id = await career_registry.resolve_async(career_id)
     
     try:
-        # First check Azure storage for existing career path
-        azure_path = azure_storage.get_career_path(career_id)
-        if azure_path:
-            print(f"Returning Azure-stored career path for {career_id}")
-            return azure_path
-        
-        # Get the most recent resume for skill analysis
-        upload_dir = Path("uploads")
-        if not upload_dir.exists():
-            raise HTTPException(status_code=404, detail="No resumes found")
-        
-        files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx"))
-        if not files:
-            raise HTTPException(status_code=404, detail="No resume files found")
-        
-        latest_file = max(files, key=os.path.getctime)
-        parsed_resume = resume_parser.parse_resume(latest_file)
-        
-        # Get career matches to find the specific career details
-        matches = gpt4_career_matcher.get_career_matches(parsed_resume)
-        target_match = None
-        
-        for match in matches:
-            if match["career_id"] == career_id:
-                target_match = match
-                break
-        
-        # If not found in matches, create a generic match
-        if not target_match:
-            target_match = {
-                "career_id": career_id,
-                "title": career_id.replace("_", " ").title(),
-                "missing_skills": ["Industry Knowledge", "Technical Skills", "Professional Development"],
-                "experience_level": "Entry"
-            }
-        
-        # Generate learning path
-        user_skills = parsed_resume.get("skills", {}).get("all_skills", [])
-        missing_skills = target_match.get("missing_skills", [])
-        experience_level = target_match.get("experience_level", "Entry")
-        
-        learning_path = career_path_optimizer.get_learning_path(
-            career_id, user_skills, missing_skills, experience_level
-        )
+        # One budget for the whole request; every step below only gets what is left of it
+        deadline = Deadline(get_latency_budget("career_path"))
+        context = await _career_path_context(career_id, deadline.remaining())
+        user_skills = context["user_skills"]
+        missing_skills = context["missing_skills"]
+        experience_level = context["experience_level"]
+        learning_path_warmup.record_request(career_id, user_skills, missing_skills, experience_level)
+        
+        # Paths are cached per profile (skills, gaps, level), never per career alone; the key is derived from
+        # the stored match exactly as speculation derives it
+        loop = asyncio.get_event_loop()
+        path_key = learning_path_cache.key_for_match({**context["current_match"], "career_id": career_id}, user_skills, LEARNING_PATH_PROMPT_VERSION)
+        cached_path = await loop.run_in_executor(None, learning_path_cache.get, path_key)
+        if not cached_path:
+            # A speculative job already generating this path is joined rather than repeated
+            cached_path = await speculative_precompute.join(path_key, deadline.remaining())
+        speculative_precompute.record_path_request(path_key, cached_path is not None)
+        
+        if cached_path:
+            learning_path = cached_path["learning_path"]
+            path_source = f"cache_{cached_path['match']}"
+            print(f"Serving cached learning path for {career_id} ({cached_path['match']}, similarity {cached_path['similarity']})")
+        else:
+            learning_path, path_source = await run_with_deadline(
+                lambda: career_path_optimizer.get_gpt_learning_path(career_id, user_skills, missing_skills, experience_level),
+                lambda: career_path_optimizer.get_local_learning_path(career_id, user_skills, missing_skills, experience_level),
+                deadline.remaining(),
+                on_late_result=lambda late_path: _upgrade_career_path(career_id, late_path, path_key)
+            )
+            # Local fallbacks aren't cached, so the next view gets another chance at the GPT path
+            if path_source == "llm":
+                loop.run_in_executor(None, learning_path_cache.put, path_key, learning_path, "llm")
         
         response_data = {
             "career_id": career_id,
-            "current_match": target_match,
+            "current_match": context["current_match"],
             "learning_path": learning_path,
-            "user_profile": {
-                "name": parsed_resume.get("name", "Unknown"),
-                "current_skills": user_skills[:10],  # Top 10 skills
-                "experience_level": parsed_resume.get("experience_years", "Not specified")
-            },
+            "path_source": path_source,
+            "user_profile": context["user_profile"],
             "timestamp": datetime.now().isoformat()
         }
         
-        # Save to Azure storage
+        # Latest path per career, listed by /stored-career-paths (never served back by this endpoint)
         azure_storage.save_career_path(career_id, response_data)
         print(f"Saved career path to Azure for {career_id}")
         
@@ -475,6 +777,108 @@ async def get_career_path_optimization(career_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating learning path: {str(e)}")
 
+def _sse(event: str, data: Dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.get("/career-path/{career_id}/stream")
+async def stream_career_path_optimization(career_id: str):
+    """
+    Stream a learning path as server-sent events
+    
+    Events: "start" (career and profile), one "section" per assessment, market insights and roadmap phase
+    as soon as the model has finished writing it (re-sent with "revised": true if validating the whole document
+    changed it), then "complete" with the full validated response, exactly as persisted.
+    Generation keeps running and is persisted even if the client disconnects.
+    """
+    career_id = await career_registry.resolve_async(career_id)
+    try:
+        context = await _career_path_context(career_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating learning path: {str(e)}")
+    
+    user_skills = context["user_skills"]
+    missing_skills = context["missing_skills"]
+    experience_level = context["experience_level"]
+    learning_path_warmup.record_request(career_id, user_skills, missing_skills, experience_level)
+    loop = asyncio.get_event_loop()
+    path_key = learning_path_cache.key_for_match({**context["current_match"], "career_id": career_id}, user_skills, LEARNING_PATH_STREAM_VERSION)
+    cached_path = await loop.run_in_executor(None, learning_path_cache.get, path_key)
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def produce():
+        """Run the blocking model stream in a worker thread, handing events to the response"""
+        emit = lambda event, data: loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+        try:
+            if cached_path:
+                events = [("section", {"section": section[-1], "data": value})
+                          for section, value in _path_sections(cached_path["learning_path"])]
+                events.append(("complete", {"learning_path": cached_path["learning_path"], "path_source": f"cache_{cached_path['match']}"}))
+            else:
+                events = career_path_optimizer.stream_learning_path(career_id, user_skills, missing_skills, experience_level)
+            
+            for event, data in events:
+                if event == "complete":
+                    response_data = {
+                        "career_id": career_id,
+                        "current_match": context["current_match"],
+                        "learning_path": data["learning_path"],
+                        "path_source": data["path_source"],
+                        "user_profile": context["user_profile"],
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    emit("complete", response_data)
+                    if data["path_source"] == "llm":
+                        learning_path_cache.put(path_key, data["learning_path"], "llm")
+                    azure_storage.save_career_path(career_id, response_data)
+                else:
+                    emit(event, data)
+        except Exception as e:
+            print(f"Error streaming learning path for {career_id}: {e}")
+            emit("error", {"detail": f"Error generating learning path: {str(e)}"})
+        finally:
+            learning_path_warmup.request_finished()
+            emit(None, None)
+    
+    async def events():
+        yield _sse("start", {"career_id": career_id, "current_match": context["current_match"], "user_profile": context["user_profile"]})
+        # The middleware lets go once the headers are sent; the generation stays in flight until it ends
+        learning_path_warmup.request_started()
+        loop.run_in_executor(None, produce)
+        while True:
+            event, data = await queue.get()
+            if event is None:
+                break
+            yield _sse(event, data)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def _path_sections(learning_path: Dict):
+    """(section path, value) pairs of a finished learning path, in streaming order"""
+    for section in STREAM_SECTIONS:
+        value = learning_path.get("learning_roadmap", {}).get(section[-1]) if len(section) > 1 else learning_path.get(section[0])
+        if value is not None:
+            yield section, value
+
+def _upgrade_career_path(career_id: str, learning_path: Dict, path_key: LearningPathKey):
+    """Cache the late GPT result and replace a deadline-fallback learning path with it"""
+    def upgrade():
+        learning_path_cache.put(path_key, learning_path, "llm_upgrade")
+        stored_path = azure_storage.get_career_path(career_id)
+        if not stored_path or stored_path.get("path_source") != "deadline_fallback":
+            return
+        stored_path.update({
+            "learning_path": learning_path,
+            "path_source": "llm_upgrade",
+            "timestamp": datetime.now().isoformat()
+        })
+        azure_storage.save_career_path(career_id, stored_path)
+        print(f"Upgraded career path for {career_id} with late GPT result")
+    
+    asyncio.get_event_loop().run_in_executor(None, upgrade)
+
 @app.get("/stored-career-paths")
 async def get_stored_career_paths():
     """Get all career paths stored in Azure Blob Storage"""
@@ -510,6 +914,7 @@ async def get_stored_career_paths():
 @app.delete("/stored-career-paths/{career_id}")
 async def delete_stored_career_path(career_id: str):
     """Delete a specific career path from Azure Blob Storage"""
+    career_id = await career_registry.resolve_async(career_id)
     try:
         success = azure_storage.delete_career_path(career_id)
         
@@ -589,6 +994,7 @@ async def get_personas():
 @app.get("/personas/{persona_id}")
 async def get_persona_info(persona_id: str):
     """Get detailed information about a specific persona"""
+    persona_id = await career_registry.resolve_async(persona_id)
     try:
         # First check Azure storage
         stored_persona = azure_storage.get_persona(persona_id)
@@ -625,6 +1031,10 @@ async def create_persona(persona_data: dict):
         if not persona_id:
             raise HTTPException(status_code=400, detail="Persona ID is required")
         
+        # Stored under the canonical career ID, where GET/DELETE /personas/{id} look it up
+        persona_id = await career_registry.resolve_async(persona_id)
+        persona_data = {**persona_data, **{key: persona_id for key in ("id", "persona_id") if key in persona_data}}
+        
         # Save to Azure storage
         success = azure_storage.save_persona(persona_id, persona_data)
         if success:
@@ -645,6 +1055,7 @@ async def create_persona(persona_data: dict):
 @app.delete("/personas/{persona_id}")
 async def delete_persona(persona_id: str):
     """Delete a persona from Azure storage"""
+    persona_id = await career_registry.resolve_async(persona_id)
     try:
         success = azure_storage.delete_persona(persona_id)
         if success:
@@ -687,27 +1098,15 @@ async def delete_all_personas():
 @app.post("/personas/create-future-self/{career_id}")
 async def create_future_self_persona(career_id: str):
     """Create a future self persona for a specific career"""
+    career_id = await career_registry.resolve_async(career_id)
     try:
-        # Get the most recent resume for context
-        upload_dir = Path("uploads")
-        if not upload_dir.exists():
-            raise HTTPException(status_code=404, detail="No resume found. Upload a resume first.")
-        
-        files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx"))
-        if not files:
-            raise HTTPException(status_code=404, detail="No resume found. Upload a resume first.")
-        
-        latest_file = max(files, key=os.path.getctime)
-        parsed_resume = resume_parser.parse_resume(latest_file)
-        
-        # Get career matches to find the specific career
-        matches = gpt4_career_matcher.get_career_matches(parsed_resume)
-        target_match = None
+        # Matches stored for the current resume already hold the career's context
+        target_match = speculative_precompute.persona_context(career_id)
         
-        for match in matches:
-            if match.get("career_id") == career_id:
-                target_match = match
-                break
+        if not target_match:
+            # Otherwise find the career among the most recent resume's matches
+            resume_matches = await _current_resume_matches(not_found_detail="No resume found. Upload a resume first.")
+            target_match = _find_match(resume_matches["matches"], career_id)
         
         if not target_match:
             # Create a generic match for the career
@@ -747,31 +1146,26 @@ async def chat_with_persona(chat_request: ChatMessage):
     if persona_chat is None:
         raise HTTPException(status_code=503, detail="Chat service not initialized")
     
+    chat_request.persona_id = await career_registry.resolve_async(chat_request.persona_id)
+    
     try:
         # Always treat as dynamic persona request - get career info
-        career_info = None
+        career_info = speculative_precompute.persona_context(chat_request.persona_id)
         try:
-            upload_dir = Path("uploads")
-            if upload_dir.exists():
-                files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx"))
-                if files:
-                    latest_file = max(files, key=os.path.getctime)
-                    parsed_resume = resume_parser.parse_resume(latest_file)
-                    matches = gpt4_career_matcher.get_career_matches(parsed_resume)
-                    
-                    # Find the specific career match
-                    for match in matches:
-                        if match.get("career_id") == chat_request.persona_id:
-                            career_info = match
-                            break
-                    
-                    # If no exact match, create a generic career info
-                    if not career_info:
-                        career_info = {
-                            "career_id": chat_request.persona_id,
-                            "title": chat_request.persona_id.replace("_", " ").title(),
-                            "description": f"Professional in {chat_request.persona_id.replace('_', ' ')}"
-                        }
+            if not career_info:
+                resume_matches = await _current_resume_matches()
+                career_info = _find_match(resume_matches["matches"], chat_request.persona_id)
+                
+                # If no exact match, create a generic career info
+                if not career_info:
+                    career_info = {
+                        "career_id": chat_request.persona_id,
+                        "title": chat_request.persona_id.replace("_", " ").title(),
+                        "description": f"Professional in {chat_request.persona_id.replace('_', ' ')}"
+                    }
+        except HTTPException:
+            # No resume uploaded yet; chat without career context
+            pass
         except Exception as e:
             print(f"Warning: Could not load career info for dynamic persona: {e}")
             # Create generic career info as fallback
@@ -804,23 +1198,16 @@ async def chat_with_persona(chat_request: ChatMessage):
 @app.post("/chat-quick")
 async def quick_chat(persona_id: str, message: str):
     """Quick chat endpoint for simple interactions"""
+    persona_id = await career_registry.resolve_async(persona_id)
     try:
         # Always treat as dynamic persona request
         career_info = None
         try:
-            upload_dir = Path("uploads")
-            if upload_dir.exists():
-                files = list(upload_dir.glob("*.pdf")) + list(upload_dir.glob("*.docx"))
-                if files:
-                    latest_file = max(files, key=os.path.getctime)
-                    parsed_resume = resume_parser.parse_resume(latest_file)
-                    matches = gpt4_career_matcher.get_career_matches(parsed_resume)
-                    
-                    # Find the specific career match
-                    for match in matches:
-                        if match.get("career_id") == persona_id:
-                            career_info = match
-                            break
+            resume_matches = await _current_resume_matches()
+            career_info = _find_match(resume_matches["matches"], persona_id)
+        except HTTPException:
+            # No resume uploaded yet; chat without career context
+            pass
         except Exception as e:
             print(f"Warning: Could not load career info for dynamic persona: {e}")
             # Create generic career info as fallback
@@ -850,6 +1237,7 @@ async def quick_chat(persona_id: str, message: str):
 @app.post("/voice-chat/openai-chat/{persona_id}")
 async def openai_voice_chat(persona_id: str, request: dict):
     """Handle OpenAI voice chat conversation with personalized user data"""
+    persona_id = await career_registry.resolve_async(persona_id)
     try:
         message = request.get("message", "")
         conversation_history = request.get("conversation_history", [])
@@ -924,12 +1312,10 @@ Remember: You ARE them from the future. You're not giving advice to someone else
         messages.append({"role": "user", "content": message})
         
         # Get response from OpenAI
-        import openai
-        openai.api_key = OPENAI_API_KEY
-        
-        response = openai.ChatCompletion.create(
+        response = chat_completion(
             model="gpt-4o",
             messages=messages,
+            template="voice_chat",
             max_tokens=300,
             temperature=0.7
         )
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stand-in server
+Serves canned but schema-correct ChatCompletion responses (streaming and non-streaming) with configurable
+latency and error rates, so the backend can be load- and latency-tested without network or spend.
+
+Usage:
+    python mock_openai_server.py --port 8100 --latency lognormal:0.0,0.5 --error-rate 0.02
+    OPENAI_API_BASE=http://127.0.0.1:8100/v1 python run_stable.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+from typing import Dict, List, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+from prompt_templates import count_message_tokens, count_tokens
+
+CAREER_SUGGESTIONS = {
+    "career_suggestions": [
+        {
+            "title": "Software Developer",
+            "career_id": "software_developer",
+            "match_percentage": 82,
+            "description": "Design, build and maintain software applications",
+            "why_good_fit": "Your programming experience maps directly onto day-to-day development work",
+            "matched_skills": ["Python", "Git", "Sql"],
+            "missing_skills": ["System Design", "Docker", "Testing"],
+            "salary_range": "$70,000 - $120,000",
+            "growth_outlook": "Much faster than average (+22%)",
+            "next_steps": ["Build two portfolio projects", "Practice data structures", "Contribute to open source"]
+        },
+        {
+            "title": "Data Analyst",
+            "career_id": "data_analyst",
+            "match_percentage": 76,
+            "description": "Turn data into insights that drive business decisions",
+            "why_good_fit": "Your SQL and Python skills cover most of the analyst toolkit",
+            "matched_skills": ["Sql", "Python"],
+            "missing_skills": ["Tableau", "Statistics", "Excel"],
+            "salary_range": "$55,000 - $90,000",
+            "growth_outlook": "Faster than average (+23%)",
+            "next_steps": ["Learn a BI tool", "Publish an analysis notebook"]
+        },
+        {
+            "title": "DevOps Engineer",
+            "career_id": "devops_engineer",
+            "match_percentage": 68,
+            "description": "Automate build, deployment and infrastructure",
+            "why_good_fit": "Your scripting background is a strong base for automation work",
+            "matched_skills": ["Bash", "Git"],
+            "missing_skills": ["Kubernetes", "Terraform", "Ci/Cd"],
+            "salary_range": "$85,000 - $140,000",
+            "growth_outlook": "Strong growth (+25%)",
+            "next_steps": ["Containerize a project", "Set up a CI pipeline"]
+        },
+        {
+            "title": "Data Scientist",
+            "career_id": "data_scientist",
+            "match_percentage": 64,
+            "description": "Build statistical and machine learning models",
+            "why_good_fit": "Python and analytical thinking give you a head start",
+            "matched_skills": ["Python", "Pandas"],
+            "missing_skills": ["Machine Learning", "Statistics", "Deep Learning"],
+            "salary_range": "$90,000 - $150,000",
+            "growth_outlook": "Much faster than average (+35%)",
+            "next_steps": ["Take an ML course", "Enter a Kaggle competition"]
+        },
+        {
+            "title": "Product Manager",
+            "career_id": "product_manager",
+            "match_percentage": 58,
+            "description": "Own product direction and coordinate delivery",
+            "why_good_fit": "Technical depth helps you work closely with engineering teams",
+            "matched_skills": ["Communication", "Agile"],
+            "missing_skills": ["Product Strategy", "User Research", "Roadmapping"],
+            "salary_range": "$95,000 - $150,000",
+            "growth_outlook": "Steady growth (+18%)",
+            "next_steps": ["Shadow a product team", "Write a product spec"]
+        }
+    ]
+}
+
+def _roadmap_step(skill: str, priority: str, timeline: str) -> Dict:
+    return {
+        "skill": skill,
+        "priority": priority,
+        "courses": [
+            {"name": f"{skill} Fundamentals", "provider": "Coursera", "duration": "4 weeks", "cost": "Free", "url": "https://www.coursera.org"},
+            {"name": f"Practical {skill}", "provider": "Udemy", "duration": "10 hours", "cost": "$19.99", "url": "https://www.udemy.com"}
+        ],
+        "projects": [f"Build a small project using {skill}", f"Write up what you learned about {skill}"],
+        "timeline": timeline
+    }
+
+# "- s1 Docker (Weeks 1-4): c041 Docker Deep Dive (...); c024 ..." lines of a compact prompt
+_COMPACT_SKILL = re.compile(r"^- (s\d+) (.+?)(?: \((Weeks [\d-]+)\))?: (.*)$")
+
+def _compact_skills(prompt_text: str) -> List[Dict]:
+    """Skill IDs, names, weeks and catalog course IDs listed in a compact prompt"""
+    skills = []
+    for line in prompt_text.splitlines():
+        match = _COMPACT_SKILL.match(line.strip())
+        if match:
+            skills.append({"id": match.group(1), "skill": match.group(2), "weeks": match.group(3), "course_ids": re.findall(r"\bc\d{3}\b", match.group(4))})
+    return skills
+
+def _compact_step(entry: Dict, priority: str, timeline: str) -> Dict:
+    return {
+        "skill_id": entry["id"],
+        "priority": priority,
+        "course_ids": entry["course_ids"][:2],
+        "projects": [f"Build a small project using {entry['skill']}", f"Write up what you learned about {entry['skill']}"],
+        "timeline": entry["weeks"] or timeline
+    }
+
+def _learning_path(career_title: str) -> Dict:
+    return {
+        "career_title": career_title,
+        "personalized_assessment": {
+            "foundation_gaps": ["Docker", "Testing"],
+            "advanced_opportunities": ["System Design", "Cloud Architecture"],
+            "estimated_timeline": "6-9 months to job-ready",
+            "estimated_cost": "$300 (plus 6 free resources)"
+        },
+        "market_insights": {
+            "growth_rate": "+20%",
+            "avg_salary": "$100K",
+            "top_companies": ["Google", "Microsoft", "Amazon", "Shopify", "Stripe"],
+            "key_skills": ["Python", "SQL", "Docker", "Git", "Communication"]
+        },
+        "learning_roadmap": {
+            "immediate_steps": [_roadmap_step("Docker", "High", "0-3 months"), _roadmap_step("Testing", "Medium", "0-3 months")],
+            "short_term_goals": [_roadmap_step("System Design", "Medium", "3-6 months")],
+            "long_term_goals": [_roadmap_step("Cloud Architecture", "Low", "6+ months")]
+        },
+        "timeline_overview": {
+            "0-3 months": ["Foundation skills", "Basic projects", "Portfolio building"],
+            "3-6 months": ["Intermediate skills", "Advanced projects", "Networking"],
+            "6-12 months": ["Expert skills", "Professional projects", "Job applications"]
+        },
+        "success_metrics": ["Complete 2-3 portfolio projects", "Earn 1-2 relevant certifications"],
+        "next_actions": ["Start with Docker", "Set up learning schedule (10-15 hours/week)"]
+    }
+
+def _career_narratives(prompt_text: str) -> Dict:
+    narratives = []
+    for line in prompt_text.split("Careers:", 1)[-1].splitlines():
+        career_id, _, title = line.strip().lstrip("- ").partition(":")
+        if not title:
+            continue
+        narratives.append({
+            "career_id": career_id.strip(),
+            "description": f"Work as a {title.strip()}",
+            "why_good_fit": f"Your new skills line up with the core of the {title.strip()} role",
+            "salary_range": "$65,000 - $105,000",
+            "growth_outlook": "Faster than average (+15%)",
+            "next_steps": ["Close the top missing skill", "Ship a small project for this role"]
+        })
+    return {"career_narratives": narratives}
+
+def _learning_fragments(prompt_text: str) -> Dict:
+    compact = _compact_skills(prompt_text)
+    if compact:
+        return {"learning_fragments": [
+            {"skill_id": entry["id"], "course_ids": entry["course_ids"][:2], "projects": _compact_step(entry, "High", "")["projects"], "estimated_weeks": 4}
+            for entry in compact
+        ]}
+    skills = [line.strip()[2:] for line in prompt_text.split("Skills:", 1)[-1].splitlines() if line.strip().startswith("- ")]
+    fragments = []
+    for skill in skills:
+        step = _roadmap_step(skill, "High", "0-3 months")
+        fragments.append({"skill": skill, "courses": step["courses"], "projects": step["projects"], "estimated_weeks": 4})
+    return {"learning_fragments": fragments}
+
+def _path_personalization(prompt_text: str) -> Dict:
+    skills = []
+    for line in prompt_text.splitlines():
+        if line.startswith("Roadmap skills:"):
+            skills = [skill.strip() for skill in line.split(":", 1)[1].split(",") if skill.strip() and skill.strip() != "None"]
+    return {"path_personalization": {
+        "personalized_assessment": {
+            "foundation_gaps": skills[:3],
+            "advanced_opportunities": skills[3:],
+            "estimated_timeline": "6-9 months to job-ready",
+            "estimated_cost": "$300 (plus 6 free resources)"
+        },
+        "priorities": {skill: "High" if i < 2 else "Medium" for i, skill in enumerate(skills)},
+        "next_actions": [f"Start with {skills[0]}" if skills else "Start with foundation skills", "Set up learning schedule (10-15 hours/week)"]
+    }}
+
+def _roadmap_phase(prompt_text: str) -> Dict:
+    compact = _compact_skills(prompt_text)
+    if compact:
+        return {"roadmap_phase": [_compact_step(entry, "High" if i == 0 else "Medium", "") for i, entry in enumerate(compact)]}
+    steps = []
+    for line in prompt_text.split("Skills:", 1)[-1].splitlines():
+        if line.strip().startswith("- "):
+            skill, _, weeks = line.strip()[2:].partition(" (")
+            steps.append(_roadmap_step(skill, "High" if not steps else "Medium", weeks.rstrip(")")))
+    return {"roadmap_phase": steps}
+
+PERSONA_REPLY = "hey i totally get that feeling\ntrust me ive been there too\njust focus on one thing at a time and ull be good"
+
+class LatencyModel:
+    def __init__(self, spec: str, rng: random.Random):
+        """
+        Parse a latency spec
+
+        Supported specs: "fixed:SECONDS", "uniform:LOW,HIGH", "lognormal:MU,SIGMA", "none"
+        """
+        self.rng = rng
+        kind, _, params = spec.partition(":")
+        self.kind = kind.strip().lower()
+        self.params = [float(p) for p in params.split(",") if p.strip()]
+
+    def sample(self) -> float:
+        """Sample a response latency in seconds"""
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(self.params[0], self.params[1])
+        if self.kind == "lognormal":
+            return self.rng.lognormvariate(self.params[0], self.params[1])
+        return 0.0
+
+def _completion_content(messages: List[Dict]) -> str:
+    """Pick a canned payload based on what the prompt asks for"""
+    prompt_text = "\n".join(m.get("content", "") for m in messages)
+    if "career_narratives" in prompt_text:
+        return json.dumps(_career_narratives(prompt_text))
+    if "learning_fragments" in prompt_text:
+        return json.dumps(_learning_fragments(prompt_text))
+    if "path_personalization" in prompt_text:
+        return json.dumps(_path_personalization(prompt_text))
+    if "learning_path_overview" in prompt_text:
+        overview = _learning_path("")
+        return json.dumps({"learning_path_overview": {key: overview[key] for key in ("personalized_assessment", "market_insights", "success_metrics", "next_actions")}})
+    if "roadmap_phase" in prompt_text:
+        return json.dumps(_roadmap_phase(prompt_text))
+    if "career_suggestions" in prompt_text:
+        return json.dumps(CAREER_SUGGESTIONS)
+    if "learning_roadmap" in prompt_text:
+        title = "Software Developer"
+        for line in prompt_text.splitlines():
+            if line.strip().startswith("- Target Career:"):
+                title = line.split(":", 1)[1].strip()
+                break
+        learning_path = _learning_path(title)
+        compact = _compact_skills(prompt_text)
+        if compact:
+            # Split the listed skills over the three phases
+            third = max(1, (len(compact) + 2) // 3)
+            learning_path["learning_roadmap"] = {
+                phase: [_compact_step(entry, priority, timeline) for entry in compact[i * third:(i + 1) * third]]
+                for i, (phase, priority, timeline) in enumerate([("immediate_steps", "High", "0-3 months"), ("short_term_goals", "Medium", "3-6 months"), ("long_term_goals", "Low", "6+ months")])
+            }
+        return json.dumps(learning_path)
+    return PERSONA_REPLY
+
+def create_app(latency: str = "none", error_rate: float = 0.0, seed: Optional[int] = None, chunk_chars: int = 40) -> FastAPI:
+    """Create the mock server app"""
+    app = FastAPI(title="Mock OpenAI API")
+    rng = random.Random(seed)
+    latency_model = LatencyModel(latency, rng)
+    stats = {"requests": 0, "errors": 0, "streamed": 0}
+
+    @app.get("/stats")
+    async def get_stats():
+        """Request counters"""
+        return stats
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        """OpenAI-compatible ChatCompletion endpoint"""
+        body = await request.json()
+        stats["requests"] += 1
+        model = body.get("model", "gpt-4")
+        messages = body.get("messages", [])
+
+        await asyncio.sleep(latency_model.sample())
+
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            status = rng.choice([429, 500, 503])
+            return JSONResponse(
+                status_code=status,
+                content={"error": {"message": f"Mock upstream error {status}", "type": "server_error" if status >= 500 else "rate_limit_error", "code": None}}
+            )
+
+        content = _completion_content(messages)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": count_message_tokens(messages),
+            "completion_tokens": count_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage
+            }
+
+        stats["streamed"] += 1
+
+        async def stream():
+            def chunk(delta: Dict, finish_reason: Optional[str] = None) -> str:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                return f"data: {json.dumps(payload)}\n\n"
+
+            yield chunk({"role": "assistant"})
+            for start in range(0, len(content), chunk_chars):
+                yield chunk({"content": content[start:start + chunk_chars]})
+                await asyncio.sleep(0)
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+def main():
+    """Run the mock server"""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("MOCK_OPENAI_PORT", "8100")))
+    parser.add_argument("--latency", default=os.getenv("MOCK_OPENAI_LATENCY", "none"), help='e.g. "fixed:0.8", "uniform:0.2,2.0", "lognormal:0.0,0.6"')
+    parser.add_argument("--error-rate", type=float, default=float(os.getenv("MOCK_OPENAI_ERROR_RATE", "0")))
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible latency and errors")
+    args = parser.parse_args()
+
+    print(f"🧪 Mock OpenAI server on http://{args.host}:{args.port}/v1 (latency={args.latency}, error_rate={args.error_rate})")
+    uvicorn.run(create_app(args.latency, args.error_rate, args.seed), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
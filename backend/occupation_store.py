@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Occupation dataset in a memory-mapped columnar format
+data/occupations.json is the editable source; it is compiled into data/occupation_store/ as .npy files
+(an occupation-by-skill importance matrix plus offset/bytes string columns) that load lazily with
+np.load(mmap_mode="r"), so uvicorn workers share the same read-only pages
+
+Usage:
+    python occupation_store.py          # rebuild the store from data/occupations.json
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from skill_ontology import SkillOntology, skill_ontology
+
+SOURCE_PATH = Path(__file__).parent / "data" / "occupations.json"
+STORE_DIR = Path(__file__).parent / "data" / "occupation_store"
+STORE_FORMAT = 1
+
+# Columns stored as UTF-8 strings; list columns are JSON-encoded per row
+STRING_COLUMNS = ("career_id", "title", "description", "salary_range", "avg_salary", "growth_rate", "growth_outlook")
+LIST_COLUMNS = ("alternate_titles", "top_companies")
+
+def title_key(title: str) -> str:
+    """Normalize a career title or ID for lookup ("Data Analyst" == "data_analyst")"""
+    return re.sub(r"[^a-z0-9]+", "_", title.strip().lower()).strip("_")
+
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+def _ontology_fingerprint(ontology: SkillOntology) -> str:
+    """Changes whenever skill IDs (matrix columns) change"""
+    return _sha1("\n".join(ontology.names).encode("utf-8"))
+
+def _encode_strings(values: List[str]):
+    """Pack strings into (offsets, bytes) arrays"""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+    return offsets, data
+
+def _compile(source_path: Path, ontology: SkillOntology) -> Dict:
+    """Compile the JSON source into column arrays and metadata"""
+    raw = source_path.read_bytes()
+    occupations = json.loads(raw)["occupations"]
+
+    importance = np.zeros((len(occupations), ontology.size), dtype=np.float32)
+    for row, occupation in enumerate(occupations):
+        for skill, weight in occupation.get("skills", {}).items():
+            skill_id = ontology.resolve(skill)
+            if skill_id is None:
+                print(f"⚠️ Unknown skill '{skill}' for occupation {occupation['career_id']}")
+                continue
+            importance[row, skill_id] = weight
+
+    arrays = {"importance": importance}
+    for column in STRING_COLUMNS:
+        arrays[f"{column}.offsets"], arrays[f"{column}.data"] = _encode_strings([str(o.get(column, "")) for o in occupations])
+    for column in LIST_COLUMNS:
+        arrays[f"{column}.offsets"], arrays[f"{column}.data"] = _encode_strings([json.dumps(o.get(column, [])) for o in occupations])
+
+    meta = {
+        "format": STORE_FORMAT,
+        "source_sha1": _sha1(raw),
+        "ontology_sha1": _ontology_fingerprint(ontology),
+        "occupations": len(occupations),
+        "skills": ontology.size,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    return {"arrays": arrays, "meta": meta}
+
+def build_store(source_path: Path = SOURCE_PATH, store_dir: Path = STORE_DIR, ontology: SkillOntology = skill_ontology) -> Dict:
+    """
+    Compile data/occupations.json into the memory-mappable store
+
+    Files are written under temporary names and renamed into place, metadata last, so a concurrent
+    reader never sees a half-written store.
+    """
+    compiled = _compile(source_path, ontology)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    suffix = f".tmp-{os.getpid()}"
+    for name, array in compiled["arrays"].items():
+        tmp_path = store_dir / f"{name}{suffix}.npy"
+        np.save(tmp_path, array)
+        os.replace(tmp_path, store_dir / f"{name}.npy")
+    tmp_meta = store_dir / f"meta.json{suffix}"
+    tmp_meta.write_text(json.dumps(compiled["meta"], indent=2))
+    os.replace(tmp_meta, store_dir / "meta.json")
+    return compiled["meta"]
+
+class StringColumn:
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, is_list: bool = False):
+        """Read-only string column over (offsets, bytes) arrays"""
+        self.offsets = offsets
+        self.data = data
+        self.is_list = is_list
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int):
+        value = bytes(self.data[self.offsets[row]:self.offsets[row + 1]]).decode("utf-8")
+        return json.loads(value) if self.is_list else value
+
+    def to_list(self) -> List:
+        return [self[row] for row in range(len(self))]
+
+class OccupationStore:
+    def __init__(self, source_path: Path = SOURCE_PATH, store_dir: Path = STORE_DIR, ontology: SkillOntology = skill_ontology):
+        """Lazily loaded occupation dataset (nothing is read until first use)"""
+        self.source_path = source_path
+        self.store_dir = store_dir
+        self.ontology = ontology
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._columns: Dict[str, StringColumn] = {}
+        self._rows: Dict[str, int] = {}
+        self.importance: Optional[np.ndarray] = None
+        self.career_ids: List[str] = []
+        self.titles: List[str] = []
+        self.load_ms = 0.0
+        self.memory_mapped = False
+
+    def _is_current(self) -> bool:
+        """Check the store on disk matches the JSON source and the ontology's skill IDs"""
+        try:
+            meta = json.loads((self.store_dir / "meta.json").read_text())
+        except (OSError, ValueError):
+            return False
+        return (
+            meta.get("format") == STORE_FORMAT
+            and meta.get("source_sha1") == _sha1(self.source_path.read_bytes())
+            and meta.get("ontology_sha1") == _ontology_fingerprint(self.ontology)
+        )
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            start_time = time.perf_counter()
+            arrays = None
+            if not self._is_current():
+                try:
+                    print("🔧 Occupation store missing or stale - rebuilding from occupations.json")
+                    build_store(self.source_path, self.store_dir, self.ontology)
+                except OSError as e:
+                    # Read-only deployment: serve the compiled arrays from memory instead
+                    print(f"⚠️ Could not write occupation store ({e}), loading occupations in memory")
+                    arrays = _compile(self.source_path, self.ontology)["arrays"]
+                    self.memory_mapped = False
+
+            if arrays is None:
+                arrays = {path.stem: np.load(path, mmap_mode="r") for path in self.store_dir.glob("*.npy") if ".tmp-" not in path.name}
+                self.memory_mapped = True
+
+            self.importance = np.asarray(arrays["importance"])
+            for column in STRING_COLUMNS + LIST_COLUMNS:
+                self._columns[column] = StringColumn(arrays[f"{column}.offsets"], arrays[f"{column}.data"], is_list=column in LIST_COLUMNS)
+
+            self.career_ids = self._columns["career_id"].to_list()
+            self.titles = self._columns["title"].to_list()
+            for row, career_id in enumerate(self.career_ids):
+                self._rows.setdefault(title_key(career_id), row)
+                self._rows.setdefault(title_key(self.titles[row]), row)
+            # Alternate titles never shadow a primary title or ID
+            for row, alternates in enumerate(self._columns["alternate_titles"].to_list()):
+                for alternate in alternates:
+                    self._rows.setdefault(title_key(alternate), row)
+
+            self.load_ms = (time.perf_counter() - start_time) * 1000
+            self._loaded = True
+
+    @property
+    def size(self) -> int:
+        self._ensure_loaded()
+        return len(self.career_ids)
+
+    def matrix(self) -> np.ndarray:
+        """Occupation-by-skill importance matrix (read-only)"""
+        self._ensure_loaded()
+        return self.importance
+
+    def ids(self) -> List[str]:
+        self._ensure_loaded()
+        return self.career_ids
+
+    def title_list(self) -> List[str]:
+        self._ensure_loaded()
+        return self.titles
+
+    def row(self, career: str) -> Optional[int]:
+        """Row for a career ID, title or alternate title, or None if unknown"""
+        if not career:
+            return None
+        self._ensure_loaded()
+        return self._rows.get(title_key(career))
+
+    def column(self, name: str, row: int):
+        """One cell of a string or list column"""
+        self._ensure_loaded()
+        return self._columns[name][row]
+
+    def key_skills(self, row: int, limit: int = 8) -> List[str]:
+        """An occupation's skills, most important first"""
+        self._ensure_loaded()
+        weights = self.importance[row]
+        skill_ids = np.flatnonzero(weights)
+        ordered = skill_ids[np.argsort(-weights[skill_ids], kind="stable")][:limit]
+        return [self.ontology.names[skill_id] for skill_id in ordered]
+
+    def get(self, career: str) -> Optional[Dict]:
+        """Full record for a career ID, title or alternate title"""
+        row = self.row(career)
+        if row is None:
+            return None
+        record = {column: self._columns[column][row] for column in STRING_COLUMNS + LIST_COLUMNS}
+        weights = self.importance[row]
+        record["skills"] = {self.ontology.names[i]: float(weights[i]) for i in np.flatnonzero(weights)}
+        return record
+
+    def stats(self) -> Dict:
+        """Load time and storage mode"""
+        return {
+            "loaded": self._loaded,
+            "occupations": len(self.career_ids),
+            "load_ms": round(self.load_ms, 2),
+            "memory_mapped": self.memory_mapped
+        }
+
+# Global instance (loaded on first use)
+occupation_store = OccupationStore()
+
+if __name__ == "__main__":
+    meta = build_store()
+    print(f"✅ Built occupation store in {STORE_DIR}: {meta['occupations']} occupations x {meta['skills']} skills")
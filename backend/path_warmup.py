@@ -0,0 +1,267 @@
+"""
+Background warm-up of learning paths for the most requested careers
+Counts learning path requests per canonical career and the profiles (skills, gaps, level) they were made
+for and, while the API is idle, generates and periodically refreshes the path of each top career's most
+common profile under the exact cache key /career-path looks up, so warmed paths are actually served.
+Careers with no observed profile yet (the seed careers after a deploy) are warmed with a base profile
+(entry level, missing the core skills) that no real user's key matches: that only fills the per-skill
+fragment cache, so their first request pays just for the personal layer. Warm-up runs on its own worker
+threads and only while nothing else is working: no interactive request or SSE generation in flight, no late
+GPT upgrade or speculative path pending, and the host's load average under budget
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from career_path_optimizer import career_path_optimizer, LEARNING_PATH_PROMPT_VERSION, ROADMAP_MAX_SKILLS
+from career_registry import career_registry
+from deadline import pending_upgrades
+from learning_path_cache import learning_path_cache
+from occupation_store import occupation_store
+from speculation import speculative_precompute
+
+# Careers warmed before any traffic has been counted (the ones with curated market insights)
+DEFAULT_WARMUP_CAREERS = ["software_developer", "data_scientist", "product_manager", "ux_designer", "devops_engineer"]
+
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "5"))  # 0 disables warm-up
+WARMUP_IDLE_S = float(os.getenv("WARMUP_IDLE_S", "30"))  # quiet time before warm-up starts
+WARMUP_INTERVAL_S = float(os.getenv("WARMUP_INTERVAL_S", "60"))
+WARMUP_REFRESH_S = float(os.getenv("WARMUP_REFRESH_S", str(6 * 3600)))  # regenerate base paths older than this
+# Paths generated at once; each holds one worker thread and its path's LLM calls
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "1"))
+# 1-minute load average per CPU above which warm-up waits (<= 0 disables the check)
+WARMUP_MAX_LOAD = float(os.getenv("WARMUP_MAX_LOAD", "0.5"))
+# Distinct profiles counted per career (the least requested is dropped beyond this)
+WARMUP_PROFILES_PER_CAREER = int(os.getenv("WARMUP_PROFILES_PER_CAREER", "20"))
+
+BASE_EXPERIENCE_LEVEL = "Entry"
+
+class LearningPathWarmup:
+    def __init__(self, optimizer=career_path_optimizer, cache=learning_path_cache, top_n: int = WARMUP_TOP_N,
+                 idle_s: float = WARMUP_IDLE_S, interval_s: float = WARMUP_INTERVAL_S, refresh_s: float = WARMUP_REFRESH_S,
+                 concurrency: int = WARMUP_CONCURRENCY, max_load: float = WARMUP_MAX_LOAD, seed_careers: List[str] = DEFAULT_WARMUP_CAREERS):
+        """
+        Idle-time warm-up scheduler
+
+        Args:
+            optimizer: Learning path generator (get_gpt_learning_path)
+            cache: Learning path cache the base paths are stored in
+            top_n: Number of careers kept warm
+            idle_s: Seconds without interactive requests before warm-up runs
+            interval_s: Seconds between idle checks
+            refresh_s: Age after which a base path is regenerated
+            concurrency: Paths generated at once (worker threads)
+            max_load: Load average per CPU above which warm-up waits
+            seed_careers: Careers warmed until request counts say otherwise
+        """
+        self.optimizer = optimizer
+        self.cache = cache
+        self.top_n = top_n
+        self.idle_s = idle_s
+        self.interval_s = interval_s
+        self.refresh_s = refresh_s
+        self.concurrency = max(1, concurrency)
+        self.max_load = max_load
+        self.seed_careers = seed_careers
+        self._lock = threading.Lock()
+        self._requests: Counter = Counter()
+        # career -> Counter of path keys, and path key -> the profile it was requested for
+        self._profile_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._profiles: Dict[str, Dict] = {}
+        self._in_flight = 0
+        self._last_activity = time.monotonic()
+        # career -> (path key, warmed at)
+        self._warmed: Dict[str, Tuple[str, float]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "generated": 0, "profile_paths": 0, "base_paths": 0, "refreshed": 0, "already_warm": 0, "failed": 0, "deferred": 0, "busy": 0}
+
+    def record_request(self, career_id: str, user_skills: List[str], missing_skills: List[str], experience_level: str):
+        """Count a learning path request for a career and the profile it was made for"""
+        career_id = career_registry.resolve(career_id)
+        path_key = self.cache.key_for(career_id, user_skills, missing_skills, experience_level, LEARNING_PATH_PROMPT_VERSION)
+        with self._lock:
+            self._requests[career_id] += 1
+            counts = self._profile_counts[career_id]
+            counts[path_key.key] += 1
+            self._profiles[path_key.key] = {"user_skills": list(user_skills), "missing_skills": list(missing_skills), "experience_level": experience_level}
+            if len(counts) > WARMUP_PROFILES_PER_CAREER:
+                # Least requested other than the one just counted; ties drop the oldest
+                dropped = min((key for key in counts if key != path_key.key), key=counts.__getitem__)
+                del counts[dropped]
+                self._profiles.pop(dropped, None)
+
+    def request_started(self):
+        """Mark an interactive request as in flight"""
+        with self._lock:
+            self._in_flight += 1
+            self._last_activity = time.monotonic()
+
+    def request_finished(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._last_activity = time.monotonic()
+
+    def _over_load(self) -> bool:
+        """Whether the host's 1-minute load average per CPU exceeds max_load"""
+        if self.max_load <= 0 or not hasattr(os, "getloadavg"):
+            return False
+        return os.getloadavg()[0] / (os.cpu_count() or 1) > self.max_load
+
+    def is_idle(self) -> bool:
+        """
+        Nothing else is working: no interactive request in flight (streams count until their generation ends)
+        and none for idle_s seconds, no late GPT upgrade or speculative path pending, load under budget
+        """
+        with self._lock:
+            quiet = self._in_flight == 0 and time.monotonic() - self._last_activity >= self.idle_s
+        if not quiet:
+            return False
+        if pending_upgrades() or speculative_precompute.pending() or self._over_load():
+            with self._lock:
+                self._stats["busy"] += 1
+            return False
+        return True
+
+    def top_careers(self) -> List[str]:
+        """Most requested careers, topped up with the seed careers"""
+        with self._lock:
+            careers = [career for career, _ in self._requests.most_common(self.top_n)]
+        for career in self.seed_careers:
+            if len(careers) >= self.top_n:
+                break
+            career = career_registry.resolve(career)
+            if career not in careers:
+                careers.append(career)
+        return careers
+
+    def base_profile(self, career_id: str) -> Dict:
+        """Profile of a base path: an entry-level learner missing the career's core skills (fills fragments only)"""
+        row = occupation_store.row(career_id)
+        missing_skills = occupation_store.key_skills(row, limit=ROADMAP_MAX_SKILLS) if row is not None else []
+        return {"user_skills": [], "missing_skills": missing_skills, "experience_level": BASE_EXPERIENCE_LEVEL}
+
+    def warm_profile(self, career_id: str) -> Tuple[Dict, bool]:
+        """
+        Profile to warm for a career
+
+        Returns:
+            (profile, observed): the most requested profile, or the base profile if none has been seen
+        """
+        with self._lock:
+            counts = self._profile_counts.get(career_id)
+            if counts:
+                key, _ = counts.most_common(1)[0]
+                return dict(self._profiles[key]), True
+        return self.base_profile(career_id), False
+
+    def _path_key(self, career_id: str, profile: Dict):
+        return self.cache.key_for(career_id, profile["user_skills"], profile["missing_skills"], profile["experience_level"], LEARNING_PATH_PROMPT_VERSION)
+
+    def _is_due(self, career_id: str) -> bool:
+        """Whether the path of a career's warm profile is missing or older than refresh_s"""
+        path_key = self._path_key(career_id, self.warm_profile(career_id)[0])
+        with self._lock:
+            warmed = self._warmed.get(career_id)
+        if warmed is None or warmed[0] != path_key.key:
+            # First look at this profile (or after a restart): its path may already be in storage
+            created_at = self.cache.created_at(path_key)
+            if created_at is None:
+                return True
+            warmed = (path_key.key, time.time() - (datetime.now() - datetime.fromisoformat(created_at)).total_seconds())
+            with self._lock:
+                self._warmed[career_id] = warmed
+                self._stats["already_warm"] += 1
+        return time.time() - warmed[1] >= self.refresh_s
+
+    def warm(self, career_id: str) -> bool:
+        """
+        Generate and cache the path of one career's warm profile (blocking)
+
+        Returns:
+            True if a GPT path was cached
+        """
+        profile, observed = self.warm_profile(career_id)
+        path_key = self._path_key(career_id, profile)
+        with self._lock:
+            refresh = self._warmed.get(career_id, (None, 0))[0] == path_key.key
+        try:
+            learning_path = self.optimizer.get_gpt_learning_path(career_id, profile["user_skills"], profile["missing_skills"], profile["experience_level"])
+        except Exception as e:
+            print(f"⚠️ Warm-up failed for {career_id}: {e}")
+            with self._lock:
+                self._stats["failed"] += 1
+            return False
+        self.cache.put(path_key, learning_path, "warmup")
+        with self._lock:
+            self._warmed[career_id] = (path_key.key, time.time())
+            self._stats["refreshed" if refresh else "generated"] += 1
+            self._stats["profile_paths" if observed else "base_paths"] += 1
+        print(f"🔥 Warmed learning path for {career_id}")
+        return True
+
+    async def run_once(self):
+        """Warm every due top career, stopping early when interactive traffic arrives"""
+        loop = asyncio.get_event_loop()
+        due = [career for career in self.top_careers() if await loop.run_in_executor(self._executor, self._is_due, career)]
+        with self._lock:
+            self._stats["runs"] += 1
+        pending = set()
+        for career_id in due:
+            if not self.is_idle():
+                with self._lock:
+                    self._stats["deferred"] += len(due) - due.index(career_id)
+                break
+            pending.add(loop.run_in_executor(self._executor, self.warm, career_id))
+            if len(pending) >= self.concurrency:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if pending:
+            await asyncio.wait(pending)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_s)
+            if not self.is_idle():
+                continue
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"⚠️ Warm-up run failed: {e}")
+
+    def start(self):
+        """Start the scheduler on the running event loop"""
+        if self.top_n <= 0 or self._task is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="path-warmup")
+        self._task = asyncio.get_event_loop().create_task(self._run())
+        print(f"🔥 Learning path warm-up scheduled for the top {self.top_n} careers")
+
+    async def stop(self):
+        """Cancel the scheduler; a generation already running finishes in its worker"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight_requests"] = self._in_flight
+            stats["request_counts"] = dict(self._requests.most_common(self.top_n))
+            stats["warm_careers"] = sorted(career for career, (_, warmed_at) in self._warmed.items() if time.time() - warmed_at < self.refresh_s)
+        stats["enabled"] = self._task is not None
+        stats["top_careers"] = self.top_careers()
+        return stats
+
+# Global instance
+learning_path_warmup = LearningPathWarmup()
@@ -0,0 +1,117 @@
+"""
+Near-duplicate profile index for career match reuse
+Embeds the resume summary (without the candidate's name) and reuses the GPT-4 career suggestions of a
+previously analyzed profile when a new one is within a cosine-similarity threshold
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+from embeddings import EmbeddingModel, embedding_model
+from quantized_store import QuantizedEmbeddingStore
+
+PROFILE_REUSE_THRESHOLD = float(os.getenv("PROFILE_REUSE_THRESHOLD", "0.95"))
+PROFILE_INDEX_MAX = int(os.getenv("PROFILE_INDEX_MAX", "5000"))
+# float32, float16, int8 or pq; candidates are always re-scored in full precision before the threshold check
+PROFILE_INDEX_ENCODING = os.getenv("PROFILE_INDEX_ENCODING", "int8")
+# Profiles collected (stored as int8) before PQ codebooks are trained
+PQ_TRAIN_SIZE = int(os.getenv("PROFILE_INDEX_PQ_TRAIN_SIZE", "1000"))
+
+class ProfileMatchIndex:
+    def __init__(self, model: EmbeddingModel = embedding_model, threshold: float = PROFILE_REUSE_THRESHOLD, max_entries: int = PROFILE_INDEX_MAX,
+                 encoding: str = PROFILE_INDEX_ENCODING):
+        """
+        Inner-product index over normalized profile embeddings
+
+        Args:
+            model: Embedding model for profile texts
+            threshold: Minimum cosine similarity for reuse (<= 0 disables reuse)
+            max_entries: Oldest profiles are evicted beyond this size
+            encoding: Embedding storage (see quantized_store.ENCODINGS)
+        """
+        self.model = model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.encoding = encoding
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 0
+        self._store: Optional[QuantizedEmbeddingStore] = None
+        self._stats = {"lookups": 0, "hits": 0, "misses": 0, "added": 0, "evicted": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def _search(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        """Nearest stored profile and its cosine similarity"""
+        if self._store is None:
+            return None, 0.0
+        hits = self._store.search(vector, k=1)
+        return (int(hits[0][0]), hits[0][1]) if hits else (None, 0.0)
+
+    def lookup(self, profile_text: str) -> Optional[Tuple[Dict, float]]:
+        """
+        Find a cached profile close enough to reuse
+
+        Returns:
+            (stored career suggestions, similarity), or None on a miss
+        """
+        if not self.enabled or not profile_text:
+            return None
+        vector = self.model.encode_one(profile_text)
+        with self._lock:
+            self._stats["lookups"] += 1
+            entry_id, similarity = self._search(vector)
+            if entry_id is None or similarity < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return self._entries[entry_id]["suggestions"], similarity
+
+    def add(self, profile_text: str, suggestions: Dict):
+        """Store the GPT-4 career suggestions for a profile"""
+        if not self.enabled or not profile_text:
+            return
+        vector = self.model.encode_one(profile_text)
+        with self._lock:
+            if self._store is None:
+                # PQ needs codebooks, so profiles are stored as int8 until there are enough to train on
+                self._store = QuantizedEmbeddingStore(vector.shape[0], "int8" if self.encoding == "pq" else self.encoding)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {"suggestions": suggestions}
+            self._store.add([str(entry_id)], vector)
+            self._stats["added"] += 1
+            if self.encoding == "pq" and self._store.encoding != "pq" and len(self._store) >= PQ_TRAIN_SIZE:
+                self._store = self._store.requantize("pq")
+                print(f"🗜️ Profile index re-quantized to PQ ({self._store.stats()['bytes_per_vector']} bytes/profile)")
+
+            while len(self._entries) > self.max_entries:
+                oldest_id, _ = self._entries.popitem(last=False)
+                self._store.remove([str(oldest_id)])
+                self._stats["evicted"] += 1
+
+    def clear(self):
+        """Drop every stored profile"""
+        with self._lock:
+            self._entries.clear()
+            if self._store is not None:
+                self._store.clear()
+            self._store = None
+
+    def stats(self) -> Dict:
+        """Lookup counters and reuse rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["threshold"] = self.threshold
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        stats["embedding_model"] = self.model.model_id if self.model.loaded else self.model.model_name
+        stats["storage"] = self._store.stats() if self._store is not None else {"encoding": self.encoding, "size": 0}
+        return stats
+
+# Global instance
+profile_match_index = ProfileMatchIndex()
@@ -0,0 +1,84 @@
+"""
+Prompt template registry with local token accounting
+Keeps static instructions ahead of per-request content so provider-side prefix caching can reuse them
+"""
+
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Local tokenizer (tiktoken); fall back to a character heuristic when unavailable
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception as e:
+    logger.warning(f"tiktoken unavailable, using approximate token counts: {e}")
+    _encoding = None
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text with the local tokenizer"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # Roughly 4 characters per token for English text
+    return max(1, len(text) // 4)
+
+def count_message_tokens(messages: List[Dict]) -> int:
+    """Count tokens for a chat message list, including per-message overhead"""
+    # Each chat message carries ~4 tokens of role/separator framing, plus 3 for the reply primer
+    return sum(count_tokens(m.get("content", "")) + 4 for m in messages) + 3
+
+class PromptTemplate:
+    def __init__(self, name: str, version: str, system: str, user_template: str):
+        """
+        A chat prompt split into a static prefix and a dynamic suffix
+
+        Args:
+            name: Registry name of the template
+            version: Version string, bumped whenever the static text changes
+            system: Static instructions, examples and output format (cacheable prefix)
+            user_template: str.format template holding only per-request content
+        """
+        self.name = name
+        self.version = version
+        self.system = system.strip()
+        self.user_template = user_template.strip()
+        self.static_tokens = count_tokens(self.system)
+
+    def render(self, **kwargs) -> List[Dict]:
+        """Render chat messages with the static prefix first"""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user_template.format(**kwargs)}
+        ]
+
+    def describe(self) -> Dict:
+        """Token summary for this template"""
+        return {
+            "name": self.name,
+            "version": self.version,
+            "static_tokens": self.static_tokens,
+            "static_chars": len(self.system)
+        }
+
+class PromptTemplateRegistry:
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        """Register a template, replacing any previous one with the same name"""
+        self._templates[template.name] = template
+        return template
+
+    def get(self, name: str) -> Optional[PromptTemplate]:
+        """Get a template by name"""
+        return self._templates.get(name)
+
+    def token_report(self) -> List[Dict]:
+        """Static token counts for every registered template"""
+        return [template.describe() for template in self._templates.values()]
+
+# Global registry
+prompt_templates = PromptTemplateRegistry()
@@ -0,0 +1,267 @@
+"""
+Quantized embedding storage
+Keeps embeddings as compact codes (float16, int8 or product-quantized) for the candidate scan and
+re-scores the top candidates against full-precision vectors held in a disk-backed memory map, so the
+resident cost per worker is the code size rather than dim * 4 bytes per vector
+"""
+
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+ENCODINGS = ("float32", "float16", "int8", "pq")
+
+# Rows scored per block when decoding codes to float32
+_SCAN_BLOCK = 4096
+
+def _kmeans(data: np.ndarray, k: int, iterations: int = 12, seed: int = 0) -> np.ndarray:
+    """Centroids of one PQ sub-space (faiss k-means when installed, numpy Lloyd iterations otherwise)"""
+    k = min(k, len(data))
+    if faiss is not None:
+        kmeans = faiss.Kmeans(data.shape[1], k, niter=iterations, seed=seed, verbose=False, min_points_per_centroid=1)
+        kmeans.train(np.ascontiguousarray(data, dtype=np.float32))
+        return kmeans.centroids
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        distances = (data ** 2).sum(1)[:, None] - 2 * data @ centroids.T + (centroids ** 2).sum(1)[None, :]
+        assignment = distances.argmin(1)
+        for c in range(k):
+            members = data[assignment == c]
+            if len(members):
+                centroids[c] = members.mean(0)
+    return centroids
+
+class QuantizedEmbeddingStore:
+    def __init__(self, dim: int, encoding: str = "int8", pq_subspaces: int = 48, rescore_factor: int = 4, keep_full_precision: bool = True):
+        """
+        Embedding store scanned over compact codes
+
+        Args:
+            dim: Vector dimension
+            encoding: "float32", "float16", "int8" (per-vector scale) or "pq" (needs train())
+            pq_subspaces: PQ code bytes per vector (must divide dim)
+            rescore_factor: Candidates re-scored in full precision per requested result
+            keep_full_precision: Keep float32 copies (in an anonymous memory-mapped file) for re-scoring
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}', expected one of {ENCODINGS}")
+        if encoding == "pq" and dim % pq_subspaces:
+            raise ValueError(f"pq_subspaces ({pq_subspaces}) must divide the dimension ({dim})")
+        self.dim = dim
+        self.encoding = encoding
+        self.pq_subspaces = pq_subspaces
+        self.rescore_factor = rescore_factor
+        self.keep_full_precision = keep_full_precision and encoding != "float32"
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._capacity = 0
+        self._codes = self._empty_codes(0)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._centroids: Optional[np.ndarray] = None
+        self._full: Optional[np.ndarray] = None
+        self._full_file = None
+
+    def _code_shape(self) -> Tuple[int, np.dtype]:
+        if self.encoding == "pq":
+            return self.pq_subspaces, np.uint8
+        return self.dim, {"float32": np.float32, "float16": np.float16, "int8": np.int8}[self.encoding]
+
+    def _empty_codes(self, rows: int) -> np.ndarray:
+        width, dtype = self._code_shape()
+        return np.zeros((rows, width), dtype=dtype)
+
+    @property
+    def trained(self) -> bool:
+        return self.encoding != "pq" or self._centroids is not None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def train(self, vectors: np.ndarray, ksub: int = 256):
+        """Learn PQ codebooks from sample vectors (no-op for the other encodings)"""
+        if self.encoding != "pq":
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        sub_dim = self.dim // self.pq_subspaces
+        self._centroids = np.stack([
+            _kmeans(vectors[:, m * sub_dim:(m + 1) * sub_dim], ksub, seed=m)
+            for m in range(self.pq_subspaces)
+        ])
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Codes and per-vector scales (scales are only meaningful for int8)"""
+        scales = np.ones(len(vectors), dtype=np.float32)
+        if self.encoding == "float32":
+            return vectors, scales
+        if self.encoding == "float16":
+            return vectors.astype(np.float16), scales
+        if self.encoding == "int8":
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+            return np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8), scales.astype(np.float32)
+
+        sub_dim = self.dim // self.pq_subspaces
+        codes = np.empty((len(vectors), self.pq_subspaces), dtype=np.uint8)
+        for m in range(self.pq_subspaces):
+            sub = vectors[:, m * sub_dim:(m + 1) * sub_dim]
+            centroids = self._centroids[m]
+            distances = -2 * sub @ centroids.T + (centroids ** 2).sum(1)[None, :]
+            codes[:, m] = distances.argmin(1)
+        return codes, scales
+
+    def _grow(self, needed: int):
+        """Double the code (and full-precision) arrays until `needed` rows fit"""
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, 64)
+        codes = self._empty_codes(capacity)
+        codes[:len(self)] = self._codes[:len(self)]
+        scales = np.zeros(capacity, dtype=np.float32)
+        scales[:len(self)] = self._scales[:len(self)]
+        self._codes, self._scales = codes, scales
+        if self.keep_full_precision:
+            if self._full_file is None:
+                self._full_file = tempfile.TemporaryFile(prefix="embeddings-")
+            else:
+                self._full.flush()
+            # np.memmap extends the backing file in r+/w+ mode, preserving existing rows
+            self._full = np.memmap(self._full_file, dtype=np.float32, mode="r+" if self._capacity else "w+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def add(self, keys: List[str], vectors: np.ndarray):
+        """Add (or replace) L2-normalized vectors under string keys"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(keys) != len(vectors):
+            raise ValueError("keys and vectors must have the same length")
+        if not self.trained:
+            raise ValueError("PQ store must be trained before adding vectors")
+        codes, scales = self._encode(vectors)
+        with self._lock:
+            for key, code, scale, vector in zip(keys, codes, scales, vectors):
+                row = self._rows.get(key)
+                if row is None:
+                    self._grow(len(self) + 1)
+                    row = len(self._keys)
+                    self._keys.append(key)
+                    self._rows[key] = row
+                self._codes[row] = code
+                self._scales[row] = scale
+                if self.keep_full_precision:
+                    self._full[row] = vector
+
+    def remove(self, keys: List[str]) -> int:
+        """Remove vectors by key (the last row is moved into the hole); returns how many were removed"""
+        removed = 0
+        with self._lock:
+            for key in keys:
+                row = self._rows.pop(key, None)
+                if row is None:
+                    continue
+                last = len(self._keys) - 1
+                if row != last:
+                    moved_key = self._keys[last]
+                    self._keys[row] = moved_key
+                    self._rows[moved_key] = row
+                    self._codes[row] = self._codes[last]
+                    self._scales[row] = self._scales[last]
+                    if self.keep_full_precision:
+                        self._full[row] = self._full[last]
+                self._keys.pop()
+                removed += 1
+        return removed
+
+    def requantize(self, encoding: str, **kwargs) -> "QuantizedEmbeddingStore":
+        """
+        Copy of this store under another encoding, re-encoded from the full-precision vectors
+        (PQ codebooks are trained on them)
+        """
+        with self._lock:
+            if not self.keep_full_precision and self.encoding != "float32":
+                raise ValueError("Re-quantizing needs the full-precision vectors")
+            vectors = np.array(self._full[:len(self)] if self.keep_full_precision else self._codes[:len(self)])
+            keys = list(self._keys)
+        store = QuantizedEmbeddingStore(self.dim, encoding, rescore_factor=self.rescore_factor, **kwargs)
+        store.train(vectors)
+        store.add(keys, vectors)
+        return store
+
+    def clear(self):
+        with self._lock:
+            self._keys, self._rows, self._capacity = [], {}, 0
+            self._codes, self._scales = self._empty_codes(0), np.zeros(0, dtype=np.float32)
+            self._full = None
+            if self._full_file is not None:
+                self._full_file.close()
+                self._full_file = None
+
+    def _approximate_scores(self, query: np.ndarray) -> np.ndarray:
+        """Query-to-all scores computed from the codes"""
+        size = len(self)
+        if self.encoding == "pq":
+            sub_dim = self.dim // self.pq_subspaces
+            # Asymmetric distance: one (subspace x centroid) table per query, then lookups per code
+            tables = np.einsum("md,mkd->mk", query.reshape(self.pq_subspaces, sub_dim), self._centroids)
+            return tables[np.arange(self.pq_subspaces), self._codes[:size]].sum(axis=1)
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, _SCAN_BLOCK):
+            block = self._codes[start:min(start + _SCAN_BLOCK, size)].astype(np.float32)
+            scores[start:start + len(block)] = block @ query
+        if self.encoding == "int8":
+            scores *= self._scales[:size]
+        return scores
+
+    def search(self, query: np.ndarray, k: int = 5, rescore: bool = True) -> List[Tuple[str, float]]:
+        """
+        Nearest keys for one query vector
+
+        Args:
+            query: L2-normalized query vector
+            k: Results to return
+            rescore: Re-rank the top k * rescore_factor candidates by exact cosine similarity
+
+        Returns:
+            (key, cosine similarity) pairs, best first
+        """
+        query = np.ascontiguousarray(query, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            size = len(self)
+            if size == 0:
+                return []
+            scores = self._approximate_scores(query)
+            rescoring = rescore and self.keep_full_precision
+            fetch = min(size, k * self.rescore_factor if rescoring else k)
+            candidates = np.argpartition(-scores, fetch - 1)[:fetch] if fetch < size else np.arange(size)
+            if rescoring:
+                scores = np.zeros(size, dtype=np.float32)
+                scores[candidates] = self._full[candidates] @ query
+            best = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+            return [(self._keys[row], float(scores[row])) for row in best]
+
+    def memory_bytes(self) -> int:
+        """Resident bytes of the codes, scales and codebooks (the memory-mapped float32 copy is excluded)"""
+        width, dtype = self._code_shape()
+        size = len(self) * width * np.dtype(dtype).itemsize
+        if self.encoding == "int8":
+            size += len(self) * 4
+        if self._centroids is not None:
+            size += self._centroids.nbytes
+        return size
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self),
+            "encoding": self.encoding,
+            "bytes_per_vector": round(self.memory_bytes() / len(self), 1) if len(self) else None,
+            "resident_kb": round(self.memory_bytes() / 1024, 1),
+            "rescoring": self.keep_full_precision
+        }
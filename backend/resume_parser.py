@@ -10,6 +10,8 @@ import re
 from typing import Dict, List, Optional
 from pathlib import Path
 import logging
+from skill_ontology import skill_ontology
+from fuzzy_skills import fuzzy_skill_matcher
 
 # Load spaCy model
 try:
@@ -20,67 +22,9 @@ except OSError:
 
 class ResumeParser:
     def __init__(self):
-        self.skills_keywords = {
-            # Programming Languages
-            "programming_languages": [
-                "python", "javascript", "typescript", "java", "c++", "c#", "c", "go", "rust", 
-                "php", "ruby", "swift", "kotlin", "scala", "r", "matlab", "sql", "html", 
-                "css", "bash", "shell", "powershell", "perl", "lua", "dart", "objective-c"
-            ],
-            # Web Technologies
-            "web_technologies": [
-                "react", "vue", "angular", "node.js", "express", "next.js", "nuxt.js",
-                "django", "flask", "fastapi", "spring", "laravel", "rails", "asp.net",
-                "jquery", "bootstrap", "tailwind", "sass", "less", "webpack", "vite"
-            ],
-            # AI/ML/Data Science
-            "ai_ml_data": [
-                "machine learning", "deep learning", "artificial intelligence", "data science",
-                "tensorflow", "pytorch", "keras", "scikit-learn", "pandas", "numpy", "matplotlib",
-                "seaborn", "plotly", "jupyter", "anaconda", "opencv", "nltk", "spacy",
-                "transformers", "bert", "gpt", "llm", "neural networks", "cnn", "rnn", "lstm"
-            ],
-            # Cloud & DevOps
-            "cloud_devops": [
-                "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "jenkins",
-                "ci/cd", "terraform", "ansible", "chef", "puppet", "gitlab", "github actions",
-                "circleci", "travis ci", "helm", "istio", "prometheus", "grafana", "elk stack"
-            ],
-            # Databases
-            "databases": [
-                "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra",
-                "dynamodb", "sqlite", "oracle", "sql server", "neo4j", "influxdb",
-                "clickhouse", "snowflake", "bigquery", "redshift"
-            ],
-            # Mobile Development
-            "mobile": [
-                "ios", "android", "react native", "flutter", "xamarin", "ionic",
-                "swift", "objective-c", "kotlin", "java", "cordova", "phonegap"
-            ],
-            # Tools & Platforms
-            "tools_platforms": [
-                "git", "github", "gitlab", "bitbucket", "jira", "confluence", "slack",
-                "figma", "sketch", "adobe", "photoshop", "illustrator", "vs code",
-                "intellij", "eclipse", "xcode", "postman", "insomnia", "swagger"
-            ],
-            # Frameworks & Libraries
-            "frameworks_libraries": [
-                "spring boot", "hibernate", "junit", "mockito", "selenium", "cypress",
-                "jest", "mocha", "chai", "pytest", "unittest", "rspec", "cucumber"
-            ],
-            # Architecture & Patterns
-            "architecture": [
-                "microservices", "api", "rest", "graphql", "grpc", "soap", "mvc", "mvp",
-                "clean architecture", "domain driven design", "event sourcing", "cqrs",
-                "serverless", "lambda", "azure functions", "cloud functions"
-            ],
-            # Business & Soft Skills
-            "business_soft": [
-                "agile", "scrum", "kanban", "project management", "product management",
-                "business analysis", "stakeholder management", "team leadership",
-                "communication", "problem solving", "critical thinking", "mentoring"
-            ]
-        }
+        # Skill vocabulary lives in the shared ontology (data/skill_ontology.json):
+        # category -> [(lowercase keyword, canonical skill ID)]
+        self.skills_keywords = skill_ontology.keywords_by_category()
         
         self.job_titles = [
             # Software Engineering
@@ -171,11 +115,21 @@ class ResumeParser:
         text_lower = text.lower()
         found_skills = {}
         
-        for category, skills in self.skills_keywords.items():
+        for category, keywords in self.skills_keywords.items():
             found_skills[category] = []
-            for skill in skills:
-                if skill.lower() in text_lower:
-                    found_skills[category].append(skill.title())
+            for keyword, skill_id in keywords:
+                skill_name = skill_ontology.names[skill_id]
+                if keyword in text_lower and skill_name not in found_skills[category]:
+                    found_skills[category].append(skill_name)
+        
+        # Second pass: typo-tolerant lookup of tokens and bigrams the exact match missed
+        # (garbled PDF text like "Kubernets", split words like "Tensor Flow"); casing tells skills from prose
+        for skill_id, (matched_text, distance) in fuzzy_skill_matcher.find_skills(text).items():
+            skill_name = skill_ontology.names[skill_id]
+            for category in fuzzy_skill_matcher.categories(skill_id):
+                if skill_name not in found_skills[category]:
+                    found_skills[category].append(skill_name)
+                    logging.debug(f"Fuzzy skill match: '{matched_text}' -> {skill_name} (distance {distance})")
         
         # Remove empty categories
         found_skills = {k: v for k, v in found_skills.items() if v}
@@ -538,10 +492,10 @@ class ResumeParser:
         
         print(f"DEBUG NAME: Final selected name: '{name}'")
         
-        # Flatten skills for easier processing
+        # Flatten skills for easier processing (a skill can appear in several categories)
         all_skills = []
         for category_skills in skills.values():
-            all_skills.extend(category_skills)
+            all_skills.extend(skill for skill in category_skills if skill not in all_skills)
         
         return {
             "name": name,
@@ -0,0 +1,201 @@
+"""
+Vectorized skill-gap analysis across all occupations
+Holds an occupation-by-skill importance matrix over the skill ontology so coverage, matched skills and
+ranked gaps for every occupation come out of a single matrix operation per profile
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from occupation_store import OccupationStore, occupation_store
+
+# Skills kept per occupation in the ranked matched/missing lists
+DEFAULT_TOP_K = 10
+
+class SkillGapAnalysis:
+    def __init__(self, index: "SkillGapIndex", coverage: np.ndarray, overlap: np.ndarray, ranked_matches: np.ndarray, ranked_gaps: np.ndarray, matched_weights: np.ndarray, gap_weights: np.ndarray):
+        """Per-occupation results of analyzing one profile (row i belongs to index.career_ids[i])"""
+        self.index = index
+        self.coverage = coverage
+        self.overlap = overlap
+        self.ranked_matches = ranked_matches
+        self.ranked_gaps = ranked_gaps
+        self._matched_weights = matched_weights
+        self._gap_weights = gap_weights
+
+    def _names(self, row: int, ranked: np.ndarray, weights: np.ndarray, limit: int) -> List[str]:
+        names = self.index.ontology.names
+        return [names[skill_id] for skill_id in ranked[row, :limit] if weights[row, skill_id] > 0]
+
+    def for_career(self, career: str, limit: int = DEFAULT_TOP_K) -> Optional[Dict]:
+        """
+        Matched skills, missing skills (most important first) and coverage for one occupation
+
+        Args:
+            career: Career ID or title
+            limit: Maximum skills per list
+
+        Returns:
+            Dict with matched_skills, missing_skills, skill_overlap and coverage, or None for unknown careers
+        """
+        row = self.index.row(career)
+        if row is None:
+            return None
+        return {
+            "career_id": self.index.career_ids[row],
+            "matched_skills": self._names(row, self.ranked_matches, self._matched_weights, limit),
+            "missing_skills": self._names(row, self.ranked_gaps, self._gap_weights, limit),
+            "skill_overlap": int(self.overlap[row]),
+            "coverage": float(self.coverage[row])
+        }
+
+    def top(self, limit: int = 5) -> List[Tuple[str, float]]:
+        """Occupations with the highest importance-weighted coverage"""
+        order = np.argsort(-self.coverage, kind="stable")[:limit]
+        return [(self.index.career_ids[row], float(self.coverage[row])) for row in order]
+
+class SkillGapIndex:
+    def __init__(self, store: OccupationStore = occupation_store, top_k: int = DEFAULT_TOP_K):
+        """Build the coverage tables over the occupation store's importance matrix"""
+        self.store = store
+        self.ontology = store.ontology
+        self.top_k = min(top_k, self.ontology.size)
+        self.career_ids: List[str] = store.ids()
+        self.titles: List[str] = store.title_list()
+
+        # Dense float32 (memory-mapped): a few KB per occupation at ontology scale, and the matmul stays in BLAS
+        self.importance = store.matrix()
+        self.total_importance = self.importance.sum(axis=1)
+        self.total_importance[self.total_importance == 0] = 1.0
+        self.required = self.importance > 0
+        self.size = len(self.career_ids)
+
+    def row(self, career: str) -> Optional[int]:
+        """Matrix row for a career ID, title or alternate title, or None if the occupation is unknown"""
+        return self.store.row(career)
+
+    def analyze(self, profile: np.ndarray) -> SkillGapAnalysis:
+        """
+        Analyze a profile against every occupation at once
+
+        Args:
+            profile: Bool skill vector from skill_ontology.encode()
+
+        Returns:
+            SkillGapAnalysis with coverage, overlap and ranked matched/missing skills per occupation
+        """
+        has_skill = profile.astype(np.float32)
+        matched_weights = self.importance * has_skill
+        gap_weights = self.importance - matched_weights
+        coverage = matched_weights.sum(axis=1) / self.total_importance
+        overlap = np.count_nonzero(self.required & profile, axis=1)
+
+        # Partial sort down to the top-k columns per row, then order just those
+        k = self.top_k
+        top_matches = np.argpartition(-matched_weights, k - 1, axis=1)[:, :k]
+        top_gaps = np.argpartition(-gap_weights, k - 1, axis=1)[:, :k]
+        ranked_matches = np.take_along_axis(top_matches, np.argsort(-np.take_along_axis(matched_weights, top_matches, axis=1), axis=1, kind="stable"), axis=1)
+        ranked_gaps = np.take_along_axis(top_gaps, np.argsort(-np.take_along_axis(gap_weights, top_gaps, axis=1), axis=1, kind="stable"), axis=1)
+
+        return SkillGapAnalysis(self, coverage, overlap, ranked_matches, ranked_gaps, matched_weights, gap_weights)
+
+    def coverage_batch(self, profiles: np.ndarray) -> np.ndarray:
+        """
+        Importance-weighted coverage for many profiles at once
+
+        Args:
+            profiles: (N, skills) bool matrix, one profile per row
+
+        Returns:
+            (N, occupations) coverage matrix in [0, 1]
+        """
+        return (profiles.astype(np.float32) @ self.importance.T) / self.total_importance
+
+    def what_if(self, profile: np.ndarray, candidate_skills: List[str], career_ids: Optional[List[str]] = None, top_k: int = 5) -> Dict:
+        """
+        Score the effect of adding each candidate skill (and all of them together) on every occupation
+
+        All variants are scored in one batched matrix product against the occupation matrix.
+
+        Args:
+            profile: Current bool skill vector
+            candidate_skills: Skills the user is considering learning
+            career_ids: Careers the marginal gain is measured on (defaults to the current top_k)
+            top_k: Size of the ranking used for rank changes
+
+        Returns:
+            Dict with the baseline ranking, per-skill deltas sorted by marginal gain, and the combined effect
+        """
+        top_k = max(1, min(top_k, self.size))
+        candidate_ids, unknown = [], []
+        for skill in candidate_skills or []:
+            skill_id = self.ontology.resolve(skill) if isinstance(skill, str) else None
+            if skill_id is None:
+                unknown.append(skill)
+            elif skill_id not in candidate_ids:
+                candidate_ids.append(skill_id)
+        already_have = [self.ontology.names[i] for i in candidate_ids if profile[i]]
+        candidate_ids = [i for i in candidate_ids if not profile[i]]
+
+        # Row 0 is the baseline, rows 1..C add one candidate each, the last row adds them all
+        variants = np.repeat(profile[np.newaxis, :], len(candidate_ids) + 2, axis=0)
+        for row, skill_id in enumerate(candidate_ids, start=1):
+            variants[row, skill_id] = True
+        variants[-1, candidate_ids] = True
+        scores = self.coverage_batch(variants)
+        baseline = scores[0]
+        deltas = scores[1:] - baseline
+
+        baseline_order = np.argsort(-baseline, kind="stable")
+        target_rows = [row for row in (self.row(c) for c in career_ids or []) if row is not None]
+        if not target_rows:
+            target_rows = list(baseline_order[:top_k])
+        target_rows = np.array(target_rows, dtype=np.int64)
+        baseline_rank = np.empty(self.size, dtype=np.int64)
+        baseline_rank[baseline_order] = np.arange(self.size)
+
+        def ranking(row: int) -> List[Dict]:
+            order = np.argsort(-scores[row], kind="stable")[:top_k]
+            return [
+                {
+                    "career_id": self.career_ids[o],
+                    "title": self.titles[o],
+                    "coverage": round(float(scores[row, o]), 4),
+                    "delta": round(float(scores[row, o] - baseline[o]), 4),
+                    "rank_change": int(baseline_rank[o] - position)
+                }
+                for position, o in enumerate(order)
+            ]
+
+        candidates = []
+        for index, skill_id in enumerate(candidate_ids):
+            row_deltas = deltas[index]
+            best = int(np.argmax(row_deltas))
+            candidates.append({
+                "skill": self.ontology.names[skill_id],
+                "marginal_gain": round(float(row_deltas[target_rows].sum()), 4),
+                "target_deltas": {self.career_ids[o]: round(float(row_deltas[o]), 4) for o in target_rows},
+                "best_career": {"career_id": self.career_ids[best], "title": self.titles[best], "delta": round(float(row_deltas[best]), 4)},
+                "careers_improved": int(np.count_nonzero(row_deltas > 0)),
+                "top_careers": ranking(index + 1)
+            })
+        candidates.sort(key=lambda c: (-c["marginal_gain"], -c["best_career"]["delta"]))
+
+        return {
+            "baseline": ranking(0),
+            "target_careers": [self.career_ids[o] for o in target_rows],
+            "candidates": candidates,
+            "combined": {
+                "skills": [self.ontology.names[i] for i in candidate_ids],
+                "marginal_gain": round(float(deltas[-1][target_rows].sum()), 4),
+                "top_careers": ranking(len(candidate_ids) + 1)
+            },
+            "already_have": already_have,
+            "unknown_skills": unknown
+        }
+
+    def analyze_skills(self, skills: List[str]) -> SkillGapAnalysis:
+        """Analyze a skill list (unknown skills are ignored)"""
+        return self.analyze(self.ontology.encode(skills))
+
+# Global instance
+skill_gap_index = SkillGapIndex()
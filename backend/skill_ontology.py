@@ -0,0 +1,145 @@
+"""
+Skill ontology with canonical integer IDs
+Resolves free-form skill strings (synonyms, aliases, casing) to interned IDs and represents skill
+profiles as fixed-width numpy bool vectors, so overlap and gap computations are vectorized bit operations
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+DATA_PATH = Path(__file__).parent / "data" / "skill_ontology.json"
+
+_WHITESPACE = re.compile(r"\s+")
+
+class SkillOntology:
+    def __init__(self, data_path: Path = DATA_PATH):
+        """Load the skill vocabulary and build the lookup tables"""
+        with open(data_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.version = data.get("version", 1)
+        self.names: List[str] = []
+        self.categories: Dict[str, List[int]] = {}
+        self._lookup: Dict[str, int] = {}
+        self._compact_lookup: Dict[str, int] = {}
+        self._keywords: Dict[str, List[Tuple[str, int]]] = {}
+
+        for skill_id, entry in enumerate(data["skills"]):
+            name = entry["name"]
+            self.names.append(name)
+            for term in [name] + entry.get("aliases", []):
+                key = self.normalize(term)
+                self._lookup.setdefault(key, skill_id)
+                self._compact_lookup.setdefault(self._compact(key), skill_id)
+            keywords = entry.get("keywords", [name.lower()])
+            for category in entry.get("categories", []):
+                self.categories.setdefault(category, []).append(skill_id)
+                self._keywords.setdefault(category, []).extend((keyword, skill_id) for keyword in keywords)
+
+        self.size = len(self.names)
+        self._category_masks = {category: self.encode_ids(ids) for category, ids in self.categories.items()}
+
+    @staticmethod
+    def normalize(skill: str) -> str:
+        """Normalize a skill string for lookup (case, whitespace, surrounding punctuation)"""
+        return _WHITESPACE.sub(" ", skill.strip().lower()).strip(" .,;:")
+
+    @staticmethod
+    def _compact(normalized: str) -> str:
+        """Drop separators so "node js", "nodejs" and "node.js" collide"""
+        return re.sub(r"[\s.\-_]", "", normalized)
+
+    def resolve(self, skill: str) -> Optional[int]:
+        """Resolve a skill string or alias to its canonical ID, or None if unknown"""
+        if not skill:
+            return None
+        key = self.normalize(skill)
+        skill_id = self._lookup.get(key)
+        if skill_id is None:
+            skill_id = self._compact_lookup.get(self._compact(key))
+        return skill_id
+
+    def canonical_name(self, skill: str) -> str:
+        """Canonical display name for a skill (unknown skills are returned trimmed)"""
+        skill_id = self.resolve(skill)
+        return self.names[skill_id] if skill_id is not None else skill.strip()
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """Canonical names for a skill list, de-duplicated in order"""
+        seen = set()
+        result = []
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            name = self.canonical_name(skill)
+            key = self.normalize(name)
+            if key not in seen:
+                seen.add(key)
+                result.append(name)
+        return result
+
+    def keywords_by_category(self) -> Dict[str, List[Tuple[str, int]]]:
+        """(lowercase keyword, skill ID) pairs per category, for text extraction"""
+        return self._keywords
+
+    def encode_ids(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """Bool vector with the given skill IDs set"""
+        vector = np.zeros(self.size, dtype=bool)
+        ids = list(skill_ids)
+        if ids:
+            vector[ids] = True
+        return vector
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Bool profile vector for a skill list (unknown skills are ignored)"""
+        return self.encode_ids(skill_id for skill_id in (self.resolve(s) for s in skills or [] if isinstance(s, str)) if skill_id is not None)
+
+    def decode(self, vector: np.ndarray) -> List[str]:
+        """Canonical names of the skills set in a profile vector"""
+        return [self.names[i] for i in np.flatnonzero(vector)]
+
+    def contains(self, profile: np.ndarray, skill: str) -> bool:
+        """Check whether a profile vector has a skill"""
+        skill_id = self.resolve(skill)
+        return skill_id is not None and bool(profile[skill_id])
+
+    def in_category(self, skill: str, category: str) -> bool:
+        """Check whether a skill belongs to a category"""
+        skill_id = self.resolve(skill)
+        mask = self._category_masks.get(category)
+        return skill_id is not None and mask is not None and bool(mask[skill_id])
+
+    def category_mask(self, category: str) -> np.ndarray:
+        """Bool vector of all skills in a category"""
+        mask = self._category_masks.get(category)
+        return mask if mask is not None else np.zeros(self.size, dtype=bool)
+
+    @staticmethod
+    def overlap(a: np.ndarray, b: np.ndarray) -> int:
+        """Number of skills set in both vectors"""
+        return int(np.count_nonzero(a & b))
+
+    @staticmethod
+    def gaps(required: np.ndarray, profile: np.ndarray) -> np.ndarray:
+        """Required skills the profile does not have"""
+        return required & ~profile
+
+    def split_known(self, skills: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+        """Split a skill list into a profile vector of known skills and a list of unknown strings"""
+        known = []
+        unknown = []
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            skill_id = self.resolve(skill)
+            if skill_id is None:
+                unknown.append(skill.strip())
+            else:
+                known.append(skill_id)
+        return self.encode_ids(known), unknown
+
+# Global instance
+skill_ontology = SkillOntology()
@@ -0,0 +1,198 @@
+"""
+Speculative precomputation after career matches
+Once a user's matches are stored, the learning paths of the top matches are generated in the background
+(low priority, on their own small worker pool) under the exact cache key /career-path will look up, and
+the match context the persona endpoints need is kept at hand. A new resume upload bumps the generation,
+cancelling queued jobs and discarding results still in flight; hit and waste counters show whether the
+speculation pays off
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from career_path_optimizer import career_path_optimizer, LEARNING_PATH_PROMPT_VERSION
+from career_registry import career_registry
+from learning_path_cache import learning_path_cache, LearningPathKey
+
+SPECULATE_TOP_K = int(os.getenv("SPECULATE_TOP_K", "3"))  # 0 disables speculation
+# Speculative learning paths generated at once
+SPECULATION_WORKERS = int(os.getenv("SPECULATION_WORKERS", "1"))
+
+class SpeculativePrecompute:
+    def __init__(self, optimizer=career_path_optimizer, cache=learning_path_cache, top_k: int = SPECULATE_TOP_K, workers: int = SPECULATION_WORKERS):
+        """
+        Background precomputation for a user's likely next requests
+
+        Args:
+            optimizer: Learning path generator (get_gpt_learning_path)
+            cache: Learning path cache the speculative paths are stored in
+            top_k: Number of top matches to precompute
+            workers: Speculative paths generated at once
+        """
+        self.optimizer = optimizer
+        self.cache = cache
+        self.top_k = top_k
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="speculation")
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Path key -> "pending", "ready" or "failed", for the current generation
+        self._paths: Dict[str, str] = {}
+        self._futures: Dict[str, Future] = {}
+        self._requested: set = set()
+        # Canonical career ID -> match (persona context)
+        self._personas: Dict[str, Dict] = {}
+        self._stats = {
+            "speculations": 0, "enqueued": 0, "completed": 0, "already_cached": 0, "failed": 0, "cancelled": 0, "discarded": 0, "wasted": 0,
+            "joined": 0, "path_hits": 0, "path_not_ready": 0, "path_unpredicted": 0, "persona_hits": 0, "persona_misses": 0
+        }
+
+    def _unused(self) -> int:
+        """Ready paths of the current generation nobody has asked for (caller holds the lock)"""
+        return sum(1 for key, state in self._paths.items() if state == "ready" and key not in self._requested)
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def speculate(self, matches: List[Dict], user_skills: List[str]):
+        """Enqueue learning paths and keep persona context for the top matches of the current resume"""
+        if self.top_k <= 0:
+            return
+        with self._lock:
+            generation = self._generation
+            self._stats["speculations"] += 1
+        for match in matches[:self.top_k]:
+            career_id = match.get("career_id")
+            if not career_id:
+                continue
+            missing_skills = match.get("missing_skills", [])
+            experience_level = match.get("experience_level", "Entry")
+            path_key = self.cache.key_for_match(match, user_skills, LEARNING_PATH_PROMPT_VERSION)
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self._personas[career_registry.resolve(career_id)] = match
+                if path_key.key in self._paths:
+                    continue
+                self._paths[path_key.key] = "pending"
+                self._stats["enqueued"] += 1
+                self._futures[path_key.key] = self._executor.submit(
+                    self._generate_path, generation, career_id, path_key, user_skills, missing_skills, experience_level
+                )
+
+    def _current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self._generation
+
+    def _generate_path(self, generation: int, career_id: str, path_key: LearningPathKey, user_skills: List[str], missing_skills: List[str], experience_level: str):
+        """Generate and cache one speculative learning path, unless the resume has changed meanwhile"""
+        if not self._current(generation):
+            self._count("discarded")
+            return
+        if self.cache.created_at(path_key) is not None:
+            self._finish(generation, path_key, "ready", "already_cached")
+            return
+        try:
+            learning_path = self.optimizer.get_gpt_learning_path(career_id, user_skills, missing_skills, experience_level)
+        except Exception as e:
+            print(f"⚠️ Speculative learning path failed for {career_id}: {e}")
+            self._finish(generation, path_key, "failed", "failed")
+            return
+        if not self._current(generation):
+            self._count("discarded")
+            return
+        self.cache.put(path_key, learning_path, "speculative")
+        self._finish(generation, path_key, "ready", "completed")
+        print(f"🔮 Speculatively generated learning path for {career_id}")
+
+    def _finish(self, generation: int, path_key: LearningPathKey, state: str, stat: str):
+        with self._lock:
+            if generation == self._generation:
+                self._paths[path_key.key] = state
+                self._futures.pop(path_key.key, None)
+            self._stats[stat] += 1
+
+    def cancel(self):
+        """Drop all speculation for the previous resume (called on upload)"""
+        with self._lock:
+            self._generation += 1
+            cancelled = sum(1 for future in self._futures.values() if future.cancel())
+            self._stats["cancelled"] += cancelled
+            self._stats["wasted"] += self._unused()
+            self._futures.clear()
+            self._paths.clear()
+            self._requested.clear()
+            self._personas.clear()
+
+    async def join(self, path_key: LearningPathKey, timeout_s: Optional[float]) -> Optional[Dict]:
+        """
+        Wait for a speculative job still generating this path instead of generating it twice
+
+        Returns:
+            The cache entry once the job is done, or None if there is no such job or it doesn't finish in time
+        """
+        with self._lock:
+            future = self._futures.get(path_key.key)
+        if future is None:
+            return None
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.CancelledError:
+            # A speculative job dropped by a new upload is a miss; cancellation of the request itself is not
+            if future.cancelled():
+                return None
+            raise
+        entry = await asyncio.get_event_loop().run_in_executor(None, self.cache.get, path_key)
+        if entry is not None:
+            self._count("joined")
+        return entry
+
+    def record_path_request(self, path_key: LearningPathKey, served_from_cache: bool):
+        """Count whether a learning path request was answered by speculation"""
+        with self._lock:
+            if not self._paths:
+                return
+            state = self._paths.get(path_key.key)
+            if state is None:
+                self._stats["path_unpredicted"] += 1
+            elif state == "ready" and served_from_cache:
+                self._stats["path_hits"] += 1
+            else:
+                self._stats["path_not_ready"] += 1
+            self._requested.add(path_key.key)
+
+    def persona_context(self, career_id: str) -> Optional[Dict]:
+        """Speculated match for a career's persona, or None"""
+        with self._lock:
+            if not self._personas:
+                return None
+            match = self._personas.get(career_registry.resolve(career_id))
+            self._stats["persona_hits" if match else "persona_misses"] += 1
+            return match
+
+    def pending(self) -> int:
+        """Speculative paths queued or generating for the current resume"""
+        with self._lock:
+            return sum(1 for state in self._paths.values() if state == "pending")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["generation"] = self._generation
+            stats["pending"] = sum(1 for state in self._paths.values() if state == "pending")
+            stats["unused_ready"] = self._unused()
+        path_requests = stats["path_hits"] + stats["path_not_ready"] + stats["path_unpredicted"]
+        persona_requests = stats["persona_hits"] + stats["persona_misses"]
+        stats["path_hit_rate"] = round(stats["path_hits"] / path_requests, 3) if path_requests else 0.0
+        stats["persona_hit_rate"] = round(stats["persona_hits"] / persona_requests, 3) if persona_requests else 0.0
+        # Paths never asked for, the current resume's unused ones included
+        generated = stats["completed"] + stats["already_cached"]
+        stats["path_waste_rate"] = round((stats["wasted"] + stats["unused_ready"]) / generated, 3) if generated else 0.0
+        return stats
+
+# Global instance
+speculative_precompute = SpeculativePrecompute()
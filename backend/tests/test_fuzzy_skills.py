@@ -0,0 +1,62 @@
+"""Negative and positive cases for the typo-tolerant skill index"""
+
+import sys
+from pathlib import Path
+import pytest
+
+pytest.importorskip("numpy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fuzzy_skills import FuzzySkillIndex
+
+TERMS = [
+    ("spring", 0), ("docker", 1), ("kubernetes", 2), ("tensorflow", 3), ("elearning", 4), ("typography", 5),
+    ("redshift", 6), ("objective-c", 7), ("confluence", 8), ("3d modeling", 9), ("risk management", 10),
+    ("eclipse", 11), ("express", 12), ("jupyter", 13), ("python", 14), ("javascript", 15)
+]
+
+@pytest.fixture
+def index():
+    return FuzzySkillIndex(TERMS)
+
+@pytest.mark.parametrize("word", ["sprint", "docket", "locker"])
+def test_short_words_never_match(index, word):
+    assert index.lookup(word) is None
+
+@pytest.mark.parametrize("text", [
+    "Career Objective",
+    "Spoke with confidence at a conference and had influence on the team",
+    "Financial modeling and mismanagement reviews",
+    "Sketched an ellipse for the empress of Jupiter",
+    "Filed the docket, planned each sprint and cleaned the locker while learning topography",
+    "Wore a redshirt",
+])
+def test_prose_does_not_match(index, text):
+    assert index.find_in_text(text) == {}
+
+@pytest.mark.parametrize("text", [
+    "Career Objective: Python developer",
+    "Python conference speaker and Docker user",
+    "Python notebooks on Jupiter",
+    "Docker, Python and data modeling",
+])
+def test_prose_next_to_skills_does_not_add_skills(index, text):
+    found = index.find_in_text(text)
+    assert set(found) <= {1, 14}
+
+def test_typo_next_to_other_skills_matches(index):
+    found = index.find_in_text("Skills: Python, Kubernets, Docker")
+    assert found[2] == ("kubernets", 1)
+
+def test_isolated_typo_in_prose_does_not_match(index):
+    assert 2 not in index.find_in_text("Managed Kubernets clusters for the platform team")
+
+def test_mixed_case_typo_matches(index):
+    assert index.find_in_text("Built dashboards in JavaScirpt")[15] == ("javascirpt", 1)
+
+def test_split_words_match_exactly(index):
+    found = index.find_in_text("Deployed Tensor Flow models")
+    assert found[3] == ("tensor flow", 0)
+
+def test_exact_keywords_always_match(index):
+    assert index.find_in_text("Wrote Objective-C and used Confluence")[8] == ("confluence", 0)
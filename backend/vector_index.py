@@ -0,0 +1,295 @@
+"""
+Persisted vector indexes for embedding search
+Wraps faiss (IVF or HNSW for large catalogs) behind string keys with incremental add/remove, and saves/loads
+indexes so they are built offline and loaded at startup instead of re-embedding anything. Flat (exact)
+indexes are a numpy matrix saved as .npy and memory-mapped, so every worker shares the same pages; faiss
+1.7.4 can only map IVF inverted lists, HNSW graphs are read into each worker's memory. Without faiss every
+kind falls back to the memory-mapped numpy matrix.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import numpy as np
+from embeddings import EmbeddingModel, embedding_model
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+INDEX_DIR = Path(__file__).parent / "data" / "vector_indexes"
+INDEX_KINDS = ("flat", "ivf", "hnsw")
+
+class VectorIndex:
+    def __init__(self, dim: int, kind: str = "flat", nlist: int = 100, hnsw_m: int = 32, metadata: Optional[Dict] = None):
+        """
+        Inner-product index over L2-normalized vectors (inner product == cosine similarity)
+
+        Args:
+            dim: Vector dimension
+            kind: "flat" (exact), "ivf" (inverted lists, needs train()) or "hnsw" (graph)
+            nlist: IVF list count (capped by the training set size)
+            hnsw_m: HNSW graph degree
+            metadata: Extra fields saved with the index (embedding model id, source fingerprint, ...)
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind '{kind}', expected one of {INDEX_KINDS}")
+        self.dim = dim
+        self.kind = kind
+        self.nlist = nlist
+        self.hnsw_m = hnsw_m
+        self.metadata = metadata or {}
+        self.path: Optional[Path] = None
+        self.memory_mapped = False
+        self._lock = threading.RLock()
+        self._keys: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._next_id = 0
+        # HNSW can't delete vectors; removed IDs are filtered from results until the next rebuild
+        self._tombstones = set()
+        self._index = None
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._vector_ids = np.zeros(0, dtype=np.int64)
+        if self.uses_faiss and kind == "hnsw":
+            self._index = self._new_faiss_index()
+
+    def _new_faiss_index(self, training_size: int = 0):
+        if self.kind == "hnsw":
+            return faiss.IndexIDMap2(faiss.IndexHNSWFlat(self.dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT))
+        # IVF stores IDs itself; an ID map on top would renumber wrongly after remove_ids
+        nlist = max(1, min(self.nlist, training_size // 39 or 1))
+        return faiss.IndexIVFFlat(faiss.IndexFlatIP(self.dim), self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+
+    @property
+    def uses_faiss(self) -> bool:
+        """Flat indexes are a numpy matrix (memory-mappable); faiss backs IVF and HNSW when installed"""
+        return faiss is not None and self.kind != "flat"
+
+    @property
+    def backend(self) -> str:
+        return "faiss" if self.uses_faiss else "numpy"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def train(self, vectors: np.ndarray):
+        """Train the coarse quantizer (IVF only; a no-op for flat and HNSW)"""
+        if not self.uses_faiss or self.kind != "ivf":
+            return
+        with self._lock:
+            self._index = self._new_faiss_index(len(vectors))
+            self._index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    def _make_writable(self):
+        """Reload a memory-mapped index into memory before changing it (mapped pages are read-only)"""
+        if self.memory_mapped and self.path is not None:
+            if self.uses_faiss:
+                self._index = faiss.read_index(str(self.path.with_suffix(".faiss")))
+            else:
+                self._vectors = np.array(self._vectors)
+                self._vector_ids = np.array(self._vector_ids)
+            self.memory_mapped = False
+
+    def add(self, keys: List[str], vectors: np.ndarray):
+        """Add (or replace) vectors under string keys"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(keys) != len(vectors):
+            raise ValueError("keys and vectors must have the same length")
+        with self._lock:
+            self._make_writable()
+            self.remove([key for key in keys if key in self._ids])
+            ids = np.arange(self._next_id, self._next_id + len(keys), dtype=np.int64)
+            self._next_id += len(keys)
+            for key, vector_id in zip(keys, ids):
+                self._keys[int(vector_id)] = key
+                self._ids[key] = int(vector_id)
+            if self.uses_faiss:
+                if self._index is None:
+                    # Untrained IVF: train on the first batch
+                    self.train(vectors)
+                self._index.add_with_ids(vectors, ids)
+            else:
+                self._vectors = np.vstack([self._vectors, vectors])
+                self._vector_ids = np.concatenate([self._vector_ids, ids])
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Remove vectors by key; returns how many were removed"""
+        with self._lock:
+            ids = [self._ids.pop(key) for key in keys if key in self._ids]
+            if not ids:
+                return 0
+            self._make_writable()
+            for vector_id in ids:
+                self._keys.pop(vector_id, None)
+            if not self.uses_faiss:
+                keep = ~np.isin(self._vector_ids, ids)
+                self._vectors = self._vectors[keep]
+                self._vector_ids = self._vector_ids[keep]
+            elif self.kind == "hnsw":
+                self._tombstones.update(ids)
+            else:
+                self._index.remove_ids(np.array(ids, dtype=np.int64))
+            return len(ids)
+
+    def search(self, vectors: np.ndarray, k: int = 5, nprobe: int = 8) -> List[List[Tuple[str, float]]]:
+        """
+        Nearest keys for each query vector
+
+        Returns:
+            One list of (key, cosine similarity) per query, best first
+        """
+        queries = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            if not self._ids:
+                return [[] for _ in range(len(queries))]
+            fetch = min(k + len(self._tombstones), len(self._ids) + len(self._tombstones))
+            if self.uses_faiss:
+                if self.kind == "ivf":
+                    faiss.extract_index_ivf(self._index).nprobe = nprobe
+                scores, ids = self._index.search(queries, fetch)
+            else:
+                all_scores = queries @ self._vectors.T
+                order = np.argsort(-all_scores, axis=1)[:, :fetch]
+                scores = np.take_along_axis(all_scores, order, axis=1)
+                ids = self._vector_ids[order]
+
+            results = []
+            for row_scores, row_ids in zip(scores, ids):
+                hits = [(self._keys[int(i)], float(s)) for s, i in zip(row_scores, row_ids) if i != -1 and int(i) in self._keys]
+                results.append(hits[:k])
+            return results
+
+    def save(self, path: Path):
+        """Write the index (<path>.faiss or <path>.npy) and its key sidecar (<path>.json)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            suffix = f".tmp-{os.getpid()}"
+            if self.uses_faiss:
+                tmp_index = path.with_name(path.name + suffix + ".faiss")
+                faiss.write_index(self._index, str(tmp_index))
+                os.replace(tmp_index, path.with_suffix(".faiss"))
+            else:
+                tmp_index = path.with_name(path.name + suffix + ".npy")
+                np.save(tmp_index, self._vectors)
+                os.replace(tmp_index, path.with_suffix(".npy"))
+            sidecar = {
+                "dim": self.dim,
+                "kind": self.kind,
+                "backend": self.backend,
+                "next_id": self._next_id,
+                "keys": {str(vector_id): key for vector_id, key in self._keys.items()},
+                "vector_ids": [int(i) for i in self._vector_ids] if not self.uses_faiss else None,
+                "tombstones": sorted(self._tombstones),
+                "metadata": self.metadata,
+                "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+            }
+            tmp_sidecar = path.with_name(path.name + suffix + ".json")
+            tmp_sidecar.write_text(json.dumps(sidecar))
+            os.replace(tmp_sidecar, path.with_suffix(".json"))
+            self.path = path
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "VectorIndex":
+        """
+        Load a saved index; with mmap the vectors stay in the page cache shared by all workers
+        (flat and IVF only - HNSW graphs are always read into memory)
+
+        Raises:
+            FileNotFoundError: If the index hasn't been built
+        """
+        path = Path(path)
+        sidecar = json.loads(path.with_suffix(".json").read_text())
+        index = cls(sidecar["dim"], sidecar["kind"], metadata=sidecar.get("metadata", {}))
+        if sidecar.get("backend", "faiss") != index.backend:
+            raise FileNotFoundError(f"{path} was built with the {sidecar.get('backend')} backend - rebuild it")
+
+        index._keys = {int(vector_id): key for vector_id, key in sidecar["keys"].items()}
+        index._ids = {key: vector_id for vector_id, key in index._keys.items()}
+        index._next_id = sidecar["next_id"]
+        index._tombstones = set(sidecar.get("tombstones", []))
+        if index.uses_faiss:
+            flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap and index.kind == "ivf" else 0
+            index._index = faiss.read_index(str(path.with_suffix(".faiss")), flags)
+        else:
+            index._vectors = np.load(path.with_suffix(".npy"), mmap_mode="r" if mmap else None)
+            index._vector_ids = np.array(sidecar["vector_ids"], dtype=np.int64)
+        index.path = path
+        # faiss only maps IVF inverted lists; report what is actually shared between workers
+        index.memory_mapped = mmap and (not index.uses_faiss or index.kind == "ivf")
+        return index
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self._ids),
+            "dim": self.dim,
+            "kind": self.kind,
+            "backend": self.backend,
+            "memory_mapped": self.memory_mapped,
+            "tombstones": len(self._tombstones),
+            "embedding_model": self.metadata.get("model_id")
+        }
+
+class VectorIndexRegistry:
+    def __init__(self, index_dir: Path = INDEX_DIR):
+        """Named indexes built offline (build_vector_indexes.py) and loaded memory-mapped"""
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._missing = set()
+
+    def get(self, name: str) -> Optional[VectorIndex]:
+        """Load an index on first use; None if it hasn't been built"""
+        with self._lock:
+            if name in self._indexes:
+                return self._indexes[name]
+            if name in self._missing:
+                return None
+            try:
+                self._indexes[name] = VectorIndex.load(self.index_dir / name, mmap=True)
+                return self._indexes[name]
+            except (FileNotFoundError, OSError, ValueError) as e:
+                logger.warning(f"Vector index '{name}' unavailable ({e}); run build_vector_indexes.py")
+                self._missing.add(name)
+                return None
+
+    def search_text(self, name: str, texts: List[str], k: int = 5, model: EmbeddingModel = embedding_model) -> Optional[List[List[Tuple[str, float]]]]:
+        """
+        Embed query texts and search a named index
+
+        Returns:
+            Results per query, or None if the index is missing or was built with a different embedding model
+        """
+        index = self.get(name)
+        if index is None:
+            return None
+        built_with = index.metadata.get("model_id")
+        if built_with and built_with != model.model_id:
+            if name not in self._missing:
+                logger.warning(f"Vector index '{name}' was built with {built_with}, not {model.model_id}; rebuild it")
+                self._missing.add(name)
+            return None
+        return index.search(model.encode(texts), k)
+
+    def load_all(self, names: Iterable[str]) -> Dict[str, bool]:
+        """Map indexes at startup so the first request doesn't pay for it"""
+        return {name: self.get(name) is not None for name in names}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {name: index.stats() for name, index in self._indexes.items()}
+            stats.update({name: {"available": False} for name in self._missing})
+            return stats
+
+# Global registry
+vector_indexes = VectorIndexRegistry()